@@ -26,6 +26,17 @@ sys.path.append(os.getcwd())
 from app.models import Base
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate away from the full-text search structures (see app.core.database.SEARCH_DDL)."""
+    if type_ == "table" and (name.endswith("_fts") or "_fts_" in name):
+        return False
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name and name.endswith("_search"):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -50,6 +61,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -75,7 +87,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
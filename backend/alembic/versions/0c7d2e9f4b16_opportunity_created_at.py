@@ -0,0 +1,37 @@
+"""Opportunity created_at
+
+Revision ID: 0c7d2e9f4b16
+Revises: 6b1e8f4c2d90
+Create Date: 2026-10-17 10:12:37.201544
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c7d2e9f4b16'
+down_revision: Union[str, Sequence[str], None] = '6b1e8f4c2d90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite cannot add a column with a non-constant default, so existing rows
+    # are stamped in a separate UPDATE.
+    op.add_column('funding_opportunities', sa.Column('created_at', sa.DateTime(), nullable=True))
+    op.execute(sa.text("UPDATE funding_opportunities SET created_at = CURRENT_TIMESTAMP"))
+    if op.get_bind().dialect.name == 'postgresql':
+        # Left nullable on SQLite: tightening it there means rebuilding the
+        # table, which would drop the full-text search triggers.
+        op.alter_column('funding_opportunities', 'created_at', nullable=False)
+    op.create_index('ix_funding_opportunities_created_at', 'funding_opportunities', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_funding_opportunities_created_at', table_name='funding_opportunities')
+    op.drop_column('funding_opportunities', 'created_at')
@@ -0,0 +1,86 @@
+"""Funding indexes and opportunity dedup key
+
+Revision ID: 3b7e9c21d4a5
+Revises: fcd69046838b
+Create Date: 2026-10-16 09:12:31.204118
+
+"""
+from typing import Sequence, Union
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e9c21d4a5'
+down_revision: Union[str, Sequence[str], None] = 'fcd69046838b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _normalize(value):
+    return " ".join(re.sub(r"[^\w\s]", " ", (value or "").lower()).split())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('funding_opportunities', sa.Column('dedup_key', sa.String(), nullable=True))
+
+    # Backfill the normalized key in keyset batches, so only one page of rows
+    # is in memory at a time. Rows that collide with an earlier row keep a
+    # per-row key so the unique index can be built without deleting data.
+    conn = op.get_bind()
+    opportunities = sa.table(
+        'funding_opportunities',
+        sa.column('id', sa.UUID()),
+        sa.column('funder_name', sa.String()),
+        sa.column('programme_name', sa.String()),
+        sa.column('dedup_key', sa.String()),
+    )
+    seen = set()
+    last_id = None
+    while True:
+        stmt = (
+            sa.select(opportunities.c.id, opportunities.c.funder_name, opportunities.c.programme_name)
+            .order_by(opportunities.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            stmt = stmt.where(opportunities.c.id > last_id)
+        rows = conn.execute(stmt).all()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            key = f"{_normalize(row.funder_name)}|{_normalize(row.programme_name)}"
+            if key in seen:
+                key = f"{key}#{row.id}"
+            seen.add(key)
+            params.append({"row_id": row.id, "key": key})
+        conn.execute(
+            opportunities.update()
+            .where(opportunities.c.id == sa.bindparam("row_id"))
+            .values(dedup_key=sa.bindparam("key")),
+            params,
+        )
+        last_id = rows[-1].id
+
+    op.create_index('ix_funding_opportunities_deadline_id', 'funding_opportunities', ['deadline', 'id'])
+    op.create_index('ix_funding_opportunities_funder_programme', 'funding_opportunities', ['funder_name', 'programme_name'])
+    op.create_index('ix_funding_opportunities_status', 'funding_opportunities', ['status'])
+    op.create_index('uq_funding_opportunities_dedup_key', 'funding_opportunities', ['dedup_key'], unique=True)
+    op.create_index('uq_application_packages_opportunity_id', 'application_packages', ['opportunity_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_application_packages_opportunity_id', table_name='application_packages')
+    op.drop_index('uq_funding_opportunities_dedup_key', table_name='funding_opportunities')
+    op.drop_index('ix_funding_opportunities_status', table_name='funding_opportunities')
+    op.drop_index('ix_funding_opportunities_funder_programme', table_name='funding_opportunities')
+    op.drop_index('ix_funding_opportunities_deadline_id', table_name='funding_opportunities')
+    op.drop_column('funding_opportunities', 'dedup_key')
@@ -0,0 +1,114 @@
+"""Promote opportunity source, description and document lists to columns
+
+Revision ID: 5f0b8c3e9a17
+Revises: e7a3d5b18f42
+Create Date: 2026-10-16 18:02:54.310847
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f0b8c3e9a17'
+down_revision: Union[str, Sequence[str], None] = 'e7a3d5b18f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+JSONList = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+PROMOTED = {
+    'source': 'source_url',
+    'description': 'description',
+    'requirements': 'requirements',
+    'required_documents': 'required_documents',
+}
+
+opportunities = sa.table(
+    'funding_opportunities',
+    sa.column('id', sa.UUID()),
+    sa.column('source_url', sa.String()),
+    sa.column('description', sa.Text()),
+    sa.column('requirements', JSONList),
+    sa.column('required_documents', JSONList),
+    sa.column('eligibility_criteria', sa.JSON()),
+)
+
+
+def _batches(conn):
+    """Yield all rows in keyset batches ordered by id."""
+    last_id = None
+    while True:
+        stmt = sa.select(opportunities).order_by(opportunities.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            stmt = stmt.where(opportunities.c.id > last_id)
+        rows = conn.execute(stmt).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def _update(conn, params, columns):
+    """Executemany UPDATE of `columns` from `new_<column>` parameters."""
+    conn.execute(
+        opportunities.update()
+        .where(opportunities.c.id == sa.bindparam('row_id'))
+        .values(**{name: sa.bindparam(f'new_{name}') for name in columns}),
+        params,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('funding_opportunities', sa.Column('source_url', sa.String(), nullable=True))
+    op.add_column('funding_opportunities', sa.Column('description', sa.Text(), nullable=True))
+    op.add_column('funding_opportunities', sa.Column('requirements', JSONList, nullable=True))
+    op.add_column('funding_opportunities', sa.Column('required_documents', JSONList, nullable=True))
+
+    # Move the promoted keys out of the eligibility_criteria blob
+    conn = op.get_bind()
+    for rows in _batches(conn):
+        params = []
+        for row in rows:
+            criteria = dict(row.eligibility_criteria or {})
+            promoted = {column: criteria.pop(key, None) for key, column in PROMOTED.items()}
+            params.append({
+                'row_id': row.id,
+                'new_source_url': promoted['source_url'] or None,
+                'new_description': promoted['description'],
+                'new_requirements': promoted['requirements'],
+                'new_required_documents': promoted['required_documents'],
+                'new_eligibility_criteria': criteria,
+            })
+        _update(conn, params, list(PROMOTED.values()) + ['eligibility_criteria'])
+
+    op.create_index('ix_funding_opportunities_source_url', 'funding_opportunities', ['source_url'])
+    if conn.dialect.name == 'postgresql':
+        op.create_index('ix_funding_opportunities_required_documents', 'funding_opportunities', ['required_documents'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.drop_index('ix_funding_opportunities_required_documents', table_name='funding_opportunities')
+    op.drop_index('ix_funding_opportunities_source_url', table_name='funding_opportunities')
+
+    for rows in _batches(conn):
+        params = []
+        for row in rows:
+            criteria = dict(row.eligibility_criteria or {})
+            for key, column in PROMOTED.items():
+                criteria[key] = getattr(row, column) or ('' if column in ('source_url', 'description') else [])
+            params.append({'row_id': row.id, 'new_eligibility_criteria': criteria})
+        _update(conn, params, ['eligibility_criteria'])
+
+    op.drop_column('funding_opportunities', 'required_documents')
+    op.drop_column('funding_opportunities', 'requirements')
+    op.drop_column('funding_opportunities', 'description')
+    op.drop_column('funding_opportunities', 'source_url')
@@ -0,0 +1,28 @@
+"""Opportunity source query
+
+Revision ID: 6b1e8f4c2d90
+Revises: d2f6b9a41c85
+Create Date: 2026-10-16 22:10:58.634112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b1e8f4c2d90'
+down_revision: Union[str, Sequence[str], None] = 'd2f6b9a41c85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('funding_opportunities', sa.Column('source_query', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('funding_opportunities', 'source_query')
@@ -0,0 +1,40 @@
+"""Cache entries
+
+Revision ID: 8d41f0a6b2c9
+Revises: 3b7e9c21d4a5
+Create Date: 2026-10-16 11:40:02.518340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41f0a6b2c9'
+down_revision: Union[str, Sequence[str], None] = '3b7e9c21d4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cache_entries',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('namespace', sa.String(length=32), nullable=False),
+    sa.Column('value', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('accessed_at', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index('ix_cache_entries_accessed_at', 'cache_entries', ['accessed_at'])
+    op.create_index('ix_cache_entries_expires_at', 'cache_entries', ['expires_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cache_entries_expires_at', table_name='cache_entries')
+    op.drop_index('ix_cache_entries_accessed_at', table_name='cache_entries')
+    op.drop_table('cache_entries')
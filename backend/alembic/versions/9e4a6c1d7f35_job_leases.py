@@ -0,0 +1,35 @@
+"""Job leases
+
+Revision ID: 9e4a6c1d7f35
+Revises: 0c7d2e9f4b16
+Create Date: 2026-10-17 11:03:52.418906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4a6c1d7f35'
+down_revision: Union[str, Sequence[str], None] = '0c7d2e9f4b16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('locked_until', sa.DateTime(), nullable=True))
+    op.add_column('jobs', sa.Column('run_after', sa.DateTime(), nullable=True))
+    # Jobs left RUNNING by the previous release were never leased; expire them
+    # so the reaper re-queues them as boot recovery used to.
+    op.execute(sa.text("UPDATE jobs SET locked_until = started_at WHERE status = 'RUNNING'"))
+    op.create_index('ix_jobs_status_locked_until', 'jobs', ['status', 'locked_until'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_status_locked_until', table_name='jobs')
+    op.drop_column('jobs', 'run_after')
+    op.drop_column('jobs', 'locked_until')
@@ -0,0 +1,104 @@
+"""Full-text search
+
+Revision ID: a9c4e2d7b613
+Revises: 5f0b8c3e9a17
+Create Date: 2026-10-16 19:27:13.882406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e2d7b613'
+down_revision: Union[str, Sequence[str], None] = '5f0b8c3e9a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of app.core.database.SEARCH_DDL / SEARCH_DROP_DDL as of this
+# revision; later changes to the live definitions need their own migration.
+SEARCH_DDL = {
+    "postgresql": [
+        """ALTER TABLE funding_opportunities ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(programme_name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(funder_name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED""",
+        "CREATE INDEX ix_funding_opportunities_search ON funding_opportunities USING gin (search_vector)",
+        """ALTER TABLE application_packages ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            to_tsvector('english', coalesce(narrative_draft, ''))
+        ) STORED""",
+        "CREATE INDEX ix_application_packages_search ON application_packages USING gin (search_vector)",
+    ],
+    "sqlite": [
+        """CREATE VIRTUAL TABLE opportunities_fts USING fts5(
+            funder_name, programme_name, description,
+            content='funding_opportunities', tokenize='porter unicode61'
+        )""",
+        """CREATE TRIGGER opportunities_fts_ai AFTER INSERT ON funding_opportunities BEGIN
+            INSERT INTO opportunities_fts(rowid, funder_name, programme_name, description)
+            VALUES (new.rowid, new.funder_name, new.programme_name, new.description);
+        END""",
+        """CREATE TRIGGER opportunities_fts_ad AFTER DELETE ON funding_opportunities BEGIN
+            INSERT INTO opportunities_fts(opportunities_fts, rowid, funder_name, programme_name, description)
+            VALUES ('delete', old.rowid, old.funder_name, old.programme_name, old.description);
+        END""",
+        """CREATE TRIGGER opportunities_fts_au AFTER UPDATE OF funder_name, programme_name, description ON funding_opportunities BEGIN
+            INSERT INTO opportunities_fts(opportunities_fts, rowid, funder_name, programme_name, description)
+            VALUES ('delete', old.rowid, old.funder_name, old.programme_name, old.description);
+            INSERT INTO opportunities_fts(rowid, funder_name, programme_name, description)
+            VALUES (new.rowid, new.funder_name, new.programme_name, new.description);
+        END""",
+        """CREATE VIRTUAL TABLE applications_fts USING fts5(
+            narrative_draft, content='application_packages', tokenize='porter unicode61'
+        )""",
+        """CREATE TRIGGER applications_fts_ai AFTER INSERT ON application_packages BEGIN
+            INSERT INTO applications_fts(rowid, narrative_draft) VALUES (new.rowid, new.narrative_draft);
+        END""",
+        """CREATE TRIGGER applications_fts_ad AFTER DELETE ON application_packages BEGIN
+            INSERT INTO applications_fts(applications_fts, rowid, narrative_draft) VALUES ('delete', old.rowid, old.narrative_draft);
+        END""",
+        """CREATE TRIGGER applications_fts_au AFTER UPDATE OF narrative_draft ON application_packages BEGIN
+            INSERT INTO applications_fts(applications_fts, rowid, narrative_draft) VALUES ('delete', old.rowid, old.narrative_draft);
+            INSERT INTO applications_fts(rowid, narrative_draft) VALUES (new.rowid, new.narrative_draft);
+        END""",
+        "INSERT INTO opportunities_fts(opportunities_fts) VALUES ('rebuild')",
+        "INSERT INTO applications_fts(applications_fts) VALUES ('rebuild')",
+    ],
+}
+
+SEARCH_DROP_DDL = {
+    "postgresql": [
+        "DROP INDEX IF EXISTS ix_application_packages_search",
+        "ALTER TABLE application_packages DROP COLUMN IF EXISTS search_vector",
+        "DROP INDEX IF EXISTS ix_funding_opportunities_search",
+        "ALTER TABLE funding_opportunities DROP COLUMN IF EXISTS search_vector",
+    ],
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS applications_fts_au",
+        "DROP TRIGGER IF EXISTS applications_fts_ad",
+        "DROP TRIGGER IF EXISTS applications_fts_ai",
+        "DROP TABLE IF EXISTS applications_fts",
+        "DROP TRIGGER IF EXISTS opportunities_fts_au",
+        "DROP TRIGGER IF EXISTS opportunities_fts_ad",
+        "DROP TRIGGER IF EXISTS opportunities_fts_ai",
+        "DROP TABLE IF EXISTS opportunities_fts",
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # tsvector generated columns + GIN on Postgres, FTS5 tables + triggers on SQLite.
+    # Both index the existing rows as part of creation.
+    conn = op.get_bind()
+    for statement in SEARCH_DDL.get(conn.dialect.name, []):
+        conn.exec_driver_sql(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    for statement in SEARCH_DROP_DDL.get(conn.dialect.name, []):
+        conn.exec_driver_sql(statement)
@@ -0,0 +1,29 @@
+"""Application version
+
+Revision ID: d2f6b9a41c85
+Revises: a9c4e2d7b613
+Create Date: 2026-10-16 20:48:36.117029
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6b9a41c85'
+down_revision: Union[str, Sequence[str], None] = 'a9c4e2d7b613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # server_default fills existing rows without a backfill pass
+    op.add_column('application_packages', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('application_packages', 'version')
@@ -0,0 +1,57 @@
+"""
+Structural text splitting for long-document extraction.
+
+Text is cut on the coarsest boundary that fits (blank lines, then lines, then
+sentences, then a hard cut) and each chunk after the first is prefixed with the
+tail of its predecessor, so an opportunity straddling a boundary is still seen
+whole by at least one extraction call.
+"""
+import os
+import re
+
+CHUNK_CHARS = int(os.getenv("EXTRACTION_CHUNK_CHARS", 12000))
+CHUNK_OVERLAP = int(os.getenv("EXTRACTION_CHUNK_OVERLAP", 800))
+
+_SEPARATORS = [r"\n\s*\n", r"\n", r"(?<=[.!?])\s+"]
+
+
+def _split_units(text: str, max_chars: int, level: int = 0) -> list[str]:
+    """Break text into pieces no longer than max_chars, preferring coarse boundaries."""
+    if len(text) <= max_chars:
+        return [text]
+    if level >= len(_SEPARATORS):
+        return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+    units = []
+    for piece in re.split(f"({_SEPARATORS[level]})", text):
+        if len(piece) > max_chars:
+            units.extend(_split_units(piece, max_chars, level + 1))
+        elif piece:
+            units.append(piece)
+    return units
+
+
+def _overlap_tail(chunk: str, overlap: int) -> str:
+    """Last `overlap` characters of a chunk, starting at a line boundary when possible."""
+    tail = chunk[-overlap:]
+    newline = tail.find("\n")
+    return tail[newline + 1:] if 0 <= newline < len(tail) - 1 else tail
+
+
+def split_text(text: str, max_chars: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP) -> list[str]:
+    """Split text into chunks of at most max_chars (plus overlap) on structural boundaries."""
+    if len(text) <= max_chars:
+        return [text]
+
+    chunks, current = [], ""
+    for unit in _split_units(text, max_chars):
+        if current and len(current) + len(unit) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += unit
+    if current.strip():
+        chunks.append(current)
+
+    if overlap <= 0:
+        return chunks
+    return [chunks[0]] + [_overlap_tail(prev, overlap) + chunk for prev, chunk in zip(chunks, chunks[1:])]
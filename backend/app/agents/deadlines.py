@@ -0,0 +1,102 @@
+"""
+Local deadline normalizer.
+
+Turns the free-text deadline_estimate produced by extraction ("2026-04-15",
+"April 15", "Late 2026", "Rolling") into a concrete date plus a precision,
+without an LLM call. Approximate values resolve to the *end* of the period
+they describe, so ordering by deadline never shows an opportunity as closing
+later than it might. Rolling/open calls and unparseable text have no date.
+"""
+import calendar
+import re
+from datetime import date
+from app.models import DeadlinePrecision
+
+_MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+_MONTHS.update({name.lower(): i for i, name in enumerate(calendar.month_abbr) if name})
+_MONTHS["sept"] = 9
+_MONTH_RE = "|".join(sorted(_MONTHS, key=len, reverse=True))
+
+_ROLLING = re.compile(r"\b(rolling|open|ongoing|continuous|any ?time|year[- ]round|no deadline)\b")
+_ISO = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_NUMERIC = re.compile(r"\b(\d{1,2})[/.](\d{1,2})[/.](\d{4})\b")  # day-first, as used in SA
+_DAY_MONTH = re.compile(rf"\b(\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?({_MONTH_RE})\.?,?(?:\s+(\d{{4}}))?\b")
+_MONTH_DAY = re.compile(rf"\b({_MONTH_RE})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?(?:,?\s+(\d{{4}}))?\b")
+_MONTH_YEAR = re.compile(rf"\b({_MONTH_RE})\.?,?\s+(\d{{4}})\b")
+# A bare "may" is far more often the verb than the month
+_MONTH_ONLY_RE = "|".join(m for m in sorted(_MONTHS, key=len, reverse=True) if m != "may")
+_MONTH_ONLY = re.compile(rf"\b(?:end of |late |early |mid[- ]?)?({_MONTH_ONLY_RE})\b")
+_QUARTER = re.compile(r"\bq([1-4])\s*(\d{4})?\b")
+_SEASON = re.compile(r"\b(early|mid|middle of|late|end of|beginning of|first half of|second half of)[\s-]*(\d{4})\b")
+_YEAR = re.compile(r"\b(20\d{2})\b")
+
+_SEASON_END_MONTH = {
+    "early": 4, "beginning of": 4, "first half of": 6,
+    "mid": 8, "middle of": 8,
+    "late": 12, "end of": 12, "second half of": 12,
+}
+
+
+def _safe_date(year: int, month: int, day: int):
+    """date(), or None when the model produced an impossible value (e.g. year 0)."""
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _end_of_month(year: int, month: int):
+    if not date.min.year <= year <= date.max.year:
+        return None
+    return _safe_date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _approximate(deadline, precision: DeadlinePrecision) -> tuple:
+    return (deadline, precision) if deadline else (None, DeadlinePrecision.UNKNOWN)
+
+
+def _next_occurrence(month: int, day: int, today: date):
+    """Month/day without a year: the next time it comes around (today counts)."""
+    candidate = _safe_date(today.year, month, day)
+    if candidate is not None and candidate < today:
+        candidate = _safe_date(today.year + 1, month, day)
+    return candidate
+
+
+def parse_deadline(text: str, today: date = None) -> tuple:
+    """Return (deadline or None, DeadlinePrecision) for a free-text estimate."""
+    today = today or date.today()
+    value = " ".join((text or "").lower().split())
+    if not value:
+        return None, DeadlinePrecision.UNKNOWN
+
+    if match := _ISO.search(value):
+        parsed = _safe_date(int(match[1]), int(match[2]), int(match[3]))
+        if parsed:
+            return parsed, DeadlinePrecision.DAY
+    if match := _NUMERIC.search(value):
+        parsed = _safe_date(int(match[3]), int(match[2]), int(match[1]))
+        if parsed:
+            return parsed, DeadlinePrecision.DAY
+    for pattern, day_group, month_group in ((_DAY_MONTH, 1, 2), (_MONTH_DAY, 2, 1)):
+        if match := pattern.search(value):
+            day, month = int(match[day_group]), _MONTHS[match[month_group]]
+            parsed = _safe_date(int(match[3]), month, day) if match[3] else _next_occurrence(month, day, today)
+            if parsed:
+                return parsed, DeadlinePrecision.DAY
+    if match := _MONTH_YEAR.search(value):
+        return _approximate(_end_of_month(int(match[2]), _MONTHS[match[1]]), DeadlinePrecision.MONTH)
+    if match := _QUARTER.search(value):
+        year = int(match[2]) if match[2] else today.year
+        return _approximate(_end_of_month(year, int(match[1]) * 3), DeadlinePrecision.QUARTER)
+    if match := _SEASON.search(value):
+        return _approximate(_end_of_month(int(match[2]), _SEASON_END_MONTH[match[1]]), DeadlinePrecision.SEASON)
+    if _ROLLING.search(value):
+        return None, DeadlinePrecision.ROLLING
+    if match := _MONTH_ONLY.search(value):
+        month = _MONTHS[match[1]]
+        year = today.year if month >= today.month else today.year + 1
+        return _approximate(_end_of_month(year, month), DeadlinePrecision.MONTH)
+    if match := _YEAR.search(value):
+        return _approximate(_safe_date(int(match[1]), 12, 31), DeadlinePrecision.YEAR)
+    return None, DeadlinePrecision.UNKNOWN
@@ -0,0 +1,170 @@
+"""
+In-memory near-duplicate index for funding opportunities.
+
+Exact dedup (the unique dedup_key) misses variants such as "NFVF" vs
+"National Film and Video Foundation" or "Production Grant 2026" vs
+"Production Grant". Those can also be genuinely different opportunities, so
+they are never dropped on import; this index finds them as merge
+suggestions for a person to review, without a per-row query:
+
+- funders are reduced to a blocking key: the acronym of multi-word names,
+  the bare word otherwise, so both spellings above land in block "nfvf";
+- programme names are normalized (case, punctuation, years and filler
+  words removed) and compared by character-trigram Jaccard similarity,
+  only against entries in the same block.
+
+Lookups touch one small block instead of the whole table, which keeps
+matching fast at tens of thousands of rows. The index is loaded from the
+database once and updated in place as this process creates rows. Every
+DEDUP_INDEX_REFRESH_SECONDS it fetches only the rows created since its
+newest entry, to pick up other writers. Deletes are handled explicitly:
+clearing the table clears the index, and entries for rows another process
+deleted are dropped when suggestions find them missing (remove()).
+"""
+import os
+import re
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import FundingOpportunity
+
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", 0.8))
+DEDUP_INDEX_REFRESH_SECONDS = float(os.getenv("DEDUP_INDEX_REFRESH_SECONDS", 300))
+# Upper bound on pairs scored per suggestions scan (blocks are compared pairwise)
+DEDUP_MAX_COMPARISONS = int(os.getenv("DEDUP_MAX_COMPARISONS", 1_000_000))
+
+# created_at is stamped before commit, so another writer's row can become
+# visible after a newer one; re-reading this much history catches it.
+_REFRESH_OVERLAP = timedelta(minutes=5)
+
+_YEAR = re.compile(r"\b(19|20)\d{2}(\s*[/-]\s*\d{2,4})?\b")
+_FILLER = {"the", "a", "an", "of", "for", "and", "programme", "program", "fund"}
+_ACRONYM_SKIP = {"the", "of", "for", "and", "a", "an", "&"}
+
+
+def _words(value: str) -> list[str]:
+    return re.sub(r"[^\w\s]", " ", (value or "").lower()).split()
+
+
+def funder_block(funder_name: str) -> str:
+    """Blocking key: acronym for multi-word funder names, the word itself otherwise."""
+    words = [w for w in _words(funder_name) if w not in _ACRONYM_SKIP]
+    if len(words) > 1:
+        return "".join(w[0] for w in words)
+    return words[0] if words else ""
+
+
+def normalize_programme(programme_name: str) -> str:
+    text = _YEAR.sub(" ", (programme_name or "").lower())
+    return " ".join(w for w in _words(text) if w not in _FILLER)
+
+
+def trigrams(text: str) -> frozenset:
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def similar_pairs(blocks: list[list[tuple]], threshold: float, limit: int, max_comparisons: int = DEDUP_MAX_COMPARISONS) -> list[dict]:
+    """
+    Near-duplicate pairs within each block, best first.
+
+    Works on a blocks() copy, so it can run in a worker thread. Entries are
+    compared in order of trigram count: Jaccard is at most |A| / |B| for
+    |A| <= |B|, so once that ratio falls below `threshold` the rest of the
+    row is skipped. Scoring stops after `max_comparisons` pairs, which bounds
+    the cost of a very large block at the price of a partial result.
+    """
+    pairs, compared = [], 0
+    for entries in blocks:
+        entries = sorted(entries, key=lambda entry: len(entry[1]))
+        for i, (id_a, grams_a) in enumerate(entries):
+            for id_b, grams_b in entries[i + 1:]:
+                if len(grams_a) < threshold * len(grams_b):
+                    break
+                if compared >= max_comparisons:
+                    return _best(pairs, limit)
+                compared += 1
+                score = jaccard(grams_a, grams_b)
+                if score >= threshold:
+                    pairs.append({"a": id_a, "b": id_b, "score": round(score, 3)})
+    return _best(pairs, limit)
+
+
+def _best(pairs: list[dict], limit: int) -> list[dict]:
+    pairs.sort(key=lambda pair: -pair["score"])
+    return pairs[:limit]
+
+
+class OpportunityIndex:
+    def __init__(self):
+        # block -> {id: (trigrams, funder_name, programme_name)}
+        self._blocks: dict[str, dict[uuid.UUID, tuple]] = {}
+        self._block_of: dict[uuid.UUID, str] = {}
+        self.loaded_at: float = None
+        self._newest: datetime = None
+
+    def __len__(self) -> int:
+        return len(self._block_of)
+
+    def add(self, opportunity_id: uuid.UUID, funder_name: str, programme_name: str) -> None:
+        self.remove(opportunity_id)
+        block = funder_block(funder_name)
+        self._blocks.setdefault(block, {})[opportunity_id] = (trigrams(normalize_programme(programme_name)), funder_name, programme_name)
+        self._block_of[opportunity_id] = block
+
+    def remove(self, opportunity_id: uuid.UUID) -> None:
+        block = self._block_of.pop(opportunity_id, None)
+        if block is not None:
+            self._blocks[block].pop(opportunity_id, None)
+
+    def clear(self) -> None:
+        self._blocks.clear()
+        self._block_of.clear()
+        self.loaded_at = None
+        self._newest = None
+
+    def match(self, funder_name: str, programme_name: str, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> list[tuple[uuid.UUID, float]]:
+        """Entries in the same funder block scoring at least `threshold`, best first."""
+        grams = trigrams(normalize_programme(programme_name))
+        scored = [
+            (opportunity_id, jaccard(grams, entry[0]))
+            for opportunity_id, entry in self._blocks.get(funder_block(funder_name), {}).items()
+        ]
+        return sorted(((i, s) for i, s in scored if s >= threshold), key=lambda pair: -pair[1])
+
+    def blocks(self) -> list[list[tuple]]:
+        """Copy of every block with two or more entries, as (id, trigrams) pairs."""
+        return [[(i, entry[0]) for i, entry in block.items()] for block in self._blocks.values() if len(block) > 1]
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """
+        Load the index from the name columns on first use; after that, every
+        DEDUP_INDEX_REFRESH_SECONDS, add only the rows created since the newest
+        one seen (less _REFRESH_OVERLAP).
+        """
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < DEDUP_INDEX_REFRESH_SECONDS:
+            return
+        stmt = select(
+            FundingOpportunity.id,
+            FundingOpportunity.funder_name,
+            FundingOpportunity.programme_name,
+            FundingOpportunity.created_at,
+        )
+        if self.loaded_at is not None and self._newest is not None:
+            stmt = stmt.where(FundingOpportunity.created_at >= self._newest - _REFRESH_OVERLAP)
+        for row in (await db.execute(stmt)).all():
+            self.add(row.id, row.funder_name, row.programme_name)
+            if row.created_at is not None and (self._newest is None or row.created_at > self._newest):
+                self._newest = row.created_at
+        self.loaded_at = time.monotonic()
+
+
+opportunity_index = OpportunityIndex()
@@ -1,59 +1,132 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, and_, case, func, true, update, union_all, literal, literal_column, column, cast, table as table_, Text, JSON, ARRAY
 from sqlalchemy.future import select
-from app.models import FundingOpportunity, ApplicationPackage, FundingStatus, SubmissionStatus
+from sqlalchemy.dialects.postgresql import insert as pg_insert, JSONB
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, joinedload
+from app.agents.chunking import split_text
+from app.agents.deadlines import parse_deadline
+from app.agents.dedup import opportunity_index, similar_pairs
+from app.agents.parsing import JSONArrayStream, parse_extraction, validate_extracted
+from app.core.cache import ResultCache, result_cache, cache_key, normalize_query, dashboard_cache
+from app.core.http import request_with_retry
+from app.core.llm import LLMClient, llm_client
+from app.core.pdf import extract_pdf_text
+from app.models import FundingOpportunity, ApplicationPackage, FundingStatus, SubmissionStatus, DeadlinePrecision, opportunity_dedup_key
 import uuid
 from datetime import date, timedelta
-import json
 import re
 import os
-import google.generativeai as genai
-import requests
-from bs4 import BeautifulSoup
-import httpx # Use httpx for async requests if preferred, using requests for sync compatibility inside async func
 import asyncio
+import base64
+import functools
+import json
+import operator
+from typing import AsyncIterator
+from urllib.parse import urlsplit, urlunsplit
+
+# Research sweep tuning: parallel searches/extractions and context size per Gemini call
+RESEARCH_MAX_CONCURRENCY = int(os.getenv("RESEARCH_MAX_CONCURRENCY", 4))
+RESEARCH_BATCH_TOKENS = int(os.getenv("RESEARCH_BATCH_TOKENS", 6000))
+# Concurrent Gemini calls per Smart Import document
+IMPORT_MAX_CONCURRENCY = int(os.getenv("IMPORT_MAX_CONCURRENCY", 4))
+
+# Bump when a prompt or the scrape format changes so stale cache entries are ignored
+EXTRACTION_PROMPT_VERSION = "2"
+SEARCH_CACHE_VERSION = "1"
+# DuckDuckGo HTML endpoint; overridable so benchmarks can point at a local stub
+SEARCH_HTML_URL = os.getenv("SEARCH_HTML_URL", "https://html.duckduckgo.com/html/")
+# Budget patches: ops per json_set/json_remove/jsonb_build_object call (keeps
+# under the SQL function argument limits), and how many such calls may nest
+JSON_PATCH_GROUP_SIZE = 40
+JSON_PATCH_MAX_STEPS = 40
+
+
+def _normalize_url(url: str) -> str:
+    """Canonical form used to merge search hits: no fragment, lowercase host, no trailing slash."""
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+
+
+def _read_text_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8", errors="ignore")
+
+
+def encode_cursor(deadline: date, opportunity_id: uuid.UUID) -> str:
+    """Opaque keyset cursor for the (deadline, id) ordering; deadline may be None."""
+    raw = f"{deadline.isoformat() if deadline else ''}|{opportunity_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[date, uuid.UUID]:
+    """Inverse of encode_cursor. Raises ValueError for malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_deadline, raw_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return (date.fromisoformat(raw_deadline) if raw_deadline else None), uuid.UUID(raw_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class VersionConflict(Exception):
+    """The application was saved by someone else since the client's version."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Application is at version {current_version}")
+        self.current_version = current_version
+
 
 class FundingAgent:
-    def __init__(self, db_session: AsyncSession):
+    def __init__(self, db_session: AsyncSession, cache: ResultCache = result_cache, llm: LLMClient = None):
         self.db = db_session
-        # Configure Gemini
-        api_key = os.getenv("GEMINI_API_KEY")
-        if api_key:
-            genai.configure(api_key=api_key)
+        self.cache = cache
+        # Shared, rate-limited Gemini client (configured from GEMINI_API_KEY)
+        self.llm = llm or llm_client
+        # Process-wide near-duplicate index over existing opportunities
+        self.index = opportunity_index
 
-    def _scrape_ddg(self, query: str) -> list[dict]:
+    async def _scrape_ddg(self, query: str) -> list[dict]:
         """Manual scraping of DuckDuckGo HTML version to avoid library issues."""
+        key = cache_key("search", SEARCH_CACHE_VERSION, normalize_query(query))
+        cached = await self.cache.get("search", key)
+        if cached is not None:
+            return cached
+
         print(f"Scraping DDG for: {query}")
-        url = "https://html.duckduckgo.com/html/"
+        url = SEARCH_HTML_URL
         data = {"q": query}
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        
+
         try:
-            # We use sync requests here but wrap in thread if needed, or just block briefly
-            # Given the agent nature, blocking for 1-2s is acceptable
-            response = requests.post(url, data=data, headers=headers, timeout=15)
-            
+            # Pooled async client: no worker thread is held while waiting on the network
+            response = await request_with_retry("POST", url, data=data)
+
             if response.status_code != 200:
                 print(f"DDG Non-200 Status: {response.status_code}")
                 return []
-                
+
+            # Imported here so bs4 stays off the startup path of list-only processes
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(response.text, "html.parser")
             results = []
-            
+
             for result in soup.find_all("div", class_="result"):
                 title_tag = result.find("a", class_="result__a")
                 snippet_tag = result.find("a", class_="result__snippet")
-                
+
                 if title_tag and snippet_tag:
                     results.append({
                         "title": title_tag.get_text(strip=True),
                         "href": title_tag["href"],
                         "body": snippet_tag.get_text(strip=True)
                     })
-            
-            return results[:10] # Return top 10
-            
+
+            results = results[:10] # Return top 10
+            if results:
+                await self.cache.set("search", key, results)
+            return results
+
         except Exception as e:
             print(f"DDG Scraping Error: {e}")
             return []
@@ -72,47 +145,126 @@ class FundingAgent:
         print(f"Hybrid Research: Searching for '{query}' in '{region}'...")
         
         # Step 1: Free Web Search (Scraping)
-        full_query = f"{query} {region} grants funding opportunities 2026 application"
+        search_results = await self._scrape_ddg(self._research_query(query, region))
         
-        # Run sync scraping in thread to avoid blocking event loop
-        search_results = await asyncio.to_thread(self._scrape_ddg, full_query)
-        
-        context_text = ""
-        for r in search_results:
-            context_text += f"\nSOURCE: {r['title']}\nURL: {r['href']}\nCONTENT: {r['body']}\n"
+        context_text = self._search_context(search_results)
 
         if not context_text:
             print("No search results found to analyze.")
             return [] # Fail silently/gracefully
 
         # Step 2: Intelligent Extraction with Gemini
+        return await self._extract_from_search_context(context_text)
+
+    async def research_sweep(self, queries: list[str], regions: list[str]) -> list[dict]:
+        """
+        Multi-query research: one search per (query, region) pair, run concurrently.
+
+        Search hits are merged and deduplicated by URL, then sent to Gemini in
+        batches that fit RESEARCH_BATCH_TOKENS, with the batches extracted
+        concurrently. Opportunities repeated across batches are merged.
+        """
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            print("GEMINI_API_KEY not set")
+            return []
+
+        search_terms = list(dict.fromkeys(self._research_query(q, r) for q in queries for r in regions))
+        print(f"Research Sweep: {len(search_terms)} searches...")
+
+        semaphore = asyncio.Semaphore(RESEARCH_MAX_CONCURRENCY)
+
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+
+        search_batches = await asyncio.gather(*(bounded(self._scrape_ddg(term)) for term in search_terms))
+
+        merged: dict[str, dict] = {}
+        found_by: dict[str, str] = {}
+        for term, hits in zip(search_terms, search_batches):
+            for hit in hits:
+                url = _normalize_url(hit["href"])
+                merged.setdefault(url, hit)
+                found_by.setdefault(url, term)
+
+        if not merged:
+            print("No search results found to analyze.")
+            return []
+
+        contexts = self._batch_search_context(list(merged.values()), RESEARCH_BATCH_TOKENS)
+        extracted = await asyncio.gather(*(bounded(self._extract_from_search_context(ctx)) for ctx in contexts))
+
+        results = self._merge_extractions(extracted)
+        # Provenance: the first search whose hits included the opportunity's source page
+        for result in results:
+            if result.get("source_url"):
+                result.setdefault("source_query", found_by.get(_normalize_url(result["source_url"])))
+        return results
+
+    @staticmethod
+    def _research_query(query: str, region: str) -> str:
+        return f"{query} {region} grants funding opportunities 2026 application"
+
+    @staticmethod
+    def _search_context(search_results: list[dict]) -> str:
+        context_text = ""
+        for r in search_results:
+            context_text += f"\nSOURCE: {r['title']}\nURL: {r['href']}\nCONTENT: {r['body']}\n"
+        return context_text
+
+    @classmethod
+    def _batch_search_context(cls, search_results: list[dict], token_budget: int) -> list[str]:
+        """Group search hits into context blocks of roughly token_budget tokens (~4 chars each)."""
+        char_budget = token_budget * 4
+        batches, current, size = [], [], 0
+        for hit in search_results:
+            hit_size = len(cls._search_context([hit]))
+            if current and size + hit_size > char_budget:
+                batches.append(cls._search_context(current))
+                current, size = [], 0
+            current.append(hit)
+            size += hit_size
+        if current:
+            batches.append(cls._search_context(current))
+        return batches
+
+    @staticmethod
+    def _research_prompt(context_text: str) -> str:
+        return f"""You are an expert funding researcher. I will provide search results for funding opportunities.
+        
+        Your job is to extract REAL funding opportunities from the text below.
+        Ignore generic listicles unless they name specific grants.
+        
+        SEARCH CONTEXT:
+        {context_text}
+        
+        INSTRUCTIONS:
+        Extract at least 3-5 distinct opportunities.
+        For each, provide:
+        - funder_name
+        - programme_name
+        - deadline_estimate (e.g. "Late 2026", "Open", "April 15")
+        - description (summary of what it funds)
+        - source_url (the specific URL from the source)
+        
+        Return strictly a JSON array of objects. No markdown formatting.
+        """
+
+    async def _extract_from_search_context(self, context_text: str) -> list[dict]:
+        """Run the Gemini extraction prompt over a block of search results."""
+        key = cache_key("research", EXTRACTION_PROMPT_VERSION, context_text)
+        cached = await self.cache.get("research", key)
+        if cached is not None:
+            return cached
+
         try:
-            model = genai.GenerativeModel("gemini-2.0-flash")
-            
-            prompt = f"""You are an expert funding researcher. I will provide search results for funding opportunities.
-            
-            Your job is to extract REAL funding opportunities from the text below.
-            Ignore generic listicles unless they name specific grants.
+            prompt = self._research_prompt(context_text)
             
-            SEARCH CONTEXT:
-            {context_text}
-            
-            INSTRUCTIONS:
-            Extract at least 3-5 distinct opportunities.
-            For each, provide:
-            - funder_name
-            - programme_name
-            - deadline_estimate (e.g. "Late 2026", "Open", "April 15")
-            - description (summary of what it funds)
-            - source_url (the specific URL from the source)
-            
-            Return strictly a JSON array of objects. No markdown formatting.
-            """
-            
-            response = await asyncio.to_thread(model.generate_content, prompt)
-            clean_text = response.text.strip().replace("```json", "").replace("```", "")
-            
-            data = json.loads(clean_text)
+            response = await self.llm.generate(prompt)
+            data = parse_extraction(response)
+            if data:
+                await self.cache.set("research", key, data)
             return data
 
         except Exception as e:
@@ -121,29 +273,122 @@ class FundingAgent:
             traceback.print_exc()
             return []
 
+    async def stream_research(self, query: str = "film documentary arts grants funding", region: str = "South Africa") -> AsyncIterator[tuple[str, object]]:
+        """
+        Streaming variant of research: yields (event, payload) pairs as stages finish.
+
+        - ("search", hits) once the web search returns
+        - ("opportunity", FundingOpportunity) for each stored opportunity, new or
+          existing, as soon as the streamed Gemini chunk it parsed out of has
+          been upserted (one _persist_opportunities call per chunk)
+        - ("done", summary) at the end, or ("error", detail) on failure
+        """
+        if not os.getenv("GEMINI_API_KEY"):
+            yield "error", {"detail": "GEMINI_API_KEY not set"}
+            return
+
+        search_results = await self._scrape_ddg(self._research_query(query, region))
+        yield "search", search_results
+
+        context_text = self._search_context(search_results)
+        search_term = self._research_query(query, region)
+        extracted = 0
+        emitted = set()
+        if context_text:
+            try:
+                async for batch in self._stream_extraction(context_text):
+                    extracted += len(batch)
+                    batch = [{**item, "source_query": search_term} for item in batch]
+                    for opportunity in await self._persist_opportunities(batch, notes="Discovered via Deep Research", upsert=True):
+                        # Later chunks can fold into a row already sent
+                        if opportunity.id not in emitted:
+                            emitted.add(opportunity.id)
+                            yield "opportunity", opportunity
+            except Exception as e:
+                print(f"Gemini Streaming Extraction failed: {e}")
+                yield "error", {"detail": str(e)}
+        yield "done", {"extracted": extracted, "stored": len(emitted)}
+
+    async def _stream_extraction(self, context_text: str) -> AsyncIterator[list[dict]]:
+        """
+        Yield the opportunity dicts completed by each chunk of a streamed Gemini
+        response, as one list per chunk (a cached extraction is a single list).
+        """
+        key = cache_key("research", EXTRACTION_PROMPT_VERSION, context_text)
+        cached = await self.cache.get("research", key)
+        if cached is not None:
+            if cached:
+                yield cached
+            return
+
+        parser = JSONArrayStream()
+        items = []
+        async for chunk in self.llm.stream(self._research_prompt(context_text)):
+            batch = [item for item in map(validate_extracted, parser.feed(chunk)) if item is not None]
+            if batch:
+                items.extend(batch)
+                yield batch
+        if items:
+            await self.cache.set("research", key, items)
+
+    async def research_and_create_opportunities(self, query: str = "film documentary arts grants funding", region: str = "South Africa") -> list[FundingOpportunity]:
+        """
+        Research one query and upsert the results; returns every stored row the
+        research touched, new or existing (see _persist_opportunities).
+        """
+        results = await self.research_opportunities(query, region)
+        search_term = self._research_query(query, region)
+        for result in results:
+            result.setdefault("source_query", search_term)
+        return await self._persist_opportunities(results, notes="Discovered via Deep Research", upsert=True)
+
+    async def research_sweep_and_create_opportunities(self, queries: list[str], regions: list[str]) -> list[FundingOpportunity]:
+        """Run a research sweep and upsert the discovered opportunities."""
+        results = await self.research_sweep(queries, regions)
+        return await self._persist_opportunities(results, notes="Discovered via Research Sweep", upsert=True)
+
 
     async def parse_opportunities_from_text(self, text: str) -> list[dict]:
         """
         Smart Import: Parse unstructured text (emails, chat logs, lists) into structured opportunities.
         Uses Gemini Flash for intelligent extraction without search tools.
+
+        Long documents are split into overlapping chunks that are extracted
+        concurrently (at most IMPORT_MAX_CONCURRENCY at a time) and merged.
         """
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             print("GEMINI_API_KEY not set")
             return []
-            
-        print("Smart Import: Parsing raw text...")
-        
+
+        chunks = split_text(text)
+        print(f"Smart Import: Parsing raw text in {len(chunks)} chunk(s)...")
+
+        semaphore = asyncio.Semaphore(IMPORT_MAX_CONCURRENCY)
+
+        async def bounded(chunk: str) -> list[dict]:
+            async with semaphore:
+                return await self._parse_chunk(chunk)
+
+        extracted = await asyncio.gather(*(bounded(chunk) for chunk in chunks))
+        return self._merge_extractions(extracted)
+
+    async def _parse_chunk(self, text: str) -> list[dict]:
+        """Run the Smart Import extraction prompt over a single chunk of text."""
+        key = cache_key("import", EXTRACTION_PROMPT_VERSION, text)
+        cached = await self.cache.get("import", key)
+        if cached is not None:
+            return cached
+
+        response = None
         try:
-            model = genai.GenerativeModel("gemini-2.0-flash")
-            
             prompt = f"""You are an expert funding data analyst.
             
             I am providing raw text/content that contains funding opportunities (e.g. from an email, chat log, PDF, or list).
             Your job is to specific extract funding opportunities into a structured JSON array.
             
             RAW CONTENT:
-            {text[:30000]}  # Limit context window just in case
+            {text}
             
             INSTRUCTIONS:
             Extract every distinct funding opportunity found in the text.
@@ -160,87 +405,251 @@ class FundingAgent:
             Return strictly a JSON array of objects. No markdown formatting.
             """
             
-            response = await asyncio.to_thread(model.generate_content, prompt)
-            clean_text = response.text.strip().replace("```json", "").replace("```", "")
-            
-            data = json.loads(clean_text)
+            response = await self.llm.generate(prompt)
+            data = parse_extraction(response)
+            if data:
+                await self.cache.set("import", key, data)
             return data
 
         except Exception as e:
             print(f"Gemini Text Parsing failed: {e}")
-            print(f"Raw Response Text: {response.text}") # Debug log
+            if response is not None:
+                print(f"Raw Response Text: {response}") # Debug log
             import traceback
             traceback.print_exc()
             return []
 
+    @classmethod
+    def _merge_extractions(cls, batches: list[list[dict]]) -> list[dict]:
+        """
+        Combine per-chunk results, collapsing opportunities with the same normalized key.
+        Empty fields are filled from later duplicates and list fields are unioned.
+        """
+        merged: dict[str, dict] = {}
+        for batch in batches:
+            for item in batch:
+                if not isinstance(item, dict):
+                    continue
+                key = opportunity_dedup_key(*cls._opportunity_names(item))
+                if key not in merged:
+                    merged[key] = dict(item)
+                    continue
+                target = merged[key]
+                for field, value in item.items():
+                    if isinstance(value, list) and isinstance(target.get(field), list):
+                        target[field] = list(dict.fromkeys(target[field] + value))
+                    elif not target.get(field) and value:
+                        target[field] = value
+        return list(merged.values())
+
     async def import_opportunities_from_text(self, text: str) -> list[FundingOpportunity]:
         """
         Import opportunities from raw text and persist them to the database.
         """
         parsed_results = await self.parse_opportunities_from_text(text)
-        created = []
-        
-        # Default deadline is 3 months from now if not specified
-        default_deadline = date.today() + timedelta(days=90)
-        
-        for result in parsed_results:
-            # Check if similar opportunity already exists
-            existing = await self.db.execute(
-                select(FundingOpportunity).where(
-                    FundingOpportunity.funder_name == result.get("funder_name", "Unknown")[:100],
-                    FundingOpportunity.programme_name == result.get("programme_name", "General")[:200]
-                )
-            )
-            if existing.scalars().first():
-                continue  # Skip duplicates
-            
-            opportunity = FundingOpportunity(
-                funder_name=result.get("funder_name", "Unknown")[:100],
-                programme_name=result.get("programme_name", "General")[:200],
-                deadline=default_deadline,  # In future, parsing logic could extract ISO dates
-                status=FundingStatus.TO_REVIEW,
-                eligibility_criteria={
-                    "source": result.get("source_url", ""),
-                    "description": result.get("description", ""),
-                    "deadline_estimate": result.get("deadline_estimate", ""),
-                    "requirements": result.get("requirements", []),
-                    "required_documents": result.get("required_documents", [])
-                },
-                budget_rules={"notes": "Imported via Smart Import"}
-            )
-            self.db.add(opportunity)
-            created.append(opportunity)
-        
-        if created:
-            await self.db.commit()
-            for opp in created:
-                await self.db.refresh(opp)
-        
-        return created
+        return await self._persist_opportunities(parsed_results, notes="Imported via Smart Import")
+
+    @staticmethod
+    def _opportunity_names(result: dict) -> tuple[str, str]:
+        """Funder and programme names as stored: defaulted and truncated."""
+        funder_name = str(result.get("funder_name") or "Unknown")[:100]
+        programme_name = str(result.get("programme_name") or "General")[:200]
+        return funder_name, programme_name
 
-    async def import_file(self, file_contents: bytes, filename: str) -> list[FundingOpportunity]:
+    def _insert(self):
+        """Dialect-specific INSERT construct that supports ON CONFLICT."""
+        if self.db.bind.dialect.name == "postgresql":
+            return pg_insert
+        return sqlite_insert
+
+    def _list_contains(self, column, value: str):
         """
-        Import funding opportunities from an uploaded file (PDF or Text).
+        Membership test on a JSON list column: `@>` on Postgres (served by the
+        GIN index), json_each on SQLite.
         """
-        text = ""
-        filename_lower = filename.lower()
-        
+        if self.db.bind.dialect.name == "postgresql":
+            return column.contains([value])
+        items = func.json_each(column).table_valued("value").alias("items")
+        return select(1).select_from(items).where(items.c.value == value).exists()
+
+    def _list_mentions(self, column, text: str):
+        """
+        Case-insensitive substring match against any entry of a JSON list
+        column, unnested in the database (jsonb_array_elements_text on
+        Postgres, JSON1 json_each on SQLite).
+        """
+        if self.db.bind.dialect.name == "postgresql":
+            unnest = func.jsonb_array_elements_text
+        else:
+            unnest = func.json_each
+        items = unnest(column).table_valued("value").alias("items")
+        return select(1).select_from(items).where(items.c.value.icontains(text, autoescape=True)).exists()
+
+    async def _persist_opportunities(self, results: list[dict], notes: str, upsert: bool = False) -> list[FundingOpportunity]:
+        """
+        Bulk-insert extracted opportunities, skipping exact duplicates.
+
+        Only the unique dedup key decides what is a duplicate: repeats within
+        the batch are dropped, and rows that already exist are skipped by the
+        database through ON CONFLICT DO NOTHING. Near-duplicates (funder
+        acronyms, trailing years, small spelling differences) are stored like
+        any other result and surfaced as merge suggestions through the
+        opportunity index (get_duplicate_suggestions), never dropped, since
+        e.g. "Production Grant 2025" and "Production Grant 2026" can both be
+        real. The whole batch is a single INSERT ... RETURNING, so only newly
+        created rows come back.
+
+        With upsert=True (research), a result whose dedup key already exists
+        is folded into that row instead: the conflict fills the row's blank
+        fields (ON CONFLICT DO UPDATE). The returned rows are then every stored
+        opportunity the batch touched.
+        """
+        pending: dict[str, dict] = {}
+        for result in results:
+            if not isinstance(result, dict):
+                continue
+            funder_name, programme_name = self._opportunity_names(result)
+            key = opportunity_dedup_key(funder_name, programme_name)
+            if key in pending:
+                continue
+            deadline, precision = parse_deadline(result.get("deadline_estimate", ""))
+            pending[key] = {
+                "id": uuid.uuid4(),
+                "funder_name": funder_name,
+                "programme_name": programme_name,
+                "dedup_key": key,
+                "deadline": deadline,
+                "deadline_precision": precision,
+                "status": FundingStatus.TO_REVIEW,
+                "source_url": result.get("source_url") or None,
+                "source_query": result.get("source_query"),
+                "description": result.get("description", ""),
+                "requirements": result.get("requirements", []),
+                "required_documents": result.get("required_documents", []),
+                "eligibility_criteria": {"deadline_estimate": result.get("deadline_estimate", "")},
+                "budget_rules": {"notes": notes},
+            }
+
+        return await self._insert_opportunities(list(pending.values()), merge=upsert)
+
+    async def _insert_opportunities(self, rows: list[dict], merge: bool = False) -> list[FundingOpportunity]:
+        """
+        Insert prepared rows in one statement and commit. Conflicting dedup keys
+        are skipped, or with merge=True fill the existing row's blank source,
+        provenance, description and deadline and are returned as well.
+        """
+        if not rows:
+            return []
+
+        insert = self._insert()(FundingOpportunity).values(rows)
+        if merge:
+            stored, new = FundingOpportunity, insert.excluded
+            insert = insert.on_conflict_do_update(index_elements=["dedup_key"], set_={
+                "source_url": func.coalesce(stored.source_url, new.source_url),
+                "source_query": func.coalesce(stored.source_query, new.source_query),
+                "description": func.coalesce(func.nullif(stored.description, ""), new.description),
+                "deadline_precision": case((stored.deadline.is_(None), new.deadline_precision), else_=stored.deadline_precision),
+                "deadline": func.coalesce(stored.deadline, new.deadline),
+            })
+        else:
+            insert = insert.on_conflict_do_nothing(index_elements=["dedup_key"])
+        stmt = insert.returning(FundingOpportunity).execution_options(populate_existing=True)
+        stored = (await self.db.scalars(stmt)).all()
+        await self.db.commit()
+        if stored:
+            dashboard_cache.invalidate()
+        for opportunity in stored:
+            self.index.add(opportunity.id, opportunity.funder_name, opportunity.programme_name)
+        return stored
+
+    async def bulk_create_opportunities(self, items: list[dict]) -> list[dict]:
+        """
+        Create many opportunities in one transaction.
+
+        Returns one result per input item, in order: "created" with the new id,
+        or "duplicate" when the item repeats an earlier item or an existing row.
+        """
+        rows: dict[str, dict] = {}
+        keys = []
+        for item in items:
+            key = opportunity_dedup_key(item["funder_name"], item["programme_name"])
+            keys.append(key)
+            rows.setdefault(key, {
+                "id": uuid.uuid4(),
+                "funder_name": item["funder_name"],
+                "programme_name": item["programme_name"],
+                "dedup_key": key,
+                "deadline": item["deadline"],
+                "deadline_precision": DeadlinePrecision.DAY,
+                "status": FundingStatus.TO_REVIEW,
+                "eligibility_criteria": {},
+                "budget_rules": {},
+            })
+
+        created = {opp.dedup_key: opp for opp in await self._insert_opportunities(list(rows.values()))}
+
+        results = []
+        for index, key in enumerate(keys):
+            opp = created.pop(key, None)
+            if opp is not None:
+                results.append({"index": index, "id": opp.id, "result": "created"})
+            else:
+                results.append({"index": index, "id": None, "result": "duplicate", "detail": "Opportunity already exists for this funder and programme"})
+        return results
+
+    async def bulk_update_opportunities(self, items: list[dict]) -> list[dict]:
+        """
+        Apply status/deadline changes to many opportunities in one transaction.
+
+        Items with the same set of changes are grouped into a single
+        UPDATE ... WHERE id IN (...) RETURNING id; ids that match no row are
+        reported as "not_found".
+        """
+        groups: dict[tuple, list[uuid.UUID]] = {}
+        for item in items:
+            changes = tuple(sorted((field, item[field]) for field in ("status", "deadline") if item.get(field) is not None))
+            if item.get("deadline") is not None:
+                changes += (("deadline_precision", DeadlinePrecision.DAY),)
+            groups.setdefault(changes, []).append(item["id"])
+
+        updated: set[uuid.UUID] = set()
+        for changes, ids in groups.items():
+            if not changes:
+                # Nothing to change: report existence only
+                result = await self.db.execute(select(FundingOpportunity.id).where(FundingOpportunity.id.in_(ids)))
+            else:
+                result = await self.db.execute(
+                    update(FundingOpportunity)
+                    .where(FundingOpportunity.id.in_(ids))
+                    .values(**dict(changes))
+                    .returning(FundingOpportunity.id)
+                )
+            updated.update(result.scalars().all())
+        await self.db.commit()
+        if updated:
+            dashboard_cache.invalidate()
+
+        return [
+            {"index": index, "id": item["id"], "result": "updated"} if item["id"] in updated
+            else {"index": index, "id": item["id"], "result": "not_found", "detail": "Opportunity not found"}
+            for index, item in enumerate(items)
+        ]
+
+    async def extract_file_text(self, path: str, filename: str) -> str:
+        """Extract the text of an uploaded file (PDF or Text) spooled to disk."""
         print(f"Smart Import: Processing file '{filename}'...")
+        if filename.lower().endswith(".pdf"):
+            # Parsed in the PDF process pool, off the event loop
+            return await extract_pdf_text(path)
+        # Assume text/markdown/html
+        return await asyncio.to_thread(_read_text_file, path)
 
+    async def import_file(self, path: str, filename: str) -> list[FundingOpportunity]:
+        """
+        Import funding opportunities from an uploaded file (PDF or Text) spooled to disk.
+        """
         try:
-            if filename_lower.endswith(".pdf"):
-                import io
-                from pypdf import PdfReader
-                
-                # Reading PDF logic
-                pdf_file = io.BytesIO(file_contents)
-                reader = PdfReader(pdf_file)
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                    
-            else:
-                # Assume text/markdown/html
-                text = file_contents.decode("utf-8", errors="ignore")
+            text = await self.extract_file_text(path, filename)
             
             if not text.strip():
                 print("Extracted text is empty.")
@@ -263,7 +672,13 @@ class FundingAgent:
             budget_rules={}
         )
         self.db.add(opportunity)
-        await self.db.commit()
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise ValueError("Opportunity already exists for this funder and programme")
+        dashboard_cache.invalidate()
+        self.index.add(opportunity.id, funder_name, programme_name)
         await self.db.refresh(opportunity)
         return opportunity
 
@@ -272,9 +687,205 @@ class FundingAgent:
         result = await self.db.execute(select(FundingOpportunity).order_by(FundingOpportunity.deadline))
         return result.scalars().all()
 
-    async def get_opportunity(self, opportunity_id: uuid.UUID) -> FundingOpportunity:
-        result = await self.db.execute(select(FundingOpportunity).where(FundingOpportunity.id == opportunity_id))
-        return result.scalars().first()
+    async def get_opportunity_page(
+        self,
+        limit: int = 50,
+        cursor: str = None,
+        status: FundingStatus = None,
+        deadline_from: date = None,
+        deadline_to: date = None,
+        funder: str = None,
+        source_url: str = None,
+        required_document: str = None,
+        requirement: str = None,
+    ) -> tuple[list, str]:
+        """
+        Keyset-paginated opportunity summaries ordered by (deadline, id), with
+        undated (rolling/unknown) opportunities last.
+
+        Only the summary columns are selected, so the JSON blobs never leave the
+        database. Returns the page rows and the cursor for the next page (None on
+        the last page). Raises ValueError for a malformed cursor.
+        """
+        stmt = select(
+            FundingOpportunity.id,
+            FundingOpportunity.funder_name,
+            FundingOpportunity.programme_name,
+            FundingOpportunity.deadline,
+            FundingOpportunity.deadline_precision,
+            FundingOpportunity.status,
+        )
+        if cursor:
+            last_deadline, last_id = decode_cursor(cursor)
+            if last_deadline is None:
+                stmt = stmt.where(FundingOpportunity.deadline.is_(None), FundingOpportunity.id > last_id)
+            else:
+                stmt = stmt.where(or_(
+                    FundingOpportunity.deadline > last_deadline,
+                    and_(FundingOpportunity.deadline == last_deadline, FundingOpportunity.id > last_id),
+                    FundingOpportunity.deadline.is_(None),
+                ))
+        if status is not None:
+            stmt = stmt.where(FundingOpportunity.status == status)
+        if deadline_from is not None:
+            stmt = stmt.where(FundingOpportunity.deadline >= deadline_from)
+        if deadline_to is not None:
+            stmt = stmt.where(FundingOpportunity.deadline <= deadline_to)
+        if funder:
+            stmt = stmt.where(FundingOpportunity.funder_name.icontains(funder, autoescape=True))
+        if source_url:
+            stmt = stmt.where(FundingOpportunity.source_url == source_url)
+        if required_document:
+            stmt = stmt.where(self._list_contains(FundingOpportunity.required_documents, required_document))
+        if requirement:
+            stmt = stmt.where(self._list_mentions(FundingOpportunity.requirements, requirement))
+
+        # Fetch one extra row to learn whether another page exists
+        stmt = stmt.order_by(FundingOpportunity.deadline.asc().nulls_last(), FundingOpportunity.id).limit(limit + 1)
+        rows = (await self.db.execute(stmt)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].deadline, rows[-1].id)
+        return rows, next_cursor
+
+    async def search(self, query: str, limit: int = 20, offset: int = 0) -> tuple[list, int]:
+        """
+        Ranked full-text search over opportunities (funder, programme,
+        description) and application narratives.
+
+        Served by the tsvector GIN indexes on Postgres and the FTS5 tables on
+        SQLite; both sources are ranked together in one UNION ALL. Returns the
+        page of hits and the offset of the next page (None on the last page).
+        """
+        if self.db.bind.dialect.name == "postgresql":
+            tsquery = func.websearch_to_tsquery("english", query)
+
+            def ranked(table: str):
+                vector = literal_column(f"{table}.search_vector")
+                return vector.op("@@")(tsquery), func.ts_rank_cd(vector, tsquery)
+
+            opp_match, opp_rank = ranked("funding_opportunities")
+            app_match, app_rank = ranked("application_packages")
+            opp_from = select().select_from(FundingOpportunity)
+            app_from = select().select_from(ApplicationPackage)
+        else:
+            # Quote each term so user input can never be parsed as FTS5 syntax
+            terms = re.findall(r"\w+", query.lower())
+            if not terms:
+                return [], None
+            fts_query = " ".join(f'"{term}"*' for term in terms)
+
+            def ranked(fts_table: str, model):
+                fts = table_(fts_table, column("rowid"))
+                joined = select().select_from(fts).join(
+                    model, literal_column(f"{model.__tablename__}.rowid") == fts.c.rowid,
+                )
+                # bm25 is lower-is-better; negate so both dialects sort descending
+                return literal_column(fts_table).op("MATCH")(fts_query), -func.bm25(literal_column(fts_table)), joined
+
+            opp_match, opp_rank, opp_from = ranked("opportunities_fts", FundingOpportunity)
+            app_match, app_rank, app_from = ranked("applications_fts", ApplicationPackage)
+
+        opportunities = opp_from.add_columns(
+            literal_column("'opportunity'").label("kind"),
+            FundingOpportunity.id.label("id"),
+            FundingOpportunity.id.label("opportunity_id"),
+            FundingOpportunity.funder_name,
+            FundingOpportunity.programme_name,
+            opp_rank.label("rank"),
+        ).where(opp_match)
+        applications = app_from.join(
+            FundingOpportunity, FundingOpportunity.id == ApplicationPackage.opportunity_id
+        ).add_columns(
+            literal_column("'application'").label("kind"),
+            ApplicationPackage.id.label("id"),
+            ApplicationPackage.opportunity_id.label("opportunity_id"),
+            FundingOpportunity.funder_name,
+            FundingOpportunity.programme_name,
+            app_rank.label("rank"),
+        ).where(app_match)
+
+        hits = union_all(opportunities, applications).subquery()
+        rows = (await self.db.execute(
+            select(hits).order_by(hits.c.rank.desc(), hits.c.id).limit(limit + 1).offset(offset)
+        )).all()
+        next_offset = offset + limit if len(rows) > limit else None
+        return rows[:limit], next_offset
+
+    async def get_deadline_calendar(self, start: date, end: date, bucket: str = "month") -> list[dict]:
+        """
+        Opportunities with a deadline in [start, end], grouped into week or month buckets.
+
+        A single range scan on the (deadline, id) index returns rows already in
+        order, so bucketing is one linear pass.
+        """
+        rows = (await self.db.execute(
+            select(
+                FundingOpportunity.id,
+                FundingOpportunity.funder_name,
+                FundingOpportunity.programme_name,
+                FundingOpportunity.deadline,
+                FundingOpportunity.deadline_precision,
+                FundingOpportunity.status,
+            )
+            .where(FundingOpportunity.deadline >= start, FundingOpportunity.deadline <= end)
+            .order_by(FundingOpportunity.deadline, FundingOpportunity.id)
+        )).all()
+
+        buckets: dict[date, list] = {}
+        for row in rows:
+            if bucket == "week":
+                bucket_start = row.deadline - timedelta(days=row.deadline.weekday())
+            else:
+                bucket_start = row.deadline.replace(day=1)
+            buckets.setdefault(bucket_start, []).append(row)
+        return [
+            {"bucket_start": bucket_start, "count": len(items), "opportunities": items}
+            for bucket_start, items in buckets.items()
+        ]
+
+    async def get_duplicate_suggestions(self, threshold: float, limit: int) -> list[dict]:
+        """
+        Near-duplicate opportunity pairs from the in-memory index, with both
+        summaries. The pairwise scan runs in a thread over a copy of the index,
+        so a large block never stalls the event loop.
+        """
+        await self.index.ensure_loaded(self.db)
+        pairs = await asyncio.to_thread(similar_pairs, self.index.blocks(), threshold, limit)
+        ids = {pair["a"] for pair in pairs} | {pair["b"] for pair in pairs}
+        if not ids:
+            return []
+        rows = (await self.db.execute(
+            select(
+                FundingOpportunity.id,
+                FundingOpportunity.funder_name,
+                FundingOpportunity.programme_name,
+                FundingOpportunity.deadline,
+                FundingOpportunity.status,
+            ).where(FundingOpportunity.id.in_(ids))
+        )).all()
+        by_id = {row.id: row for row in rows}
+        for opportunity_id in ids - by_id.keys():
+            self.index.remove(opportunity_id)
+        return [
+            {"score": pair["score"], "a": by_id[pair["a"]], "b": by_id[pair["b"]]}
+            for pair in pairs
+            if pair["a"] in by_id and pair["b"] in by_id
+        ]
+
+    async def get_opportunity(self, opportunity_id: uuid.UUID, include_application: bool = False) -> FundingOpportunity:
+        """
+        Fetch one opportunity. With include_application the application is
+        joined into the same query (LEFT OUTER JOIN), so the detail view costs a
+        single round trip and never touches the lazy loader under async.
+        """
+        stmt = select(FundingOpportunity).where(FundingOpportunity.id == opportunity_id)
+        if include_application:
+            stmt = stmt.options(joinedload(FundingOpportunity.applications))
+        result = await self.db.execute(stmt)
+        return result.unique().scalars().first()
 
     async def create_application(self, opportunity_id: uuid.UUID) -> ApplicationPackage:
         """Create a draft application for an opportunity."""
@@ -291,7 +902,13 @@ class FundingAgent:
             final_approval=False
         )
         self.db.add(app_package)
-        await self.db.commit()
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            # Lost a race against a concurrent create; the unique index caught it
+            await self.db.rollback()
+            raise ValueError("Application already exists for this opportunity")
+        dashboard_cache.invalidate()
         await self.db.refresh(app_package)
         return app_package
 
@@ -303,6 +920,149 @@ class FundingAgent:
         result = await self.db.execute(select(ApplicationPackage).where(ApplicationPackage.id == app_id))
         return result.scalars().first()
 
+    async def patch_application(
+        self,
+        app_id: uuid.UUID,
+        version: int,
+        narrative_edits: list[dict] = (),
+        budget_patch: list[dict] = (),
+        status: SubmissionStatus = None,
+    ):
+        """
+        Apply text splices to the narrative and JSON Patch ops to the budget in
+        a single UPDATE ... WHERE version = :version RETURNING.
+
+        The edits are translated into SQL over the stored values, so neither
+        document is read back. Returns the (id, version, submission_status) row,
+        None if the application does not exist. Raises VersionConflict if it was
+        saved since `version`, and ValueError if the edits fall outside the
+        saved text or a budget op's parent object does not exist (RFC 6902).
+        """
+        values = {"version": ApplicationPackage.version + 1}
+        # (condition, error) pairs the saved values must satisfy for the edits to apply
+        checks = []
+
+        if narrative_edits:
+            # Stitch unchanged slices of the saved text around the inserted text;
+            # every offset refers to the saved text, so the expression stays linear.
+            saved = func.coalesce(ApplicationPackage.narrative_draft, "")
+            parts, position = [], 0
+            for edit in narrative_edits:
+                parts.append(func.substr(saved, position + 1, edit["start"] - position, type_=Text))
+                parts.append(literal(edit["text"], Text))
+                position = edit["end"]
+            parts.append(func.substr(saved, position + 1, type_=Text))
+            values["narrative_draft"] = functools.reduce(operator.add, parts)
+            checks.append((func.length(saved) >= position, "Edit range is outside the saved narrative"))
+
+        if budget_patch:
+            values["budget_json"], parent_checks = self._json_patch_expression(ApplicationPackage.budget_json, budget_patch)
+            checks.extend(parent_checks)
+        if status is not None:
+            values["submission_status"] = status
+
+        stmt = (
+            update(ApplicationPackage)
+            .where(ApplicationPackage.id == app_id, ApplicationPackage.version == version, *(check for check, _ in checks))
+            .values(**values)
+            .returning(ApplicationPackage.id, ApplicationPackage.version, ApplicationPackage.submission_status)
+            .execution_options(synchronize_session=False)
+        )
+        row = (await self.db.execute(stmt)).first()
+        if row is None:
+            await self.db.rollback()
+            # Failure path only: find out why nothing matched
+            current = (await self.db.execute(
+                select(ApplicationPackage.version, *(check for check, _ in checks))
+                .where(ApplicationPackage.id == app_id)
+            )).first()
+            if current is None:
+                return None
+            if current[0] != version:
+                raise VersionConflict(current[0])
+            raise ValueError(next(
+                (error for (_, error), passed in zip(checks, current[1:]) if not passed),
+                "Edits do not apply to the saved application",
+            ))
+
+        await self.db.commit()
+        dashboard_cache.invalidate()
+        return row
+
+    def _json_patch_expression(self, column, ops: list[dict]) -> tuple:
+        """
+        Fold add/replace/remove ops into json_set/json_remove (SQLite) or
+        jsonb_set, ||, - and #- (Postgres). Returns the expression and
+        (condition, error) checks for the RFC 6902 preconditions: a nested
+        path's parent must be an object, and replace/remove targets must
+        exist. Without them jsonb_set would skip a missing parent (json_set
+        creates it) and both dialects would accept a replace or remove of
+        nothing.
+
+        Runs of ops on distinct top-level keys are independent, so each run
+        becomes one flat call and is checked against the saved column; only
+        an op that revisits a key an earlier op touched starts a new nesting
+        level and is checked against the patched document. A patch that needs
+        more than JSON_PATCH_MAX_STEPS levels raises ValueError.
+        """
+        postgres = self.db.bind.dialect.name == "postgresql"
+        saved = func.coalesce(cast(column, JSONB), cast(literal("{}"), JSONB)) if postgres else func.coalesce(column, "{}")
+        doc, checks, touched, steps = saved, [], set(), 0
+        run, run_kind = [], None
+        for op in ops:
+            segments = [s.replace("~1", "/").replace("~0", "~") for s in op["path"].split("/")[1:]]
+            # jsonb_set takes a single path, so nested sets never share a call on Postgres
+            kind = ("remove" if op["op"] == "remove" else "set", len(segments) == 1 or not postgres)
+            if run and (segments[0] in touched or kind != run_kind or not kind[1] or len(run) == JSON_PATCH_GROUP_SIZE):
+                doc, steps, run = self._apply_json_ops(doc, run_kind[0], run), steps + 1, []
+            before = doc if segments[0] in touched else saved
+            if len(segments) > 1:
+                checks.append((self._json_type(before, segments[:-1]) == "object", f"Parent of {op['path']} is not an object in the saved budget"))
+            if op["op"] != "add":
+                checks.append((self._json_type(before, segments).is_not(None), f"{op['path']} does not exist in the saved budget"))
+            touched.add(segments[0])
+            run.append((segments, op.get("value")))
+            run_kind = kind
+        if run:
+            doc, steps = self._apply_json_ops(doc, run_kind[0], run), steps + 1
+        if steps > JSON_PATCH_MAX_STEPS:
+            raise ValueError("Budget patch revisits the same keys too often; save the whole budget instead")
+        return (cast(doc, JSON) if postgres else doc), checks
+
+    def _apply_json_ops(self, doc, kind: str, items: list[tuple]):
+        """One SQL call applying a run of "set" or "remove" ops, in order."""
+        if self.db.bind.dialect.name == "postgresql":
+            if len(items) > 1 or len(items[0][0]) == 1:
+                # Top-level keys: remove with `- text[]`, set by merging an object
+                if kind == "remove":
+                    return doc.op("-")(cast(literal([segments[0] for segments, _ in items], ARRAY(Text)), ARRAY(Text)))
+                pairs = []
+                for segments, value in items:
+                    pairs += [segments[0], cast(literal(json.dumps(value)), JSONB)]
+                return doc.op("||")(func.jsonb_build_object(*pairs))
+            (segments, value), = items
+            path = cast(literal(segments, ARRAY(Text)), ARRAY(Text))
+            if kind == "remove":
+                return doc.op("#-")(path)
+            return func.jsonb_set(doc, path, cast(literal(json.dumps(value)), JSONB), True)
+        paths = [self._sqlite_json_path(segments) for segments, _ in items]
+        if kind == "remove":
+            return func.json_remove(doc, *paths)
+        args = []
+        for path, (_, value) in zip(paths, items):
+            args += [path, func.json(json.dumps(value))]
+        return func.json_set(doc, *args)
+
+    def _json_type(self, doc, segments: list[str]):
+        """JSON type name of the value at `segments`, NULL when there is none."""
+        if self.db.bind.dialect.name == "postgresql":
+            return func.jsonb_typeof(doc.op("#>")(cast(literal(segments, ARRAY(Text)), ARRAY(Text))))
+        return func.json_type(doc, self._sqlite_json_path(segments))
+
+    @staticmethod
+    def _sqlite_json_path(segments: list[str]) -> str:
+        return "$" + "".join('."{}"'.format(s.replace('"', '\\"')) for s in segments)
+
     async def update_application(self, app_id: uuid.UUID, narrative: str = None, budget: dict = None, status: SubmissionStatus = None) -> ApplicationPackage:
         result = await self.db.execute(select(ApplicationPackage).where(ApplicationPackage.id == app_id))
         app_package = result.scalars().first()
@@ -315,8 +1075,55 @@ class FundingAgent:
             app_package.budget_json = budget
         if status is not None:
             app_package.submission_status = status
-            
+        app_package.version = ApplicationPackage.version + 1
+
         await self.db.commit()
+        dashboard_cache.invalidate()
         await self.db.refresh(app_package)
         return app_package
 
+    async def get_dashboard_stats(self) -> dict:
+        """
+        Dashboard counts and the next three deadlines from a single statement.
+
+        The one-row counts subquery is LEFT JOINed to the top-3 upcoming
+        opportunities, so the result has one row per upcoming opportunity (or
+        a single row with no opportunity) with the counts repeated on each.
+        """
+        opp = FundingOpportunity.__table__
+        app = ApplicationPackage.__table__
+        application_counts = [
+            select(func.count()).where(app.c.submission_status == s).scalar_subquery().label(f"app_{s.name}")
+            for s in SubmissionStatus
+        ]
+        counts = select(
+            func.count().label("total"),
+            *[func.count().filter(opp.c.status == s).label(f"opp_{s.name}") for s in FundingStatus],
+            select(func.count()).select_from(app).scalar_subquery().label("applications"),
+            *application_counts,
+        ).select_from(opp).subquery("counts")
+        upcoming = aliased(FundingOpportunity, (
+            select(FundingOpportunity)
+            .where(FundingOpportunity.deadline >= date.today())
+            .order_by(FundingOpportunity.deadline, FundingOpportunity.id)
+            .limit(3)
+            .subquery("upcoming")
+        ))
+
+        rows = (await self.db.execute(
+            select(counts, upcoming)
+            .select_from(counts)
+            .outerjoin(upcoming, true())
+            .order_by(upcoming.deadline, upcoming.id)
+        )).all()
+        first = rows[0]._mapping
+
+        return {
+            "counts": {
+                "opportunities": first["total"],
+                "opportunities_by_status": {s.value: first[f"opp_{s.name}"] for s in FundingStatus},
+                "applications": first["applications"],
+                "applications_by_status": {s.value: first[f"app_{s.name}"] for s in SubmissionStatus},
+            },
+            "upcoming_deadlines": [row[-1] for row in rows if row[-1] is not None],
+        }
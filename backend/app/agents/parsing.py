@@ -0,0 +1,75 @@
+"""
+Incremental parsing of JSON arrays emitted by the LLM.
+
+Gemini is asked for a JSON array of objects; when the response is streamed we
+want each object as soon as its closing brace arrives, without waiting for
+(or depending on) the rest of the array. JSONArrayStream scans the text
+character by character, tracking string/escape state and brace depth, and
+hands every complete top-level object to json.loads. Anything outside
+objects (markdown fences, commas, the array brackets) is ignored.
+
+Each object is then validated against ExtractedOpportunity, so a truncated or
+malformed item costs only that item, not the whole batch.
+"""
+import json
+import logging
+from pydantic import ValidationError
+from app.schemas import ExtractedOpportunity
+
+logger = logging.getLogger(__name__)
+
+
+class JSONArrayStream:
+    def __init__(self):
+        self._buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> list[dict]:
+        """Consume the next piece of output and return the objects it completed."""
+        completed = []
+        for char in text:
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._buffer = [char]
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        value = json.loads("".join(self._buffer))
+                    except json.JSONDecodeError:
+                        value = None
+                    if isinstance(value, dict):
+                        completed.append(value)
+                    self._buffer = []
+        return completed
+
+
+def validate_extracted(item: dict) -> dict:
+    """Normalized opportunity dict, or None if the item fails the extraction schema."""
+    try:
+        return ExtractedOpportunity.model_validate(item).model_dump()
+    except ValidationError as e:
+        logger.warning(f"Dropping invalid extracted opportunity: {e.errors()[0]['msg']}")
+        return None
+
+
+def parse_extraction(text: str) -> list[dict]:
+    """Salvage every valid opportunity from a (possibly truncated or malformed) LLM response."""
+    return [valid for item in JSONArrayStream().feed(text) if (valid := validate_extracted(item)) is not None]
@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from app.core.database import get_db
-from app.agents.funding import FundingAgent
-from app.schemas import OpportunityCreate, OpportunityResponse, ApplicationResponse, ApplicationUpdate, DashboardResponse, FundingImportRequest, FundingResearchRequest
+from app.core.database import SessionLocal, get_db
+from app.agents.funding import FundingAgent, VersionConflict
+from app.agents.dedup import opportunity_index
+from app.core.cache import result_cache, dashboard_cache
+from app.core.jobs import job_queue
+from app.schemas import OpportunityCreate, OpportunityResponse, ApplicationResponse, ApplicationUpdate, DashboardResponse
 from app import models, schemas
 from app import models
-from sqlalchemy import func
-from datetime import datetime
-from typing import List
+from datetime import date, timedelta
+from typing import List, Optional
 from uuid import UUID
+import json
+import os
+import tempfile
 
 router = APIRouter()
 
@@ -19,6 +24,8 @@ async def clear_all_projects(db: AsyncSession = Depends(get_db)):
     await db.execute(models.ApplicationPackage.__table__.delete())
     await db.execute(models.FundingOpportunity.__table__.delete())
     await db.commit()
+    dashboard_cache.invalidate()
+    opportunity_index.clear()
     return None
 
 # --- Funding Endpoints ---
@@ -26,41 +33,232 @@ async def clear_all_projects(db: AsyncSession = Depends(get_db)):
 @router.post("/opportunities", response_model=OpportunityResponse, status_code=status.HTTP_201_CREATED)
 async def create_opportunity(opp_in: OpportunityCreate, db: AsyncSession = Depends(get_db)):
     agent = FundingAgent(db)
-    return await agent.create_opportunity(opp_in.funder_name, opp_in.programme_name, opp_in.deadline)
+    try:
+        return await agent.create_opportunity(opp_in.funder_name, opp_in.programme_name, opp_in.deadline)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.post("/opportunities/bulk", response_model=schemas.BulkResponse)
+async def bulk_create_opportunities(payload: schemas.OpportunityBulkCreate, db: AsyncSession = Depends(get_db)):
+    """
+    Create many opportunities in one transaction.
+    Each item gets a result: `created` or `duplicate`.
+    """
+    agent = FundingAgent(db)
+    results = await agent.bulk_create_opportunities([item.model_dump() for item in payload.items])
+    return {"results": results}
+
+@router.patch("/opportunities/bulk", response_model=schemas.BulkResponse)
+async def bulk_update_opportunities(payload: schemas.OpportunityBulkUpdate, db: AsyncSession = Depends(get_db)):
+    """
+    Update status and/or deadline of many opportunities in one transaction.
+    Each item gets a result: `updated` or `not_found`.
+    """
+    agent = FundingAgent(db)
+    items = [
+        {
+            "id": item.id,
+            "status": models.FundingStatus(item.status.value) if item.status else None,
+            "deadline": item.deadline,
+        }
+        for item in payload.items
+    ]
+    return {"results": await agent.bulk_update_opportunities(items)}
+
+@router.get("/opportunities", response_model=schemas.OpportunityPage)
+async def list_opportunities(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    status: Optional[schemas.FundingStatusEnum] = None,
+    deadline_from: Optional[date] = None,
+    deadline_to: Optional[date] = None,
+    funder: Optional[str] = None,
+    source_url: Optional[str] = None,
+    required_document: Optional[str] = None,
+    requirement: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    List opportunity summaries ordered by deadline.
+    Pass `next_cursor` from the previous page as `cursor` to continue.
+    `required_document` matches an exact entry of the opportunity's document list;
+    `requirement` matches any eligibility requirement containing the text (case-insensitive).
+    """
+    agent = FundingAgent(db)
+    try:
+        items, next_cursor = await agent.get_opportunity_page(
+            limit=limit,
+            cursor=cursor,
+            status=models.FundingStatus(status.value) if status else None,
+            deadline_from=deadline_from,
+            deadline_to=deadline_to,
+            funder=funder,
+            source_url=source_url,
+            required_document=required_document,
+            requirement=requirement,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+def _serialize_opportunities(opportunities) -> list[dict]:
+    return [OpportunityResponse.model_validate(o).model_dump(mode="json") for o in opportunities]
+
+def _accepted(job: models.Job) -> JSONResponse:
+    """202 response pointing the client at GET /jobs/{id}."""
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=schemas.JobResponse.model_validate(job).model_dump(mode="json"),
+        headers={"Location": f"/api/v1/jobs/{job.id}"},
+    )
+
+@job_queue.handler("research")
+async def _run_research_job(db: AsyncSession, payload: dict, report):
+    await report(f"Researching {len(payload['queries']) * len(payload['regions'])} search(es)")
+    agent = FundingAgent(db)
+    return _serialize_opportunities(await agent.research_sweep_and_create_opportunities(payload["queries"], payload["regions"]))
+
+@job_queue.handler("import_text")
+async def _run_import_job(db: AsyncSession, payload: dict, report):
+    await report("Extracting opportunities")
+    agent = FundingAgent(db)
+    return _serialize_opportunities(await agent.import_opportunities_from_text(payload["text"]))
+
+@router.get("/opportunities/calendar", response_model=List[schemas.CalendarBucket])
+async def get_deadline_calendar(
+    bucket: str = Query("month", pattern="^(week|month)$"),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Deadlines grouped by week (buckets start on Monday) or month.
+    Defaults to the next 12 months; rolling/undated opportunities are excluded.
+    """
+    start = start or date.today()
+    end = end or start + timedelta(days=365)
+    if end < start or (end - start).days > 3 * 366:
+        raise HTTPException(status_code=400, detail="Calendar window must be between 0 days and 3 years")
+    agent = FundingAgent(db)
+    return await agent.get_deadline_calendar(start, end, bucket)
 
-@router.get("/opportunities", response_model=List[OpportunityResponse])
-async def list_opportunities(db: AsyncSession = Depends(get_db)):
+@router.get("/opportunities/duplicates", response_model=List[schemas.DuplicateSuggestion])
+async def list_duplicate_suggestions(threshold: float = Query(0.5, ge=0.5, le=1.0), limit: int = Query(50, ge=1, le=500), db: AsyncSession = Depends(get_db)):
+    """
+    Merge suggestions: pairs of opportunities whose funders share a blocking
+    key (e.g. an acronym) and whose programme names are similar. Thresholds
+    below 0.5 would pair nearly every entry in a block, so they are rejected.
+    """
     agent = FundingAgent(db)
-    return await agent.get_opportunities()
+    return await agent.get_duplicate_suggestions(threshold, limit)
+
+
+@router.get("/opportunities/{opportunity_id}", response_model=schemas.OpportunityDetail)
+async def get_opportunity(
+    opportunity_id: UUID,
+    include: Optional[str] = Query(None, pattern="^application$"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    One opportunity. `include=application` embeds its application (or null)
+    from the same query.
+    """
+    agent = FundingAgent(db)
+    opp = await agent.get_opportunity(opportunity_id, include_application=include == "application")
+    if not opp:
+        raise HTTPException(status_code=404, detail="Opportunity not found")
+    detail = schemas.OpportunityDetail.model_validate(opp)
+    if include == "application" and opp.applications:
+        detail.application = schemas.ApplicationResponse.model_validate(opp.applications[0])
+    return detail
 
 @router.post("/opportunities/research", response_model=List[OpportunityResponse])
-async def research_opportunities(query: str = "film documentary arts grants", region: str = "South Africa", db: AsyncSession = Depends(get_db)):
+async def research_opportunities(query: str = "film documentary arts grants", region: str = "South Africa", background: bool = False, db: AsyncSession = Depends(get_db)):
     """
     Deep research to discover funding opportunities from web sources.
-    Creates new opportunities in the database and returns them.
+    Upserts what it finds and returns the stored opportunities, including
+    existing ones the research matched (with blank fields filled in).
+    With `background=true` a job is queued instead and 202 is returned.
+    """
+    if background:
+        return _accepted(await job_queue.enqueue(db, "research", {"queries": [query], "regions": [region]}))
+    agent = FundingAgent(db)
+    return await agent.research_and_create_opportunities(query, region)
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/opportunities/research/stream")
+async def stream_research(query: str = "film documentary arts grants", region: str = "South Africa"):
+    """
+    Server-Sent Events variant of research.
+    Emits `search` (hits), `opportunity` (each stored opportunity as it is
+    extracted), then `done` with totals; `error` if extraction fails.
+    The stream outlives this handler, so it opens its own session instead of
+    using the request-scoped one.
+    """
+    async def events():
+        async with SessionLocal() as db:
+            agent = FundingAgent(db)
+            async for event, payload in agent.stream_research(query, region):
+                if event == "opportunity":
+                    payload = OpportunityResponse.model_validate(payload).model_dump(mode="json")
+                yield _sse(event, payload)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.post("/opportunities/research/sweep", response_model=List[OpportunityResponse])
+async def research_sweep(payload: schemas.FundingResearchSweepRequest, background: bool = False, db: AsyncSession = Depends(get_db)):
     """
+    Run every query/region combination concurrently, merge the search hits
+    and persist the extracted opportunities in one batch.
+    """
+    if background:
+        return _accepted(await job_queue.enqueue(db, "research", {"queries": payload.queries, "regions": payload.regions}))
     agent = FundingAgent(db)
-    created = await agent.research_and_create_opportunities(query, region)
-    return created
+    return await agent.research_sweep_and_create_opportunities(payload.queries, payload.regions)
 
 @router.post("/opportunities/import", response_model=List[OpportunityResponse])
-async def import_opportunities(payload: schemas.FundingImportRequest, db: AsyncSession = Depends(get_db)):
+async def import_opportunities(payload: schemas.FundingImportRequest, background: bool = False, db: AsyncSession = Depends(get_db)):
     """
     Import funding opportunities from raw text using Gemini AI parsing.
     """
+    if background:
+        return _accepted(await job_queue.enqueue(db, "import_text", {"text": payload.text}))
     agent = FundingAgent(db)
     return await agent.import_opportunities_from_text(payload.text)
 
 from fastapi import UploadFile, File
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 @router.post("/opportunities/import/file", response_model=List[OpportunityResponse])
-async def import_opportunities_file(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
+async def import_opportunities_file(file: UploadFile = File(...), background: bool = False, db: AsyncSession = Depends(get_db)):
     """
     Import funding opportunities from an uploaded file (PDF/Text).
+    In background mode the text is extracted up front and the Gemini
+    parsing runs as a job, so nothing depends on the temp file afterwards.
     """
     agent = FundingAgent(db)
-    contents = await file.read()
-    return await agent.import_file(contents, file.filename)
+    suffix = os.path.splitext(file.filename or "")[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix) as spooled:
+        # Copy in chunks so large uploads are never held in memory as one bytes object
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            spooled.write(chunk)
+        spooled.flush()
+        if background:
+            text = await agent.extract_file_text(spooled.name, file.filename or "")
+            return _accepted(await job_queue.enqueue(db, "import_text", {"text": text}))
+        return await agent.import_file(spooled.name, file.filename or "")
+
+# --- Jobs ---
+
+@router.get("/jobs/{job_id}", response_model=schemas.JobResponse)
+async def get_job(job_id: UUID, db: AsyncSession = Depends(get_db)):
+    job = await job_queue.get(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 @router.post("/applications", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
@@ -87,18 +285,69 @@ async def update_application(application_id: UUID, app_in: ApplicationUpdate, db
         raise HTTPException(status_code=404, detail="Application not found")
     return app
 
+@router.patch("/applications/{application_id}", response_model=schemas.ApplicationVersion)
+async def patch_application(application_id: UUID, patch: schemas.ApplicationPatch, db: AsyncSession = Depends(get_db)):
+    """
+    Autosave endpoint: narrative text splices and budget JSON Patch ops,
+    applied only if the application is still at `version`. Returns the new
+    version; 409 (with the current version) if another save got there first.
+    """
+    agent = FundingAgent(db)
+    try:
+        row = await agent.patch_application(
+            application_id,
+            patch.version,
+            narrative_edits=[edit.model_dump() for edit in patch.narrative_edits],
+            budget_patch=[op.model_dump() for op in patch.budget_patch],
+            status=models.SubmissionStatus(patch.submission_status.value) if patch.submission_status else None,
+        )
+    except VersionConflict as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "version": e.current_version})
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if row is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return row
+
+# --- Search ---
+
+@router.get("/search", response_model=schemas.SearchPage)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Ranked full-text search across opportunities and application narratives.
+    """
+    agent = FundingAgent(db)
+    items, next_offset = await agent.search(q, limit=limit, offset=offset)
+    return {"items": items, "next_offset": next_offset}
+
+# --- Cache ---
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss counters for the search and extraction cache (since process start)."""
+    return result_cache.stats()
+
 # --- Dashboard ---
 
 @router.get("/dashboard/stats", response_model=DashboardResponse)
-async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
-    # Aggregate counts and recent items
-    # Funding
-    total_opportunities = (await db.execute(select(func.count()).select_from(models.FundingOpportunity))).scalar()
-    upcoming_deadlines = (await db.execute(select(models.FundingOpportunity).where(models.FundingOpportunity.deadline >= datetime.now().date()).order_by(models.FundingOpportunity.deadline).limit(3))).scalars().all()
-
-    return {
-        "counts": {
-            "opportunities": total_opportunities
-        },
-        "upcoming_deadlines": upcoming_deadlines
-    }
+async def get_dashboard_stats(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Served from an in-process snapshot that FundingAgent writes invalidate.
+    Clients sending the previous ETag in If-None-Match get a 304.
+    """
+    snapshot = dashboard_cache.get()
+    if snapshot is None:
+        generation = dashboard_cache.generation
+        agent = FundingAgent(db)
+        stats = DashboardResponse.model_validate(await agent.get_dashboard_stats())
+        snapshot = dashboard_cache.put(generation, stats.model_dump(mode="json"))
+
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == snapshot.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(content=snapshot.body, headers=headers)
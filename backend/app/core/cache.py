@@ -0,0 +1,156 @@
+"""
+Persistent result cache for web searches and LLM extractions.
+
+Entries live in the cache_entries table, keyed by a SHA-256 of the namespace,
+prompt version and normalized input. Reads are plain SELECTs; a hit refreshes
+the entry's access time only when it is more than CACHE_TOUCH_SECONDS old, so
+eviction is least-recently-used to that granularity without turning every hit
+into a write. Expired rows are never served and are purged together with the
+LRU overflow. The cache fails open: any database error is
+logged and treated as a miss.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import NamedTuple
+from sqlalchemy import delete, select, update
+from app.core.database import SessionLocal
+from app.models import CacheEntry
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 6 * 3600))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 5000))
+# A hit only rewrites accessed_at once it is this stale
+CACHE_TOUCH_SECONDS = int(os.getenv("CACHE_TOUCH_SECONDS", 300))
+# Eviction runs every N writes rather than on each one
+CACHE_EVICT_EVERY = int(os.getenv("CACHE_EVICT_EVERY", 50))
+# Upper bound on dashboard staleness across replicas (each has its own snapshot)
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", 30))
+
+
+def cache_key(namespace: str, version: str, payload: str) -> str:
+    return hashlib.sha256(f"{namespace}\x00{version}\x00{payload}".encode("utf-8")).hexdigest()
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class ResultCache:
+    def __init__(self, session_factory=SessionLocal, ttl_seconds: int = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES, touch_seconds: int = CACHE_TOUCH_SECONDS):
+        self.session_factory = session_factory
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.touch_interval = timedelta(seconds=touch_seconds)
+        self.max_entries = max_entries
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self.evictions = 0
+        self._writes = 0
+
+    async def get(self, namespace: str, key: str):
+        """Return the cached value, or None on a miss or expired entry."""
+        now = datetime.utcnow()
+        try:
+            async with self.session_factory() as session:
+                row = (await session.execute(
+                    select(CacheEntry.value, CacheEntry.accessed_at)
+                    .where(CacheEntry.key == key, CacheEntry.expires_at > now)
+                )).first()
+                value = row.value if row is not None else None
+                if row is not None and now - row.accessed_at >= self.touch_interval:
+                    await session.execute(update(CacheEntry).where(CacheEntry.key == key).values(accessed_at=now))
+                    await session.commit()
+        except Exception as e:
+            logger.warning(f"Cache read failed: {e}")
+            value = None
+
+        if value is None:
+            self.misses[namespace] += 1
+        else:
+            self.hits[namespace] += 1
+        return value
+
+    async def set(self, namespace: str, key: str, value) -> None:
+        now = datetime.utcnow()
+        try:
+            async with self.session_factory() as session:
+                await session.merge(CacheEntry(
+                    key=key,
+                    namespace=namespace,
+                    value=json.loads(json.dumps(value)),
+                    created_at=now,
+                    accessed_at=now,
+                    expires_at=now + self.ttl,
+                ))
+                self._writes += 1
+                if self._writes % CACHE_EVICT_EVERY == 0:
+                    await self._evict(session, now)
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Cache write failed: {e}")
+
+    async def _evict(self, session, now: datetime) -> None:
+        expired = await session.execute(delete(CacheEntry).where(CacheEntry.expires_at <= now))
+        overflow = select(CacheEntry.key).order_by(CacheEntry.accessed_at.desc()).offset(self.max_entries)
+        lru = await session.execute(delete(CacheEntry).where(CacheEntry.key.in_(overflow)))
+        self.evictions += (expired.rowcount or 0) + (lru.rowcount or 0)
+
+    def stats(self) -> dict:
+        namespaces = sorted(set(self.hits) | set(self.misses))
+        return {
+            "namespaces": {ns: {"hits": self.hits[ns], "misses": self.misses[ns]} for ns in namespaces},
+            "hits": sum(self.hits.values()),
+            "misses": sum(self.misses.values()),
+            "evictions": self.evictions,
+        }
+
+
+result_cache = ResultCache()
+
+
+class Snapshot(NamedTuple):
+    body: dict
+    etag: str
+    generation: int
+    created: float
+
+
+class SnapshotCache:
+    """
+    In-process cache for one computed response body.
+
+    Writers call invalidate(), which bumps the generation; a snapshot computed
+    while an invalidation happened is discarded rather than stored, so a stale
+    body can never outlive the write that made it stale.
+    """
+    def __init__(self, ttl_seconds: float):
+        self.ttl = ttl_seconds
+        self.generation = 0
+        self._snapshot: Snapshot = None
+
+    def get(self) -> Snapshot:
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.generation != self.generation:
+            return None
+        if time.monotonic() - snapshot.created > self.ttl:
+            return None
+        return snapshot
+
+    def put(self, generation: int, body: dict) -> Snapshot:
+        digest = hashlib.sha256(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+        snapshot = Snapshot(body=body, etag=f'"{digest}"', generation=generation, created=time.monotonic())
+        if generation == self.generation:
+            self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self._snapshot = None
+
+
+dashboard_cache = SnapshotCache(DASHBOARD_CACHE_TTL_SECONDS)
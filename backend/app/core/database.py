@@ -1,7 +1,11 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
+import time
 from dotenv import load_dotenv
+from app.core.metrics import instrument_engine, DB_POOL_ACQUIRE
+from app.core.sqlite import create_sqlite_engines, ReadWriteSession
 
 load_dotenv()
 
@@ -17,17 +21,121 @@ if not DATABASE_URL:
 is_production = os.getenv("RAILWAY_ENVIRONMENT", "production") == "production"
 echo_sql = os.getenv("ECHO_SQL", "False").lower() == "true"
 
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=echo_sql,
-    pool_size=int(os.getenv("DB_POOL_SIZE", 20)),
-    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
-    pool_pre_ping=True,  # Check connection health before usage
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
+if DATABASE_URL.startswith("sqlite"):
+    # WAL, tuned pragmas, one queued writer connection and a read-only pool (see app.core.sqlite)
+    engine, read_engine = create_sqlite_engines(DATABASE_URL, echo=echo_sql)
+    session_options = {"sync_session_class": ReadWriteSession, "reader": read_engine.sync_engine if read_engine else None}
+else:
+    engine = create_async_engine(
+        DATABASE_URL,
+        echo=echo_sql,
+        pool_size=int(os.getenv("DB_POOL_SIZE", 20)),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        pool_pre_ping=True,  # Check connection health before usage
+    )
+    read_engine = None
+    session_options = {}
+instrument_engine(engine)
+if read_engine is not None:
+    instrument_engine(read_engine)
+# expire_on_commit=False keeps committed rows readable without a refresh round trip
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine, class_=AsyncSession, **session_options)
 
 Base = declarative_base()
 
+# Full-text search. Postgres keeps a generated tsvector column per searchable
+# table (maintained by the database on every write, GIN-indexed). SQLite uses
+# external-content FTS5 tables keyed by rowid and kept in sync by triggers;
+# after a VACUUM (which may renumber rowids) run the 'rebuild' statements again.
+SEARCH_DDL = {
+    "postgresql": [
+        """ALTER TABLE funding_opportunities ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(programme_name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(funder_name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED""",
+        "CREATE INDEX ix_funding_opportunities_search ON funding_opportunities USING gin (search_vector)",
+        """ALTER TABLE application_packages ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            to_tsvector('english', coalesce(narrative_draft, ''))
+        ) STORED""",
+        "CREATE INDEX ix_application_packages_search ON application_packages USING gin (search_vector)",
+    ],
+    "sqlite": [
+        """CREATE VIRTUAL TABLE opportunities_fts USING fts5(
+            funder_name, programme_name, description,
+            content='funding_opportunities', tokenize='porter unicode61'
+        )""",
+        """CREATE TRIGGER opportunities_fts_ai AFTER INSERT ON funding_opportunities BEGIN
+            INSERT INTO opportunities_fts(rowid, funder_name, programme_name, description)
+            VALUES (new.rowid, new.funder_name, new.programme_name, new.description);
+        END""",
+        """CREATE TRIGGER opportunities_fts_ad AFTER DELETE ON funding_opportunities BEGIN
+            INSERT INTO opportunities_fts(opportunities_fts, rowid, funder_name, programme_name, description)
+            VALUES ('delete', old.rowid, old.funder_name, old.programme_name, old.description);
+        END""",
+        """CREATE TRIGGER opportunities_fts_au AFTER UPDATE OF funder_name, programme_name, description ON funding_opportunities BEGIN
+            INSERT INTO opportunities_fts(opportunities_fts, rowid, funder_name, programme_name, description)
+            VALUES ('delete', old.rowid, old.funder_name, old.programme_name, old.description);
+            INSERT INTO opportunities_fts(rowid, funder_name, programme_name, description)
+            VALUES (new.rowid, new.funder_name, new.programme_name, new.description);
+        END""",
+        """CREATE VIRTUAL TABLE applications_fts USING fts5(
+            narrative_draft, content='application_packages', tokenize='porter unicode61'
+        )""",
+        """CREATE TRIGGER applications_fts_ai AFTER INSERT ON application_packages BEGIN
+            INSERT INTO applications_fts(rowid, narrative_draft) VALUES (new.rowid, new.narrative_draft);
+        END""",
+        """CREATE TRIGGER applications_fts_ad AFTER DELETE ON application_packages BEGIN
+            INSERT INTO applications_fts(applications_fts, rowid, narrative_draft) VALUES ('delete', old.rowid, old.narrative_draft);
+        END""",
+        """CREATE TRIGGER applications_fts_au AFTER UPDATE OF narrative_draft ON application_packages BEGIN
+            INSERT INTO applications_fts(applications_fts, rowid, narrative_draft) VALUES ('delete', old.rowid, old.narrative_draft);
+            INSERT INTO applications_fts(rowid, narrative_draft) VALUES (new.rowid, new.narrative_draft);
+        END""",
+        "INSERT INTO opportunities_fts(opportunities_fts) VALUES ('rebuild')",
+        "INSERT INTO applications_fts(applications_fts) VALUES ('rebuild')",
+    ],
+}
+
+SEARCH_DROP_DDL = {
+    "postgresql": [
+        "DROP INDEX IF EXISTS ix_application_packages_search",
+        "ALTER TABLE application_packages DROP COLUMN IF EXISTS search_vector",
+        "DROP INDEX IF EXISTS ix_funding_opportunities_search",
+        "ALTER TABLE funding_opportunities DROP COLUMN IF EXISTS search_vector",
+    ],
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS applications_fts_au",
+        "DROP TRIGGER IF EXISTS applications_fts_ad",
+        "DROP TRIGGER IF EXISTS applications_fts_ai",
+        "DROP TABLE IF EXISTS applications_fts",
+        "DROP TRIGGER IF EXISTS opportunities_fts_au",
+        "DROP TRIGGER IF EXISTS opportunities_fts_ad",
+        "DROP TRIGGER IF EXISTS opportunities_fts_ai",
+        "DROP TABLE IF EXISTS opportunities_fts",
+    ],
+}
+
+def create_search_index(connection):
+    """Install the full-text search structures for the connection's dialect (sync connection)."""
+    for statement in SEARCH_DDL.get(connection.dialect.name, []):
+        connection.exec_driver_sql(statement)
+
+def drop_search_index(connection):
+    for statement in SEARCH_DROP_DDL.get(connection.dialect.name, []):
+        connection.exec_driver_sql(statement)
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw):
+    # Only when create_all actually built the searchable tables
+    tables = {table.name for table in kw.get("tables") or []}
+    if "funding_opportunities" in tables:
+        create_search_index(connection)
+
 async def get_db():
     async with SessionLocal() as session:
+        # Take the connection up front so pool waits show up in the metrics
+        started = time.perf_counter()
+        await session.connection()
+        DB_POOL_ACQUIRE.observe(time.perf_counter() - started)
         yield session
@@ -0,0 +1,102 @@
+"""
+Shared outbound HTTP client.
+
+A single pooled httpx.AsyncClient is opened on first use and reused by every
+scrape, so connections (and TLS sessions) are kept alive between research
+calls instead of being re-established per request. httpx (and h2) are only
+imported then, keeping them off the startup path of processes that never
+scrape.
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+from app.core.metrics import OUTBOUND_HTTP_DURATION
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 20))
+MAX_CONCURRENCY = int(os.getenv("HTTP_MAX_CONCURRENCY", 8))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", 0.5))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_client: "httpx.AsyncClient" = None
+_semaphore: asyncio.Semaphore = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _build_client() -> "httpx.AsyncClient":
+    import httpx
+    return httpx.AsyncClient(
+        http2=_http2_available(),
+        timeout=httpx.Timeout(15.0, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_CONNECTIONS,
+            keepalive_expiry=60.0,
+        ),
+        headers={"User-Agent": USER_AGENT},
+        follow_redirects=True,
+    )
+
+
+async def close_http_client() -> None:
+    """Close the shared client and release pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Shared client, created on first use."""
+    global _client, _semaphore
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    return _client
+
+
+async def request_with_retry(method: str, url: str, **kwargs) -> "httpx.Response":
+    """
+    Issue a request on the shared client with bounded concurrency.
+
+    Transport errors and retryable statuses (429/5xx) are retried with
+    exponential backoff and jitter; the last response or error is surfaced.
+    """
+    import httpx
+    client = get_http_client()
+    host = urlsplit(url).hostname or ""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with _semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, url, **kwargs)
+                finally:
+                    OUTBOUND_HTTP_DURATION.labels(host=host).observe(time.perf_counter() - started)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            logger.warning(f"{method} {url} returned {response.status_code}, retrying")
+        except httpx.TransportError as e:
+            if attempt == MAX_RETRIES:
+                raise
+            logger.warning(f"{method} {url} failed ({e!r}), retrying")
+        await asyncio.sleep(BACKOFF_BASE * (2 ** attempt) + random.uniform(0, BACKOFF_BASE))
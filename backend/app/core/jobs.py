@@ -0,0 +1,227 @@
+"""
+Background job queue for long-running research and import work.
+
+Jobs are rows in the jobs table, so they outlive the process: a fixed pool of
+asyncio workers claims queued rows one at a time (an atomic UPDATE, with
+SKIP LOCKED on Postgres), runs the registered handler for the job kind, and
+stores the JSON result or error. Enqueueing wakes an idle worker immediately;
+workers also poll so jobs left by a restart or another replica are picked up.
+
+A claim is a lease: the worker holds the job until `locked_until` and renews
+it every JOB_HEARTBEAT_SECONDS while the handler runs. A reaper re-queues
+jobs whose lease has expired (their worker died) every JOB_REAP_SECONDS, so
+recovery never waits for a restart and never touches a job that is still
+making progress. Failed attempts are retried after an exponential backoff
+(`run_after`) until JOB_MAX_ATTEMPTS, then the job is marked FAILED. Results
+are written only while the attempt still holds the job, so a worker that
+lost its lease cannot overwrite a retry.
+"""
+import asyncio
+import logging
+import os
+import traceback
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import SessionLocal
+from app.models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", 5))
+# A RUNNING job whose lease is not renewed for this long is assumed orphaned
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", 60))
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", 20))
+JOB_REAP_SECONDS = float(os.getenv("JOB_REAP_SECONDS", 30))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+# Delay before retry n is JOB_RETRY_BACKOFF_SECONDS * 2 ** (n - 1)
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", 30))
+
+# handler(db, payload, report_progress) -> JSON-serializable result
+JobHandler = Callable[[AsyncSession, dict, Callable[[str], Awaitable[None]]], Awaitable[object]]
+
+
+class JobQueue:
+    def __init__(self, session_factory=SessionLocal, workers: int = JOB_WORKERS):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.handlers: dict[str, JobHandler] = {}
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def handler(self, kind: str):
+        """Decorator registering the coroutine that processes jobs of `kind`."""
+        def register(fn: JobHandler) -> JobHandler:
+            self.handlers[kind] = fn
+            return fn
+        return register
+
+    async def enqueue(self, db: AsyncSession, kind: str, payload: dict) -> Job:
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = Job(kind=kind, status=JobStatus.QUEUED, payload=payload, attempts=0, created_at=datetime.utcnow())
+        db.add(job)
+        await db.commit()
+        self._wakeup.set()
+        return job
+
+    async def get(self, db: AsyncSession, job_id) -> Job:
+        result = await db.execute(select(Job).where(Job.id == job_id))
+        return result.scalars().first()
+
+    async def start(self) -> None:
+        """Re-queue expired leases and start the workers and the reaper. Called from the app lifespan."""
+        if self._tasks:
+            return
+        try:
+            await self.reap()
+        except Exception as e:
+            logger.error(f"Job recovery failed: {e}")
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._reaper()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _claim(self) -> Job:
+        """Atomically lease the oldest due queued job (moving it to RUNNING) and return it."""
+        async with self.session_factory() as db:
+            now = datetime.utcnow()
+            due = (Job.status == JobStatus.QUEUED, or_(Job.run_after.is_(None), Job.run_after <= now))
+            next_id = (
+                select(Job.id)
+                .where(*due)
+                .order_by(Job.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            result = await db.execute(
+                update(Job)
+                .where(Job.id == next_id, *due)
+                .values(
+                    status=JobStatus.RUNNING,
+                    started_at=now,
+                    locked_until=now + timedelta(seconds=JOB_LEASE_SECONDS),
+                    attempts=Job.attempts + 1,
+                    progress="Started",
+                )
+                .returning(Job)
+            )
+            job = result.scalars().first()
+            await db.commit()
+            return job
+
+    async def _set(self, job: Job, **values) -> bool:
+        """Update a job this attempt still holds; False once its lease was lost to a retry."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.status == JobStatus.RUNNING, Job.attempts == job.attempts)
+                .values(**values)
+            )
+            await db.commit()
+            return result.rowcount > 0
+
+    async def _heartbeat(self, job: Job) -> None:
+        """Renew the lease on `job` until cancelled."""
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                if not await self._set(job, locked_until=datetime.utcnow() + timedelta(seconds=JOB_LEASE_SECONDS)):
+                    logger.warning(f"Job {job.id} lost its lease")
+                    return
+            except Exception as e:
+                logger.error(f"Job {job.id} heartbeat failed: {e}")
+
+    async def run_next(self) -> bool:
+        """Claim and process a single job. Returns False when no job is due."""
+        job = await self._claim()
+        if job is None:
+            return False
+
+        async def report(progress: str) -> None:
+            await self._set(job, progress=progress)
+
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            try:
+                async with self.session_factory() as db:
+                    result = await self.handlers[job.kind](db, job.payload or {}, report)
+            finally:
+                heartbeat.cancel()
+            await self._set(job, status=JobStatus.SUCCEEDED, result=result, progress="Done", locked_until=None, finished_at=datetime.utcnow())
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind}) failed: {e}")
+            error = "".join(traceback.format_exception_only(type(e), e)).strip()
+            if job.attempts < JOB_MAX_ATTEMPTS:
+                delay = JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+                await self._set(
+                    job,
+                    status=JobStatus.QUEUED,
+                    error=error,
+                    locked_until=None,
+                    run_after=datetime.utcnow() + timedelta(seconds=delay),
+                    progress=f"Retrying in {delay:.0f}s",
+                )
+            else:
+                await self._set(job, status=JobStatus.FAILED, error=error, locked_until=None, finished_at=datetime.utcnow())
+        return True
+
+    async def reap(self) -> int:
+        """
+        Re-queue RUNNING jobs whose lease has expired, or fail them once they
+        have used JOB_MAX_ATTEMPTS. Returns the number of jobs re-queued.
+        """
+        now = datetime.utcnow()
+        expired = (Job.status == JobStatus.RUNNING, Job.locked_until < now)
+        async with self.session_factory() as db:
+            await db.execute(
+                update(Job)
+                .where(*expired, Job.attempts >= JOB_MAX_ATTEMPTS)
+                .values(status=JobStatus.FAILED, error="Worker lost (lease expired)", locked_until=None, finished_at=now)
+            )
+            result = await db.execute(
+                update(Job)
+                .where(*expired)
+                .values(status=JobStatus.QUEUED, locked_until=None, run_after=now, progress="Re-queued after lease expired")
+            )
+            await db.commit()
+        if result.rowcount:
+            logger.warning(f"Re-queued {result.rowcount} job(s) with expired leases")
+            self._wakeup.set()
+        return result.rowcount
+
+    async def _reaper(self) -> None:
+        while True:
+            await asyncio.sleep(JOB_REAP_SECONDS)
+            try:
+                await self.reap()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job reaper error: {e}")
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            # Cleared before claiming so an enqueue during the claim is not missed
+            self._wakeup.clear()
+            try:
+                if await self.run_next():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {index} error: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+job_queue = JobQueue()
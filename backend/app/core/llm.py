@@ -0,0 +1,233 @@
+"""
+Shared Gemini client.
+
+Every extraction goes through one LLMClient so the process respects the
+free-tier quota as a whole:
+
+- token buckets for requests/min and tokens/min turn quota pressure into
+  queueing delay instead of 429s,
+- identical prompts already in flight are coalesced (single-flight) so
+  concurrent callers share one generation,
+- blocking SDK calls run on a dedicated, bounded thread pool rather than the
+  default executor,
+- quota and transient errors are retried with jittered exponential backoff,
+  and a 429 also pauses the request bucket for every caller.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterator
+from app.core.metrics import LLM_DURATION, LLM_RATE_LIMIT_WAIT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", 15))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", 1_000_000))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 4))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 5))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", 2.0))
+# Output allowance added to the prompt estimate when charging the token bucket
+LLM_OUTPUT_TOKENS = int(os.getenv("LLM_OUTPUT_TOKENS", 2048))
+
+RETRYABLE_ERRORS = {"ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "DeadlineExceeded", "InternalServerError"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `rate_per_minute`."""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1) -> float:
+        """Wait until `amount` tokens are available and take them. Returns the seconds waited."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                delay = max(self.paused_until - now, (amount - self.tokens) / self.rate if self.tokens < amount else 0.0)
+                if delay <= 0:
+                    self.tokens -= amount
+                    return waited
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Block all acquirers for `seconds`, e.g. after the provider returned 429."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def _gemini_generate(model_name: str, prompt: str) -> str:
+    import google.generativeai as genai
+    api_key = os.getenv("GEMINI_API_KEY")
+    if api_key:
+        genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name).generate_content(prompt).text
+
+
+def _gemini_stream(model_name: str, prompt: str) -> Iterator[str]:
+    import google.generativeai as genai
+    api_key = os.getenv("GEMINI_API_KEY")
+    if api_key:
+        genai.configure(api_key=api_key)
+    for chunk in genai.GenerativeModel(model_name).generate_content(prompt, stream=True):
+        yield chunk.text
+
+
+class LLMClient:
+    def __init__(
+        self,
+        generate_fn: Callable[[str, str], str] = _gemini_generate,
+        stream_fn: Callable[[str, str], Iterator[str]] = _gemini_stream,
+        requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = LLM_TOKENS_PER_MINUTE,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE,
+    ):
+        self.generate_fn = generate_fn
+        self.stream_fn = stream_fn
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self._executor = None
+        self._semaphore = None
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.retries = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="llm")
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def generate(self, prompt: str, model: str = DEFAULT_MODEL) -> str:
+        """Generate text for `prompt`, sharing the result with identical in-flight calls."""
+        key = hashlib.sha256(f"{model}\x00{prompt}".encode("utf-8")).hexdigest()
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            text = await self._generate_with_retry(prompt, model)
+            future.set_result(text)
+            return text
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an uncoalesced failure doesn't log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _generate_with_retry(self, prompt: str, model: str) -> str:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            waited = await self.requests.acquire(1)
+            waited += await self.tokens.acquire(estimate_tokens(prompt) + LLM_OUTPUT_TOKENS)
+            LLM_RATE_LIMIT_WAIT.observe(waited)
+            try:
+                async with self._semaphore:
+                    self.calls += 1
+                    with LLM_DURATION.labels(operation="generate").time():
+                        return await loop.run_in_executor(self._pool(), self.generate_fn, model, prompt)
+            except Exception as e:
+                if type(e).__name__ not in RETRYABLE_ERRORS or attempt == self.max_retries:
+                    raise
+                delay = self.backoff_base * (2 ** attempt) * random.uniform(0.5, 1.5)
+                if type(e).__name__ in {"ResourceExhausted", "TooManyRequests"}:
+                    self.requests.pause(delay)
+                self.retries += 1
+                logger.warning(f"Gemini call failed ({type(e).__name__}), retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def stream(self, prompt: str, model: str = DEFAULT_MODEL) -> AsyncIterator[str]:
+        """
+        Yield generated text as it arrives.
+
+        Subject to the same rate limits and concurrency bound as generate().
+        Retryable errors are retried only until the first chunk arrives;
+        after that the error is raised to the caller.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            waited = await self.requests.acquire(1)
+            waited += await self.tokens.acquire(estimate_tokens(prompt) + LLM_OUTPUT_TOKENS)
+            LLM_RATE_LIMIT_WAIT.observe(waited)
+            queue: asyncio.Queue = asyncio.Queue()
+            done = object()
+
+            def produce():
+                try:
+                    for piece in self.stream_fn(model, prompt):
+                        loop.call_soon_threadsafe(queue.put_nowait, piece)
+                    loop.call_soon_threadsafe(queue.put_nowait, done)
+                except Exception as e:
+                    loop.call_soon_threadsafe(queue.put_nowait, e)
+
+            received = False
+            async with self._semaphore:
+                self.calls += 1
+                started = time.perf_counter()
+                loop.run_in_executor(self._pool(), produce)
+                try:
+                    while True:
+                        item = await queue.get()
+                        if item is done:
+                            LLM_DURATION.labels(operation="stream").observe(time.perf_counter() - started)
+                            return
+                        if isinstance(item, Exception):
+                            raise item
+                        received = True
+                        yield item
+                except Exception as e:
+                    if received or type(e).__name__ not in RETRYABLE_ERRORS or attempt == self.max_retries:
+                        raise
+                    delay = self.backoff_base * (2 ** attempt) * random.uniform(0.5, 1.5)
+                    if type(e).__name__ in {"ResourceExhausted", "TooManyRequests"}:
+                        self.requests.pause(delay)
+                    self.retries += 1
+                    logger.warning(f"Gemini stream failed ({type(e).__name__}), retry {attempt + 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced, "retries": self.retries, "in_flight": len(self._inflight)}
+
+
+llm_client = LLMClient()
@@ -0,0 +1,185 @@
+"""
+Process metrics in the Prometheus text exposition format.
+
+Metric types and the exposition come from prometheus_client; this module
+defines the application's metrics and records them. What gets recorded:
+
+- per-route request latency, status counts and requests in flight
+  (MetricsMiddleware, labelled by route template so ids don't explode
+  the series count),
+- SQL statement durations by operation, plus the number of statements and
+  total SQL time of each request (SQLAlchemy cursor events, attributed to
+  the request through a context variable),
+- connection pool checkouts, connections in use and the time taken to
+  acquire one,
+- outbound HTTP (search/scraping) and LLM call latency, so a slow request
+  can be split between the database, search and the model.
+
+Metrics are per process; with several workers, scrape each one.
+"""
+import time
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "BEGIN", "COMMIT", "ROLLBACK", "PRAGMA"}
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# HTTP server
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served.")
+REQUESTS_TOTAL = Counter("http_requests", "Requests served, by route template and status.", ("method", "route", "status"))
+REQUEST_DURATION = Histogram("http_request_duration_seconds", "Request latency by route template.", ("method", "route"), buckets=LATENCY_BUCKETS)
+REQUEST_DB_STATEMENTS = Histogram("http_request_db_statements", "SQL statements issued per request.", ("route",), buckets=STATEMENT_COUNT_BUCKETS)
+REQUEST_DB_DURATION = Histogram("http_request_db_duration_seconds", "Time spent executing SQL per request.", ("route",), buckets=LATENCY_BUCKETS)
+
+# Database
+DB_STATEMENT_DURATION = Histogram("db_statement_duration_seconds", "SQL statement execution time by operation.", ("operation",), buckets=LATENCY_BUCKETS)
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts", "Connections checked out of the pool.")
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Pooled connections currently in use.")
+DB_POOL_CONNECTS = Counter("db_pool_connections_opened", "New DBAPI connections opened by the pool.")
+DB_POOL_ACQUIRE = Histogram("db_pool_acquire_seconds", "Time for a request session to get a connection (pool wait, connect and pre-ping).", buckets=LATENCY_BUCKETS)
+
+# Outbound calls
+OUTBOUND_HTTP_DURATION = Histogram("outbound_http_request_duration_seconds", "Outbound HTTP attempt latency (search, scraping) by host.", ("host",), buckets=LATENCY_BUCKETS)
+LLM_DURATION = Histogram("llm_request_duration_seconds", "Model call latency, excluding rate-limit waits.", ("operation",), buckets=LATENCY_BUCKETS)
+LLM_RATE_LIMIT_WAIT = Histogram("llm_rate_limit_wait_seconds", "Time spent queued on the LLM request/token buckets.", buckets=LATENCY_BUCKETS)
+
+# Process
+APP_STARTUP = Gauge("app_startup_seconds", "Time spent in each startup phase of this process (phase=total for the whole boot).", ("phase",))
+
+
+def record_startup(phases: dict[str, float], total: float) -> None:
+    for phase, seconds in phases.items():
+        APP_STARTUP.labels(phase=phase).set(seconds)
+    APP_STARTUP.labels(phase="total").set(total)
+
+
+class RequestStats:
+    """SQL work attributed to the request being served."""
+    __slots__ = ("statements", "db_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def _operation(statement: str) -> str:
+    word = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return word if word in SQL_OPERATIONS else "OTHER"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["metrics_started"].pop()
+    DB_STATEMENT_DURATION.labels(operation=_operation(statement)).observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    started = exception_context.connection.info.get("metrics_started") if exception_context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_CHECKOUTS.inc()
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    DB_POOL_CHECKED_OUT.dec()
+
+
+def _on_connect(dbapi_connection, connection_record):
+    DB_POOL_CONNECTS.inc()
+
+
+def instrument_engine(engine) -> None:
+    """Attach statement and pool listeners to an (async or sync) engine. Idempotent."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    event.listen(sync_engine, "checkout", _on_checkout)
+    event.listen(sync_engine, "checkin", _on_checkin)
+    event.listen(sync_engine, "connect", _on_connect)
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the matched route, including any router prefix.
+
+    Routes under an included router only know their own part of the path,
+    so the prefix is whatever precedes the segment their regex matches.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return UNMATCHED_ROUTE
+    path, regex = scope.get("path", ""), getattr(route, "path_regex", None)
+    if regex is None or regex.match(path):
+        return template
+    for index, char in enumerate(path):
+        if char == "/" and index and regex.match(path[index:]):
+            return path[:index] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (streaming responses are timed to their last byte).
+    Routes are labelled by their template, e.g. /api/v1/opportunities/{opportunity_id}.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec()
+            _request_stats.reset(token)
+            path = route_template(scope)
+            method = scope["method"]
+            REQUESTS_TOTAL.labels(method=method, route=path, status=str(status)).inc()
+            REQUEST_DURATION.labels(method=method, route=path).observe(elapsed)
+            REQUEST_DB_STATEMENTS.labels(route=path).observe(stats.statements)
+            REQUEST_DB_DURATION.labels(route=path).observe(stats.db_seconds)
@@ -0,0 +1,69 @@
+"""
+Startup schema migrations.
+
+Running `alembic upgrade` on every boot loads env.py, opens a second engine
+and walks the revision graph even when there is nothing to do. Instead the
+current revision is read over the app's own engine and compared with the
+script heads; Alembic only runs when they differ.
+
+On Postgres the upgrade happens under a session-level advisory lock, so when
+several replicas boot together one migrates and the others wait, re-check
+and find the schema already current.
+"""
+import asyncio
+import logging
+import os
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_CONFIG = os.getenv("ALEMBIC_CONFIG", "alembic.ini")
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_ID = int(os.getenv("MIGRATION_LOCK_ID", 4_271_990_113))
+
+
+def _current_heads(connection) -> set[str]:
+    from alembic.migration import MigrationContext
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+async def _is_current(conn, heads: set[str]) -> bool:
+    current = await conn.run_sync(_current_heads)
+    # Don't hold a transaction (and its locks) open while waiting or migrating
+    await conn.commit()
+    return current == heads
+
+
+async def migrate_to_head(engine: AsyncEngine, config_path: str = ALEMBIC_CONFIG) -> str:
+    """
+    Bring the schema to the Alembic head. Returns "current" when nothing had
+    to be done, "upgraded" when this process ran the migrations.
+    """
+    from alembic import command
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(config_path)
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+
+    async with engine.connect() as conn:
+        if await _is_current(conn, heads):
+            return "current"
+
+        locking = conn.dialect.name == "postgresql"
+        if locking:
+            logger.info("Waiting for the migration lock...")
+            await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_ID})
+            await conn.commit()
+        try:
+            # Another replica may have migrated while we waited for the lock
+            if locking and await _is_current(conn, heads):
+                return "current"
+            logger.info("Running database migrations...")
+            await asyncio.to_thread(command.upgrade, config, "head")
+            return "upgraded"
+        finally:
+            if locking:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_ID})
+                await conn.commit()
@@ -0,0 +1,70 @@
+"""
+Off-loop PDF text extraction.
+
+pypdf is pure Python and CPU-bound, so pages are extracted in a process pool
+(one chunk of pages per task) rather than on the event loop thread. Workers
+read the spooled upload through mmap, so the document is never copied into a
+single in-memory bytes object. Workers are spawned rather than forked:
+forking a threaded asyncio process can copy a lock another thread holds
+into the child, which then deadlocks on it.
+"""
+import asyncio
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", max(1, min(4, os.cpu_count() or 1))))
+PDF_PAGES_PER_CHUNK = int(os.getenv("PDF_PAGES_PER_CHUNK", 10))
+
+_pool: ProcessPoolExecutor = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_pdf_pool() -> None:
+    """Stop the worker processes. Called from the app lifespan."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _open_reader(path: str):
+    from pypdf import PdfReader
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return PdfReader(mapped), mapped
+
+
+def _count_pages(path: str) -> int:
+    reader, mapped = _open_reader(path)
+    try:
+        return len(reader.pages)
+    finally:
+        mapped.close()
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> str:
+    reader, mapped = _open_reader(path)
+    try:
+        return "".join((reader.pages[i].extract_text() or "") + "\n" for i in range(start, stop))
+    finally:
+        mapped.close()
+
+
+async def extract_pdf_text(path: str, pages_per_chunk: int = PDF_PAGES_PER_CHUNK) -> str:
+    """Extract the text of a PDF on disk, with page chunks processed in parallel."""
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    page_count = await loop.run_in_executor(pool, _count_pages, path)
+    chunks = await asyncio.gather(*(
+        loop.run_in_executor(pool, _extract_page_range, path, start, min(start + pages_per_chunk, page_count))
+        for start in range(0, page_count, pages_per_chunk)
+    ))
+    return "".join(chunks)
@@ -0,0 +1,108 @@
+"""
+SQLite profile for the local/offline fallback database.
+
+SQLite allows one writer at a time, and with the default rollback journal a
+writer also blocks readers, so concurrent imports and list traffic used to
+surface as `database is locked`. For file databases this profile:
+
+- switches the database to WAL (readers never block the writer or each
+  other) with synchronous=NORMAL, a busy timeout, a larger page cache and
+  memory-mapped reads, applied to every connection as it is opened,
+- funnels all writes through a single pooled connection, so writers queue
+  for it in order inside the process instead of racing for the file lock,
+- serves plain SELECTs from a separate pool of read-only connections.
+
+ReadWriteSession does the routing. A transaction that has written stays on
+the writer until it ends, so it keeps reading its own uncommitted rows.
+"""
+import os
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql import Select, CompoundSelect
+
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", 64 * 1024))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", 4))
+# How long a writer waits in the queue for the write connection
+SQLITE_WRITE_TIMEOUT = float(os.getenv("SQLITE_WRITE_TIMEOUT", 30))
+
+
+def sqlite_pragmas(read_only: bool = False) -> list[str]:
+    pragmas = [
+        # Before journal_mode, so concurrent first connections wait instead of failing
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _apply_pragmas(engine: AsyncEngine, read_only: bool = False) -> None:
+    pragmas = sqlite_pragmas(read_only)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def is_memory_database(url: str) -> bool:
+    return make_url(url).database in (None, "", ":memory:")
+
+
+def create_sqlite_engines(url: str, echo: bool = False) -> tuple[AsyncEngine, Optional[AsyncEngine]]:
+    """
+    (writer, reader) engines for a SQLite URL. In-memory databases exist per
+    connection, so they get one shared connection and no reader (None).
+    """
+    if is_memory_database(url):
+        engine = create_async_engine(url, echo=echo, poolclass=StaticPool, connect_args={"check_same_thread": False})
+        _apply_pragmas(engine)
+        return engine, None
+
+    writer = create_async_engine(url, echo=echo, pool_size=1, max_overflow=0, pool_timeout=SQLITE_WRITE_TIMEOUT)
+    reader = create_async_engine(url, echo=echo, pool_size=SQLITE_READ_POOL_SIZE, max_overflow=0)
+    _apply_pragmas(writer)
+    _apply_pragmas(reader, read_only=True)
+    return writer, reader
+
+
+class ReadWriteSession(Session):
+    """
+    Session bound to the writer engine that sends plain SELECTs to `reader`.
+
+    Flushes, DML, text() and anything else unrecognised go to the writer.
+    Once the current transaction has used the writer every later statement
+    does too, until commit or rollback.
+    """
+
+    def __init__(self, *args, reader=None, **kw):
+        super().__init__(*args, **kw)
+        self.reader = reader
+        self._writing = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.reader is not None and not self._writing and not self._flushing:
+            # clause is None for session.connection(): hand out a reader without pinning
+            if clause is None or isinstance(clause, (Select, CompoundSelect)):
+                return self.reader
+        self._writing = True
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+@event.listens_for(ReadWriteSession, "after_transaction_end")
+def _release_writer(session, transaction):
+    if transaction.parent is None:
+        session._writing = False
@@ -1,8 +1,20 @@
-from fastapi import FastAPI
+import time
+# Boot clock starts before the framework imports so the startup report includes them
+_boot_started = time.perf_counter()
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
 import logging
+from app.core.database import engine
+from app.core.http import close_http_client
+from app.core.migrations import migrate_to_head
+from app.core.pdf import shutdown_pdf_pool
+from app.core.jobs import job_queue
+from app.core.llm import llm_client
+from app.core.metrics import MetricsMiddleware, record_startup
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -10,21 +22,35 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Run database migrations on startup
+    phases = {"imports": _imports_finished - _boot_started}
+
+    # Run database migrations on startup (skipped when already at head)
+    started = time.perf_counter()
     try:
-        from alembic.config import Config
-        from alembic import command
-        
         # Only run if we have a database URL configured
         if os.getenv("DATABASE_URL"):
-            logger.info("Running database migrations...")
-            alembic_cfg = Config("alembic.ini")
-            command.upgrade(alembic_cfg, "head")
-            logger.info("Database migrations complete.")
+            outcome = await migrate_to_head(engine)
+            logger.info(f"Database schema {'upgraded' if outcome == 'upgraded' else 'already current'}.")
     except Exception as e:
         logger.error(f"Migration failed: {e}")
-    
-    yield
+    phases["migrations"] = time.perf_counter() - started
+
+    # The HTTP client, Gemini SDK and PDF workers are created on first use
+    started = time.perf_counter()
+    await job_queue.start()
+    phases["job_queue"] = time.perf_counter() - started
+
+    total = time.perf_counter() - _boot_started
+    record_startup(phases, total)
+    breakdown = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in phases.items())
+    logger.info(f"Startup took {total * 1000:.0f} ms ({breakdown})")
+    try:
+        yield
+    finally:
+        await job_queue.stop()
+        await close_http_client()
+        shutdown_pdf_pool()
+        llm_client.shutdown()
 
 app = FastAPI(title="Mono-Grant-OS API", version="0.1.0", lifespan=lifespan)
 
@@ -41,6 +67,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so latency covers every other middleware too
+app.add_middleware(MetricsMiddleware)
 
 from app.api import endpoints
 app.include_router(endpoints.router, prefix="/api/v1")
@@ -52,3 +80,11 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+# Module body done: everything above counts as import time in the startup report
+_imports_finished = time.perf_counter()
@@ -1,11 +1,15 @@
-from sqlalchemy import Column, String, Date, DateTime, Boolean, Enum, ForeignKey, Text, JSON, Integer
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Date, DateTime, Boolean, Enum, ForeignKey, Text, JSON, Integer, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
 import enum
+import re
 from datetime import datetime
 from app.core.database import Base
 
+# JSONB (GIN-indexable) on Postgres, plain JSON elsewhere
+JSONList = JSON().with_variant(JSONB(), "postgresql")
+
 # Models
 # Project, Section, Asset models removed for Funding OS pivot
 
@@ -21,6 +25,31 @@ class SubmissionStatus(str, enum.Enum):
     APPROVED = "Approved"
     SUBMITTED = "Submitted"
 
+def opportunity_dedup_key(funder_name: str, programme_name: str) -> str:
+    """Normalized opportunity identity: case, punctuation and spacing are ignored."""
+    def _normalize(value: str) -> str:
+        return " ".join(re.sub(r"[^\w\s]", " ", (value or "").lower()).split())
+    return f"{_normalize(funder_name)}|{_normalize(programme_name)}"
+
+def _default_dedup_key(context) -> str:
+    params = context.get_current_parameters()
+    return opportunity_dedup_key(params.get("funder_name"), params.get("programme_name"))
+
+class DeadlinePrecision(str, enum.Enum):
+    DAY = "Day"
+    MONTH = "Month"
+    QUARTER = "Quarter"
+    SEASON = "Season"
+    YEAR = "Year"
+    ROLLING = "Rolling"
+    UNKNOWN = "Unknown"
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    SUCCEEDED = "Succeeded"
+    FAILED = "Failed"
+
 class FundingOpportunity(Base):
     __tablename__ = "funding_opportunities"
 
@@ -28,12 +57,30 @@ class FundingOpportunity(Base):
     funder_name = Column(String, nullable=False)
     programme_name = Column(String, nullable=False)
     deadline = Column(Date, nullable=True)
+    deadline_precision = Column(Enum(DeadlinePrecision), default=DeadlinePrecision.DAY, nullable=True)
     status = Column(Enum(FundingStatus), default=FundingStatus.TO_REVIEW)
+    source_url = Column(String, nullable=True)
+    source_query = Column(String, nullable=True)  # search that first surfaced it (research only)
+    description = Column(Text, nullable=True)
+    requirements = Column(JSONList, nullable=True)
+    required_documents = Column(JSONList, nullable=True)
     eligibility_criteria = Column(JSON, nullable=True)
     budget_rules = Column(JSON, nullable=True)
+    dedup_key = Column(String, nullable=True, default=_default_dedup_key)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     applications = relationship("ApplicationPackage", back_populates="opportunity", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_funding_opportunities_deadline_id", "deadline", "id"),
+        Index("ix_funding_opportunities_funder_programme", "funder_name", "programme_name"),
+        Index("ix_funding_opportunities_status", "status"),
+        Index("uq_funding_opportunities_dedup_key", "dedup_key", unique=True),
+        Index("ix_funding_opportunities_source_url", "source_url"),
+        Index("ix_funding_opportunities_created_at", "created_at"),
+        Index("ix_funding_opportunities_required_documents", "required_documents", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
 class ApplicationPackage(Base):
     __tablename__ = "application_packages"
 
@@ -43,5 +90,52 @@ class ApplicationPackage(Base):
     budget_json = Column(JSON, nullable=True)
     submission_status = Column(Enum(SubmissionStatus), default=SubmissionStatus.DRAFT)
     final_approval = Column(Boolean, default=False)
+    # Bumped on every write; PATCH saves are conditional on the version the client last saw
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     opportunity = relationship("FundingOpportunity", back_populates="applications")
+
+    __table_args__ = (
+        Index("uq_application_packages_opportunity_id", "opportunity_id", unique=True),
+    )
+
+class CacheEntry(Base):
+    """Content-addressed cache of search results and LLM extractions."""
+    __tablename__ = "cache_entries"
+
+    key = Column(String(64), primary_key=True)
+    namespace = Column(String(32), nullable=False)
+    value = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    accessed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_cache_entries_accessed_at", "accessed_at"),
+        Index("ix_cache_entries_expires_at", "expires_at"),
+    )
+
+class Job(Base):
+    """Background research/import work item, processed by the in-process worker pool."""
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(32), nullable=False)
+    status = Column(Enum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    payload = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    progress = Column(String, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # Lease held by the worker running the job, renewed by its heartbeat
+    locked_until = Column(DateTime, nullable=True)
+    # Earliest time a queued job may be claimed (retry backoff); NULL means now
+    run_after = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+        Index("ix_jobs_status_locked_until", "status", "locked_until"),
+    )
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional, List, Dict
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from typing import Any, Optional, List, Dict
 from datetime import date, datetime
 from uuid import UUID
 from enum import Enum
@@ -93,22 +93,137 @@ class SubmissionStatusEnum(str, Enum):
     APPROVED = "Approved"
     SUBMITTED = "Submitted"
 
+class DeadlinePrecisionEnum(str, Enum):
+    DAY = "Day"
+    MONTH = "Month"
+    QUARTER = "Quarter"
+    SEASON = "Season"
+    YEAR = "Year"
+    ROLLING = "Rolling"
+    UNKNOWN = "Unknown"
+
 class OpportunityCreate(BaseModel):
     funder_name: str
     programme_name: str
     deadline: date
 
+class ExtractedOpportunity(BaseModel):
+    """One opportunity as returned by the Gemini extraction prompts."""
+    funder_name: str = Field(..., min_length=1)
+    programme_name: str = "General"
+    deadline_estimate: str = ""
+    description: str = ""
+    source_url: str = ""
+    requirements: List[str] = []
+    required_documents: List[str] = []
+
+    model_config = ConfigDict(extra="ignore", coerce_numbers_to_str=True, str_strip_whitespace=True)
+
+    @field_validator("programme_name", "deadline_estimate", "description", "source_url", mode="before")
+    @classmethod
+    def _none_to_default(cls, value, info):
+        if value is None:
+            return cls.model_fields[info.field_name].default
+        return value
+
+    @field_validator("requirements", "required_documents", mode="before")
+    @classmethod
+    def _to_string_list(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [value] if value.strip() else []
+        if isinstance(value, list):
+            return [str(item) for item in value if item is not None and str(item).strip()]
+        return value
+
+class OpportunityBulkCreate(BaseModel):
+    items: List[OpportunityCreate] = Field(..., min_length=1, max_length=500)
+
+class OpportunityBulkUpdateItem(BaseModel):
+    id: UUID
+    status: Optional[FundingStatusEnum] = None
+    deadline: Optional[date] = None
+
+class OpportunityBulkUpdate(BaseModel):
+    items: List[OpportunityBulkUpdateItem] = Field(..., min_length=1, max_length=500)
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[UUID] = None
+    result: str
+    detail: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    results: List[BulkItemResult]
+
 class OpportunityResponse(BaseModel):
     id: UUID
     funder_name: str
     programme_name: str
-    deadline: date
+    deadline: Optional[date]
+    deadline_precision: Optional[DeadlinePrecisionEnum] = None
     status: FundingStatusEnum
+    source_url: Optional[str] = None
+    source_query: Optional[str] = None
+    description: Optional[str] = None
+    requirements: Optional[List[str]] = None
+    required_documents: Optional[List[str]] = None
     eligibility_criteria: Optional[dict]
     budget_rules: Optional[dict]
 
     model_config = ConfigDict(from_attributes=True)
 
+    @model_validator(mode="after")
+    def legacy_eligibility_keys(self):
+        # Clients still read these from eligibility_criteria; they now live in columns
+        if self.eligibility_criteria is not None:
+            self.eligibility_criteria = {
+                "source": self.source_url or "",
+                "description": self.description or "",
+                "requirements": self.requirements or [],
+                "required_documents": self.required_documents or [],
+                **self.eligibility_criteria,
+            }
+        return self
+
+class OpportunitySummary(BaseModel):
+    """List view of an opportunity without the JSON columns."""
+    id: UUID
+    funder_name: str
+    programme_name: str
+    deadline: Optional[date]
+    deadline_precision: Optional[DeadlinePrecisionEnum] = None
+    status: FundingStatusEnum
+
+    model_config = ConfigDict(from_attributes=True)
+
+class OpportunityPage(BaseModel):
+    items: List[OpportunitySummary]
+    next_cursor: Optional[str] = None
+
+class CalendarBucket(BaseModel):
+    bucket_start: date
+    count: int
+    opportunities: List[OpportunitySummary]
+
+class SearchHit(BaseModel):
+    kind: str  # "opportunity" or "application"
+    id: UUID
+    opportunity_id: UUID
+    funder_name: str
+    programme_name: str
+    rank: float
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next_offset: Optional[int] = None
+
+class DuplicateSuggestion(BaseModel):
+    score: float
+    a: OpportunitySummary
+    b: OpportunitySummary
+
 class ApplicationResponse(BaseModel):
     id: UUID
     opportunity_id: UUID
@@ -116,16 +231,66 @@ class ApplicationResponse(BaseModel):
     budget_json: Optional[dict]
     submission_status: SubmissionStatusEnum
     final_approval: bool
+    version: int = 1
 
     model_config = ConfigDict(from_attributes=True)
 
+class OpportunityDetail(OpportunityResponse):
+    """Opportunity with its application embedded (GET /opportunities/{id}?include=application)."""
+    application: Optional[ApplicationResponse] = None
+
 class ApplicationUpdate(BaseModel):
     narrative_draft: Optional[str] = None
     budget_json: Optional[dict] = None
     submission_status: Optional[SubmissionStatusEnum] = None
 
+class TextEdit(BaseModel):
+    """Replace characters [start, end) of the saved text (Unicode code point offsets)."""
+    start: int = Field(ge=0)
+    end: int = Field(ge=0)
+    text: str = ""
+
+class JSONPatchOp(BaseModel):
+    """
+    RFC 6902 operation; add/replace set the value at `path`, remove deletes it.
+    Supported subset: add, replace and remove on object members. Every path
+    segment is an object key (array elements cannot be addressed), the parent
+    must already be an object and replace/remove targets must exist.
+    """
+    op: str = Field(pattern="^(add|replace|remove)$")
+    path: str = Field(pattern="^(/[^/]+)+$")
+    value: Any = None
+
+class ApplicationPatch(BaseModel):
+    version: int
+    narrative_edits: List[TextEdit] = []
+    # Each op becomes nested SQL in a single UPDATE, so patches are bounded
+    budget_patch: List[JSONPatchOp] = Field(default=[], max_length=200)
+    submission_status: Optional[SubmissionStatusEnum] = None
+
+    @field_validator("narrative_edits")
+    @classmethod
+    def edits_are_ordered(cls, edits: List[TextEdit]) -> List[TextEdit]:
+        # Offsets all refer to the saved text, so edits must be sorted and disjoint
+        position = 0
+        for edit in edits:
+            if edit.end < edit.start or edit.start < position:
+                raise ValueError("edits must be sorted, non-overlapping ranges")
+            position = edit.end
+        return edits
+
+class ApplicationVersion(BaseModel):
+    id: UUID
+    version: int
+    submission_status: SubmissionStatusEnum
+
+    model_config = ConfigDict(from_attributes=True)
+
 class DashboardCounts(BaseModel):
     opportunities: int
+    opportunities_by_status: Dict[str, int] = {}
+    applications: int = 0
+    applications_by_status: Dict[str, int] = {}
 
 class DashboardResponse(BaseModel):
     counts: DashboardCounts
@@ -138,3 +303,28 @@ class FundingImportRequest(BaseModel):
 class FundingResearchRequest(BaseModel):
     query: str
     region: str
+
+class FundingResearchSweepRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=10)
+    regions: List[str] = Field(default_factory=lambda: ["South Africa"], min_length=1, max_length=5)
+
+class JobStatusEnum(str, Enum):
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    SUCCEEDED = "Succeeded"
+    FAILED = "Failed"
+
+class JobResponse(BaseModel):
+    id: UUID
+    kind: str
+    status: JobStatusEnum
+    progress: Optional[str]
+    result: Optional[Any]
+    error: Optional[str]
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    run_after: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,143 @@
+"""
+Local stand-ins for the external services FundingAgent talks to.
+
+- FakeSearchServer: a threaded HTTP server that answers DuckDuckGo HTML
+  searches with deterministic results. Point SEARCH_HTML_URL at `.url`.
+- fake_llm(): an LLMClient whose model echoes back every synthetic
+  opportunity line found in the prompt as the extraction JSON, so the
+  parsing, merging and persistence code runs on realistic output sizes.
+- opportunity_text() / write_pdf(): synthetic inputs for import and PDF extraction.
+"""
+import html
+import json
+import re
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+from app.core.llm import LLMClient
+
+_ITEM = re.compile(r"Opportunity (\d+): (\S+) offers the (.+?) closing (.+?)\. Apply at (\S+) \.")
+
+
+def opportunity_line(i: int) -> str:
+    # Distinct funders keep every item's dedup key unique, so the item count
+    # is what gets persisted.
+    return (
+        f"Opportunity {i}: Funder{i:05d} offers the Documentary Production Award {i} "
+        f"closing 15 March 2027. Apply at https://funder{i:05d}.example.org/apply ."
+    )
+
+
+def opportunity_text(count: int) -> str:
+    """A research digest with `count` opportunities, one paragraph each."""
+    filler = "Eligible applicants include independent producers with a track record in factual film."
+    return "\n\n".join(f"{opportunity_line(i)} {filler}" for i in range(count))
+
+
+def _extract(prompt: str) -> list[dict]:
+    return [
+        {
+            "funder_name": funder,
+            "programme_name": programme,
+            "deadline_estimate": deadline,
+            "description": "Documentary production funding",
+            "source_url": url,
+            "requirements": ["South African citizen"],
+            "required_documents": ["CV", "Budget"],
+        }
+        for _, funder, programme, deadline, url in _ITEM.findall(prompt)
+    ]
+
+
+def fake_generate(model: str, prompt: str) -> str:
+    return json.dumps(_extract(prompt))
+
+
+def fake_stream(model: str, prompt: str):
+    body = fake_generate(model, prompt)
+    for start in range(0, len(body), 256):
+        yield body[start:start + 256]
+
+
+def fake_llm() -> LLMClient:
+    """Canned-response model with rate limits out of the way."""
+    return LLMClient(
+        generate_fn=fake_generate,
+        stream_fn=fake_stream,
+        requests_per_minute=10**9,
+        tokens_per_minute=10**12,
+    )
+
+
+class _SearchHandler(BaseHTTPRequestHandler):
+    results_per_query = 10
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        query = parse_qs(self.rfile.read(length).decode()).get("q", [""])[0]
+        seed = zlib.crc32(query.encode()) % 10**5
+        results = "".join(
+            '<div class="result">'
+            f'<a class="result__a" href="https://funder{(seed + i) % 10**5:05d}.example.org/apply">'
+            f"{html.escape(opportunity_line((seed + i) % 10**5))}</a>"
+            f'<a class="result__snippet">{html.escape(opportunity_line((seed + i) % 10**5))}</a>'
+            "</div>"
+            for i in range(self.results_per_query)
+        )
+        body = f"<html><body>{results}</body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeSearchServer:
+    """DuckDuckGo HTML stand-in on 127.0.0.1, served from a background thread."""
+
+    def __init__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _SearchHandler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/html/"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def write_pdf(path: str, page_count: int, lines_per_page: int = 20) -> None:
+    """A text PDF of `page_count` pages filled with opportunity lines."""
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for page_number in range(page_count):
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})
+        })
+        lines = "".join(
+            f"({opportunity_line(page_number * lines_per_page + i)[:90]}) Tj 0 -14 Td "
+            for i in range(lines_per_page)
+        )
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 9 Tf 36 760 Td {lines}ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    with open(path, "wb") as f:
+        writer.write(f)
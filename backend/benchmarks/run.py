@@ -0,0 +1,295 @@
+"""
+FundingAgent micro-benchmarks, run entirely against local fakes.
+
+    cd backend
+    python -m benchmarks.run                                  # full suite
+    python -m benchmarks.run --quick                          # small sizes (smoke run)
+    python -m benchmarks.run --only import,listing --output before.json
+    python -m benchmarks.run --compare before.json --threshold 1.2
+
+Search goes to a local DuckDuckGo HTML stub and Gemini is replaced by a
+canned-response model (see benchmarks/fakes.py), so timings cover our own
+parsing, SQL and I/O only. Every case uses a throwaway SQLite database.
+
+Results are written as JSON (one entry per case with min/median/mean/max
+seconds). With --compare, medians are checked against an earlier run and
+the exit status is 1 if any case got slower than --threshold times its
+baseline.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models import FundingOpportunity, ApplicationPackage, FundingStatus, DeadlinePrecision, opportunity_dedup_key
+from app.core.cache import ResultCache
+from app.core.http import close_http_client
+from app.core.pdf import extract_pdf_text, shutdown_pdf_pool
+from app.agents.dedup import opportunity_index
+from app.agents import funding
+from app.agents.funding import FundingAgent
+from benchmarks.fakes import FakeSearchServer, fake_llm, opportunity_text, write_pdf
+
+SUITES = ("import", "research", "listing", "dashboard", "search", "pdf")
+FULL_SIZES = {"items": [10, 100, 1000], "rows": [1000, 100000], "pages": [10, 100, 500], "searches": [1, 8]}
+QUICK_SIZES = {"items": [10, 100], "rows": [1000], "pages": [10], "searches": [1]}
+SEED_BATCH = 5000
+
+
+class Database:
+    """A throwaway SQLite file database with the full schema (FTS included)."""
+
+    def __init__(self, directory: str):
+        path = os.path.join(directory, f"bench-{uuid.uuid4().hex}.db")
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        self.session_factory = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def __aenter__(self):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.engine.dispose()
+
+    def agent(self, session: AsyncSession, llm=None) -> FundingAgent:
+        # The dedup index is process-wide; reload it from this database
+        opportunity_index.clear()
+        return FundingAgent(session, cache=ResultCache(self.session_factory), llm=llm)
+
+    async def seed(self, rows: int, applications: int = 0) -> None:
+        """Insert `rows` opportunities (and narratives for the first `applications`)."""
+        rng = random.Random(rows)
+        statuses = list(FundingStatus)
+        start = date(2026, 1, 1)
+        opportunity_ids = []
+        async with self.engine.begin() as conn:
+            for offset in range(0, rows, SEED_BATCH):
+                batch = []
+                for i in range(offset, min(offset + SEED_BATCH, rows)):
+                    funder, programme = f"Funder{i:06d}", f"Documentary Production Award {i}"
+                    undated = i % 20 == 0
+                    batch.append({
+                        "id": uuid.uuid4(),
+                        "funder_name": funder,
+                        "programme_name": programme,
+                        "dedup_key": opportunity_dedup_key(funder, programme),
+                        "deadline": None if undated else start + timedelta(days=rng.randrange(730)),
+                        "deadline_precision": DeadlinePrecision.ROLLING if undated else DeadlinePrecision.DAY,
+                        "status": rng.choice(statuses),
+                        "source_url": f"https://funder{i:06d}.example.org/apply",
+                        "description": "Funding for feature documentary production and development",
+                        "requirements": ["South African citizen"],
+                        "required_documents": ["CV", "Budget"],
+                        "eligibility_criteria": {"deadline_estimate": "15 March 2027"},
+                        "budget_rules": {"notes": "Seeded"},
+                    })
+                await conn.execute(insert(FundingOpportunity), batch)
+                opportunity_ids.extend(row["id"] for row in batch[:max(0, applications - len(opportunity_ids))])
+            if opportunity_ids:
+                await conn.execute(insert(ApplicationPackage), [
+                    {"id": uuid.uuid4(), "opportunity_id": opp_id, "narrative_draft": "Our documentary follows three rivers. " * 50, "budget_json": {"travel": 100}}
+                    for opp_id in opportunity_ids
+                ])
+
+
+async def measure(name: str, params: dict, run, setup=None, repeat: int = 5) -> dict:
+    """
+    Time `run(state)` `repeat` times. `setup()` (untimed) is an async context
+    manager factory whose value is passed to `run`; it is entered per repeat.
+    """
+    timings = []
+    for _ in range(repeat):
+        async with (setup() if setup else contextlib.nullcontext()) as state:
+            started = time.perf_counter()
+            await run(state)
+            timings.append(time.perf_counter() - started)
+    result = {
+        "name": name,
+        "params": params,
+        "repeat": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "max": max(timings),
+        "timings": timings,
+    }
+    print(f"{name:<32} {json.dumps(params):<20} median {result['median'] * 1000:10.2f} ms  (min {result['min'] * 1000:.2f})", flush=True)
+    return result
+
+
+async def bench_import(sizes, repeat, workdir) -> list[dict]:
+    results = []
+    llm = fake_llm()
+    for count in sizes["items"]:
+        text = opportunity_text(count)
+
+        async def run(db: Database, text=text, count=count):
+            async with db.session_factory() as session:
+                created = await db.agent(session, llm).import_opportunities_from_text(text)
+            assert len(created) == count, f"imported {len(created)} of {count}"
+
+        results.append(await measure("import_opportunities_from_text", {"items": count}, run, lambda: Database(workdir), repeat))
+    llm.shutdown()
+    return results
+
+
+async def bench_research(sizes, repeat, workdir) -> list[dict]:
+    results = []
+    llm = fake_llm()
+    with FakeSearchServer() as server:
+        with _patched(funding, SEARCH_HTML_URL=server.url):
+            for searches in sizes["searches"]:
+                queries = [f"documentary grants {i}" for i in range(searches)]
+
+                async def run(db: Database, queries=queries):
+                    async with db.session_factory() as session:
+                        stored = await db.agent(session, llm).research_sweep_and_create_opportunities(queries, ["South Africa"])
+                    assert stored, "research stored nothing"
+
+                results.append(await measure("research_sweep", {"searches": searches}, run, lambda: Database(workdir), repeat))
+    llm.shutdown()
+    await close_http_client()
+    return results
+
+
+async def bench_seeded(suites, sizes, repeat, workdir) -> list[dict]:
+    """Read paths over a pre-seeded database (seeded once per size, untimed)."""
+    results = []
+    for rows in sizes["rows"]:
+        params = {"rows": rows}
+        async with Database(workdir) as db:
+            await db.seed(rows, applications=min(rows, 1000))
+
+            @contextlib.asynccontextmanager
+            async def agent():
+                async with db.session_factory() as session:
+                    yield db.agent(session)
+
+            if "listing" in suites:
+                results.append(await measure("get_opportunities", params, lambda a: a.get_opportunities(), agent, repeat))
+                results.append(await measure("get_opportunity_page", params, lambda a: a.get_opportunity_page(limit=50), agent, repeat))
+                results.append(await measure("get_opportunity_page_filtered", params, lambda a: a.get_opportunity_page(limit=50, funder="funder0001", required_document="CV"), agent, repeat))
+            if "dashboard" in suites:
+                results.append(await measure("get_dashboard_stats", params, lambda a: a.get_dashboard_stats(), agent, repeat))
+            if "search" in suites:
+                results.append(await measure("search", params, lambda a: a.search("documentary rivers"), agent, repeat))
+    return results
+
+
+async def bench_pdf(sizes, repeat, workdir) -> list[dict]:
+    results = []
+    for pages in sizes["pages"]:
+        path = os.path.join(workdir, f"bench-{pages}.pdf")
+        write_pdf(path, pages)
+
+        async def run(_, path=path):
+            text = await extract_pdf_text(path)
+            assert text.strip(), "no text extracted"
+
+        results.append(await measure("extract_pdf_text", {"pages": pages}, run, repeat=repeat))
+    shutdown_pdf_pool()
+    return results
+
+
+@contextlib.contextmanager
+def _patched(module, **values):
+    saved = {name: getattr(module, name) for name in values}
+    for name, value in values.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+def _metadata(args) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sqlite": sqlite3.sqlite_version,
+        "cpu_count": os.cpu_count(),
+        "args": vars(args),
+    }
+
+
+def compare(results: list[dict], baseline_path: str, threshold: float) -> bool:
+    """Print median ratios against a baseline run; True if any exceeds threshold."""
+    with open(baseline_path) as f:
+        baseline = {(r["name"], json.dumps(r["params"], sort_keys=True)): r for r in json.load(f)["results"]}
+    regressed = False
+    print(f"\nCompared with {baseline_path}:")
+    for result in results:
+        before = baseline.get((result["name"], json.dumps(result["params"], sort_keys=True)))
+        if before is None:
+            continue
+        ratio = result["median"] / before["median"] if before["median"] else float("inf")
+        flag = ""
+        if threshold and ratio > threshold:
+            flag, regressed = "  REGRESSION", True
+        print(f"{result['name']:<32} {json.dumps(result['params']):<20} {ratio:6.2f}x{flag}")
+    return regressed
+
+
+async def main(args) -> int:
+    suites = set(args.only.split(",")) if args.only else set(SUITES)
+    unknown = suites - set(SUITES)
+    if unknown:
+        print(f"Unknown suite(s): {', '.join(sorted(unknown))}. Choose from {', '.join(SUITES)}.")
+        return 2
+    sizes = QUICK_SIZES if args.quick else FULL_SIZES
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        if "import" in suites:
+            results += await bench_import(sizes, args.repeat, workdir)
+        if "research" in suites:
+            results += await bench_research(sizes, args.repeat, workdir)
+        if suites & {"listing", "dashboard", "search"}:
+            results += await bench_seeded(suites, sizes, args.repeat, workdir)
+        if "pdf" in suites:
+            results += await bench_pdf(sizes, args.repeat, workdir)
+
+    with open(args.output, "w") as f:
+        json.dump({"meta": _metadata(args), "results": results}, f, indent=2)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="FundingAgent micro-benchmarks against local fakes.")
+    parser.add_argument("--only", help=f"comma-separated suites to run ({', '.join(SUITES)})")
+    parser.add_argument("--quick", action="store_true", help="small sizes only")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (default 5)")
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="earlier results JSON to compare medians against")
+    parser.add_argument("--threshold", type=float, default=None, help="fail if a median exceeds this multiple of the baseline")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
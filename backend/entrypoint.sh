@@ -1,7 +1,7 @@
 #!/bin/sh
 # Entrypoint script to properly expand $PORT variable
-# Run database migrations
-alembic upgrade head
+# Database migrations run in the app lifespan: skipped when the schema is
+# already at head, and serialized across replicas by an advisory lock.
 
 # Start the application
 exec uvicorn app.main:app --host 0.0.0.0 --port ${PORT:-8000}
@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app import models  # noqa: F401  (register tables on Base.metadata)
+
+
+@pytest.fixture
+async def db_engine():
+    """Fresh in-memory SQLite database per test."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(db_engine, monkeypatch):
+    """Point the shared result cache at the test database with fresh counters."""
+    from app.core.cache import result_cache, ResultCache
+    fresh = ResultCache(sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False))
+    monkeypatch.setattr(result_cache, "__dict__", fresh.__dict__)
+    return result_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_dedup_index():
+    """Each test database starts empty, so the shared index must too."""
+    from app.agents.dedup import opportunity_index
+    opportunity_index.clear()
+    yield opportunity_index
+    opportunity_index.clear()
+
+
+@pytest.fixture
+async def db_session(db_engine):
+    session_factory = sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+def statements(db_engine):
+    """Records every SQL statement executed against the test engine."""
+    executed = []
+
+    @event.listens_for(db_engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    yield executed
+    event.remove(db_engine.sync_engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+async def client(db_engine):
+    """HTTP client against the app, bound to the in-memory database."""
+    from httpx import AsyncClient, ASGITransport
+    from app.main import app
+    from app.core.database import get_db
+    from app.core.cache import dashboard_cache
+
+    dashboard_cache.invalidate()
+    session_factory = sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def _get_test_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_test_db
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+    app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,32 @@
+import json
+import pytest
+from benchmarks.run import main, parse_args
+
+
+@pytest.mark.asyncio
+async def test_quick_benchmarks_write_comparable_json(tmp_path, monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+
+    assert await main(parse_args(["--quick", "--repeat", "1", "--only", "import,dashboard", "--output", str(first)])) == 0
+    report = json.loads(first.read_text())
+    assert {(r["name"], r["params"].get("items") or r["params"].get("rows")) for r in report["results"]} == {
+        ("import_opportunities_from_text", 10),
+        ("import_opportunities_from_text", 100),
+        ("get_dashboard_stats", 1000),
+    }
+    assert all(r["min"] <= r["median"] <= r["max"] for r in report["results"])
+
+    # Doctored baselines: a run 1000x slower than its baseline is a regression
+    # at a realistic threshold; one 1000x faster is not
+    def baseline(scale: float, path):
+        doctored = json.loads(first.read_text())
+        for result in doctored["results"]:
+            for stat in ("min", "median", "max"):
+                result[stat] *= scale
+        path.write_text(json.dumps(doctored))
+        return str(path)
+
+    args = ["--quick", "--repeat", "1", "--only", "dashboard", "--output", str(second), "--threshold", "1.2", "--compare"]
+    assert await main(parse_args(args + [baseline(1000, tmp_path / "slow.json")])) == 0
+    assert await main(parse_args(args + [baseline(0.001, tmp_path / "fast.json")])) == 1
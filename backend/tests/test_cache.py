@@ -0,0 +1,43 @@
+import pytest
+from app.core import cache as cache_module
+from app.core.cache import ResultCache, cache_key, normalize_query
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_miss_and_lru_eviction(isolated_cache, monkeypatch):
+    monkeypatch.setattr(cache_module, "CACHE_EVICT_EVERY", 1)
+    cache = ResultCache(isolated_cache.session_factory, max_entries=2, touch_seconds=0)
+
+    key_a = cache_key("search", "1", normalize_query("Film  Grants"))
+    assert key_a == cache_key("search", "1", normalize_query("film grants"))
+    assert await cache.get("search", key_a) is None
+
+    await cache.set("search", key_a, [{"title": "A"}])
+    assert await cache.get("search", key_a) == [{"title": "A"}]
+
+    await cache.set("search", "b", ["B"])
+    await cache.get("search", key_a)  # a is now more recently used than b
+    await cache.set("search", "c", ["C"])
+
+    assert await cache.get("search", "b") is None
+    assert await cache.get("search", key_a) is not None
+    stats = cache.stats()
+    assert stats["hits"] == 3 and stats["misses"] == 2 and stats["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_recent_hits_are_read_without_writing(isolated_cache, statements):
+    cache = ResultCache(isolated_cache.session_factory, touch_seconds=3600)
+    await cache.set("search", "k", ["A"])
+
+    statements.clear()
+    assert await cache.get("search", "k") == ["A"]
+    assert await cache.get("search", "k") == ["A"]
+    assert [s.lstrip().split()[0].upper() for s in statements] == ["SELECT", "SELECT"]
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_not_served(isolated_cache):
+    cache = ResultCache(isolated_cache.session_factory, ttl_seconds=-1)
+    await cache.set("import", "k", ["stale"])
+    assert await cache.get("import", "k") is None
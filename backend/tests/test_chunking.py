@@ -0,0 +1,27 @@
+from app.agents.chunking import split_text
+
+
+def test_short_text_is_a_single_chunk():
+    assert split_text("NFVF Production Grant", max_chars=100) == ["NFVF Production Grant"]
+
+
+def test_split_prefers_paragraphs_and_overlaps():
+    paragraphs = [f"Opportunity {i}: " + "funding details. " * 10 for i in range(12)]
+    text = "\n\n".join(paragraphs)
+
+    chunks = split_text(text, max_chars=600, overlap=100)
+
+    assert len(chunks) > 1
+    assert all(len(c) <= 700 for c in chunks)
+    for paragraph in paragraphs:
+        assert any(paragraph in c for c in chunks)
+    # Each later chunk starts with the tail of the previous one
+    for prev, chunk in zip(chunks, chunks[1:]):
+        assert prev.rstrip()[-20:] in chunk
+
+
+def test_oversized_paragraph_falls_back_to_sentences_and_hard_cuts():
+    text = "A" * 250 + ". " + "B" * 50
+    chunks = split_text(text, max_chars=100, overlap=0)
+    assert "".join(chunks) == text
+    assert all(len(c) <= 100 for c in chunks)
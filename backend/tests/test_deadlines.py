@@ -0,0 +1,56 @@
+import pytest
+from datetime import date
+from unittest.mock import patch
+from app.agents.deadlines import parse_deadline
+from app.agents.funding import FundingAgent
+from app.models import DeadlinePrecision
+
+TODAY = date(2026, 10, 16)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2027-03-15", (date(2027, 3, 15), DeadlinePrecision.DAY)),
+    ("Closes 15 April 2027", (date(2027, 4, 15), DeadlinePrecision.DAY)),
+    ("March 3", (date(2027, 3, 3), DeadlinePrecision.DAY)),
+    ("June 2027", (date(2027, 6, 30), DeadlinePrecision.MONTH)),
+    ("Q2 2027", (date(2027, 6, 30), DeadlinePrecision.QUARTER)),
+    ("mid-2027", (date(2027, 8, 31), DeadlinePrecision.SEASON)),
+    ("2027", (date(2027, 12, 31), DeadlinePrecision.YEAR)),
+    ("Rolling basis", (None, DeadlinePrecision.ROLLING)),
+    ("Applications may be submitted", (None, DeadlinePrecision.UNKNOWN)),
+    ("", (None, DeadlinePrecision.UNKNOWN)),
+    # Out-of-range years from the model must not raise
+    ("April 0000", (None, DeadlinePrecision.UNKNOWN)),
+    ("Late 0000", (None, DeadlinePrecision.UNKNOWN)),
+    ("Q1 0000", (None, DeadlinePrecision.UNKNOWN)),
+    ("15 April 0000", (None, DeadlinePrecision.UNKNOWN)),
+    ("0000-04-15", (None, DeadlinePrecision.UNKNOWN)),
+])
+def test_parse_deadline(text, expected):
+    assert parse_deadline(text, today=TODAY) == expected
+
+
+@pytest.mark.asyncio
+async def test_import_parses_estimates_and_calendar_buckets(client):
+    parsed = [
+        {"funder_name": "NFVF", "programme_name": "Production", "deadline_estimate": "2027-03-15"},
+        {"funder_name": "NAC", "programme_name": "Arts Fund", "deadline_estimate": "March 2027"},
+        {"funder_name": "DAC", "programme_name": "Open Call", "deadline_estimate": "Rolling"},
+    ]
+    with patch.object(FundingAgent, "parse_opportunities_from_text", return_value=parsed):
+        created = (await client.post("/api/v1/opportunities/import", json={"text": "digest"})).json()
+    by_name = {o["programme_name"]: o for o in created}
+    assert by_name["Arts Fund"]["deadline"] == "2027-03-31"
+    assert by_name["Arts Fund"]["deadline_precision"] == "Month"
+    assert by_name["Open Call"]["deadline"] is None
+
+    page = (await client.get("/api/v1/opportunities", params={"limit": 2})).json()
+    rest = (await client.get("/api/v1/opportunities", params={"cursor": page["next_cursor"]})).json()
+    assert [o["programme_name"] for o in page["items"] + rest["items"]] == ["Production", "Arts Fund", "Open Call"]
+
+    calendar = (await client.get("/api/v1/opportunities/calendar", params={"start": "2027-01-01", "end": "2027-12-31"})).json()
+    assert calendar == [{"bucket_start": "2027-03-01", "count": 2, "opportunities": calendar[0]["opportunities"]}]
+
+    weekly = (await client.get("/api/v1/opportunities/calendar", params={"bucket": "week", "start": "2027-01-01", "end": "2027-12-31"})).json()
+    assert [(b["bucket_start"], b["count"]) for b in weekly] == [("2027-03-15", 1), ("2027-03-29", 1)]
+    assert (await client.get("/api/v1/opportunities/calendar", params={"start": "2027-02-01", "end": "2027-01-01"})).status_code == 400
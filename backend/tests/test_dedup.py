@@ -0,0 +1,91 @@
+import uuid
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from app.agents import dedup
+from app.agents.dedup import OpportunityIndex, funder_block, normalize_programme, similar_pairs
+from app.agents.funding import FundingAgent
+from app.models import FundingOpportunity
+
+
+def test_acronyms_and_years_are_normalized():
+    assert funder_block("NFVF") == funder_block("National Film and Video Foundation") == "nfvf"
+    assert normalize_programme("Production Grant 2026") == normalize_programme("Production Grant") == "production grant"
+
+
+def test_index_matches_within_funder_block_only():
+    index = OpportunityIndex()
+    existing = uuid.uuid4()
+    index.add(existing, "National Film and Video Foundation", "Documentary Production Grant 2025/26")
+    index.add(uuid.uuid4(), "National Arts Council", "Documentary Production Grant")
+
+    matches = index.match("NFVF", "Documentary Production Grant")
+    assert [m[0] for m in matches] == [existing]
+    assert index.match("NFVF", "Script Development") == []
+
+
+def test_similar_pairs_are_bounded_by_comparisons():
+    index = OpportunityIndex()
+    for n in range(30):
+        index.add(uuid.uuid4(), "NFVF", f"Documentary Production Grant {chr(65 + n % 26)}{n}")
+    index.add(uuid.uuid4(), "NFVF", "Script Development Seed Fund For Emerging Writers")
+
+    assert len(similar_pairs(index.blocks(), 0.5, 1000)) == 30 * 29 // 2
+    # Size pruning skips the long outlier; the budget caps what is scored
+    assert len(similar_pairs(index.blocks(), 0.5, 1000, max_comparisons=10)) == 10
+
+
+@pytest.mark.asyncio
+async def test_duplicates_endpoint_rejects_low_thresholds(client):
+    res = await client.get("/api/v1/opportunities/duplicates", params={"threshold": 0.1})
+    assert res.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_import_keeps_near_duplicates_and_suggests_merges(client):
+    await client.post("/api/v1/opportunities", json={"funder_name": "National Film and Video Foundation", "programme_name": "Production Grant", "deadline": "2026-05-01"})
+
+    parsed = [
+        {"funder_name": "NFVF", "programme_name": "Production Grant 2026"},
+        {"funder_name": "NAC", "programme_name": "Arts Fund"},
+        {"funder_name": "National Arts Council", "programme_name": "Arts Fund."},
+        {"funder_name": "NFVF", "programme_name": "Documentary Development"},
+    ]
+    with patch.object(FundingAgent, "parse_opportunities_from_text", return_value=parsed):
+        created = (await client.post("/api/v1/opportunities/import", json={"text": "digest"})).json()
+    # Near-duplicates may be distinct opportunities: stored, then suggested for review
+    assert len(created) == 4
+
+    suggestions = (await client.get("/api/v1/opportunities/duplicates", params={"threshold": 0.8})).json()
+    pairs = {frozenset((s["a"]["funder_name"], s["b"]["funder_name"])) for s in suggestions}
+    assert pairs == {frozenset(("NFVF", "National Film and Video Foundation")), frozenset(("NAC", "National Arts Council"))}
+
+
+@pytest.mark.asyncio
+async def test_index_refresh_only_fetches_new_rows(db_session, statements, monkeypatch):
+    index = OpportunityIndex()
+    db_session.add(FundingOpportunity(funder_name="NFVF", programme_name="Production Grant", created_at=datetime(2026, 1, 1)))
+    await db_session.commit()
+    await index.ensure_loaded(db_session)
+
+    db_session.add(FundingOpportunity(funder_name="NAC", programme_name="Arts Fund", created_at=datetime(2026, 3, 1)))
+    await db_session.commit()
+    monkeypatch.setattr(dedup, "DEDUP_INDEX_REFRESH_SECONDS", 0)
+    statements.clear()
+    await index.ensure_loaded(db_session)
+
+    assert len(index) == 2
+    assert "created_at >=" in statements[0]
+    assert index.match("NAC", "Arts Fund")
+
+
+@pytest.mark.asyncio
+async def test_suggestions_drop_rows_deleted_elsewhere(client, fresh_dedup_index):
+    for programme in ("Documentary Development", "Documentary Development Fund"):
+        await client.post("/api/v1/opportunities", json={"funder_name": "NFVF", "programme_name": programme, "deadline": "2026-05-01"})
+    gone = uuid.uuid4()
+    fresh_dedup_index.add(gone, "NFVF", "Documentary Development 2026")
+
+    suggestions = (await client.get("/api/v1/opportunities/duplicates", params={"threshold": 0.6})).json()
+    assert len(suggestions) == 1
+    assert not any(opportunity_id == gone for opportunity_id, _ in fresh_dedup_index.match("NFVF", "Documentary Development"))
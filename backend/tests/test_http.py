@@ -0,0 +1,34 @@
+import asyncio
+import httpx
+import pytest
+from app.core import http
+from app.agents.funding import FundingAgent
+
+DDG_HTML = """
+<div class="result"><a class="result__a" href="https://nfvf.co.za/grants">NFVF Grants</a>
+<a class="result__snippet">Production and development funding.</a></div>
+"""
+
+
+@pytest.fixture
+def mock_client(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, text=DDG_HTML)
+
+    monkeypatch.setattr(http, "BACKOFF_BASE", 0)
+    monkeypatch.setattr(http, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(http, "_semaphore", asyncio.Semaphore(2))
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_scrape_retries_on_shared_client(mock_client):
+    results = await FundingAgent(None)._scrape_ddg("documentary grants")
+
+    assert len(mock_client) == 2
+    assert results == [{"title": "NFVF Grants", "href": "https://nfvf.co.za/grants", "body": "Production and development funding."}]
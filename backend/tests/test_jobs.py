@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from sqlalchemy import select, update
+from app.agents.funding import FundingAgent
+from app.core.jobs import job_queue
+from app.models import Job, JobStatus
+
+
+@pytest.fixture
+def test_queue(db_engine, monkeypatch):
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import sessionmaker
+    monkeypatch.setattr(job_queue, "session_factory", sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False))
+    return job_queue
+
+
+@pytest.mark.asyncio
+async def test_background_import_is_queued_then_processed(client, test_queue):
+    res = await client.post("/api/v1/opportunities/import", params={"background": "true"}, json={"text": "digest"})
+    assert res.status_code == 202
+    job_id = res.json()["id"]
+    assert res.json()["status"] == "Queued"
+
+    async def fake_parse(self, text):
+        return [{"funder_name": "NAC", "programme_name": "Arts Fund"}]
+
+    with patch.object(FundingAgent, "parse_opportunities_from_text", fake_parse):
+        assert await test_queue.run_next() is True
+    assert await test_queue.run_next() is False
+
+    job = (await client.get(f"/api/v1/jobs/{job_id}")).json()
+    assert job["status"] == "Succeeded"
+    assert job["attempts"] == 1
+    assert [o["programme_name"] for o in job["result"]] == ["Arts Fund"]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_then_marked_failed(client, db_session, test_queue, monkeypatch):
+    monkeypatch.setattr("app.core.jobs.JOB_MAX_ATTEMPTS", 2)
+    job_id = (await client.post("/api/v1/opportunities/import", params={"background": "true"}, json={"text": "x"})).json()["id"]
+
+    async def broken(self, text):
+        raise RuntimeError("quota exceeded")
+
+    with patch.object(FundingAgent, "parse_opportunities_from_text", broken):
+        assert await test_queue.run_next()
+        job = (await client.get(f"/api/v1/jobs/{job_id}")).json()
+        assert job["status"] == "Queued"
+        assert datetime.fromisoformat(job["run_after"]) > datetime.utcnow()
+        # Backing off: not claimable until run_after
+        assert await test_queue.run_next() is False
+
+        await db_session.execute(update(Job).values(run_after=datetime.utcnow() - timedelta(seconds=1)))
+        await db_session.commit()
+        assert await test_queue.run_next()
+
+    job = (await client.get(f"/api/v1/jobs/{job_id}")).json()
+    assert job["status"] == "Failed"
+    assert "quota exceeded" in job["error"]
+
+
+@pytest.mark.asyncio
+async def test_reaper_requeues_only_expired_leases(db_session, test_queue, monkeypatch):
+    monkeypatch.setattr("app.core.jobs.JOB_MAX_ATTEMPTS", 2)
+    expired, live, exhausted = [await test_queue.enqueue(db_session, "import_text", {"text": t}) for t in "abc"]
+    # Claimed by workers that then died (expired) or are still heartbeating (live)
+    for _ in range(3):
+        await test_queue._claim()
+    past = datetime.utcnow() - timedelta(seconds=1)
+    await db_session.execute(update(Job).where(Job.id.in_([expired.id, exhausted.id])).values(locked_until=past))
+    await db_session.execute(update(Job).where(Job.id == exhausted.id).values(attempts=2))
+    await db_session.commit()
+
+    assert await test_queue.reap() == 1
+    status = dict((await db_session.execute(select(Job.id, Job.status).execution_options(populate_existing=True))).all())
+    assert status == {expired.id: JobStatus.QUEUED, live.id: JobStatus.RUNNING, exhausted.id: JobStatus.FAILED}
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_renews_the_lease_while_the_job_runs(db_session, test_queue, monkeypatch):
+    monkeypatch.setattr("app.core.jobs.JOB_HEARTBEAT_SECONDS", 0.01)
+
+    async def slow(db, payload, report):
+        lease = select(Job.locked_until).where(Job.status == JobStatus.RUNNING)
+        claimed = (await db.execute(lease)).scalar()
+        # Poll rather than sleep a fixed time, so a busy machine can't miss the renewal
+        for _ in range(500):
+            await asyncio.sleep(0.01)
+            if (await db.execute(lease)).scalar() > claimed:
+                return "renewed"
+        return "not renewed"
+
+    monkeypatch.setitem(test_queue.handlers, "slow", slow)
+    job = await test_queue.enqueue(db_session, "slow", {})
+    assert await test_queue.run_next()
+
+    finished = (await db_session.execute(select(Job).where(Job.id == job.id).execution_options(populate_existing=True))).scalar_one()
+    assert finished.status == JobStatus.SUCCEEDED
+    assert finished.result == "renewed"
+    assert finished.locked_until is None
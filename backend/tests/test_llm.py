@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.core.llm import LLMClient, TokenBucket
+
+
+class ResourceExhausted(Exception):
+    """Stands in for google.api_core.exceptions.ResourceExhausted."""
+
+
+@pytest.mark.asyncio
+async def test_identical_prompts_in_flight_are_coalesced():
+    calls = []
+    release = threading.Event()
+
+    def generate(model, prompt):
+        calls.append(prompt)
+        release.wait(2)
+        return f"[{prompt}]"
+
+    client = LLMClient(generate_fn=generate, requests_per_minute=600, tokens_per_minute=10**9)
+    pending = asyncio.gather(client.generate("same"), client.generate("same"), client.generate("other"))
+    await asyncio.sleep(0.05)
+    release.set()
+
+    assert await pending == ["[same]", "[same]", "[other]"]
+    assert sorted(calls) == ["other", "same"]
+    assert client.coalesced == 1
+    client.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_quota_errors_are_retried_with_backoff():
+    attempts = []
+
+    def generate(model, prompt):
+        attempts.append(prompt)
+        if len(attempts) < 3:
+            raise ResourceExhausted("429 quota")
+        return "ok"
+
+    client = LLMClient(generate_fn=generate, requests_per_minute=6000, tokens_per_minute=10**9, backoff_base=0.01)
+    assert await client.generate("prompt") == "ok"
+    assert client.retries == 2
+    client.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_errors_surface():
+    def generate(model, prompt):
+        raise ValueError("bad request")
+
+    client = LLMClient(generate_fn=generate, requests_per_minute=6000, tokens_per_minute=10**9)
+    with pytest.raises(ValueError):
+        await client.generate("prompt")
+    client.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_delays_instead_of_failing():
+    bucket = TokenBucket(rate_per_minute=600, capacity=2)  # 10 tokens/s
+    start = time.monotonic()
+    for _ in range(4):
+        await bucket.acquire(1)
+    assert time.monotonic() - start >= 0.15
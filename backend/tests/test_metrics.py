@@ -0,0 +1,35 @@
+import uuid
+import pytest
+from prometheus_client import REGISTRY
+from app.core.metrics import instrument_engine
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_requests_are_timed_by_route_template(client, db_engine):
+    instrument_engine(db_engine)
+    route = "/api/v1/opportunities/{opportunity_id}"
+    requests_before = sample("http_request_duration_seconds_count", method="GET", route=route)
+    statements_before = sample("http_request_db_statements_count", route=route)
+    statement_total_before = sample("http_request_db_statements_sum", route=route)
+    checkouts_before = sample("db_pool_checkouts_total")
+    selects_before = sample("db_statement_duration_seconds_count", operation="SELECT")
+
+    res = await client.get(f"/api/v1/opportunities/{uuid.uuid4()}")
+    assert res.status_code == 404
+
+    assert sample("http_request_duration_seconds_count", method="GET", route=route) == requests_before + 1
+    assert sample("http_requests_total", method="GET", route=route, status="404") >= 1
+    assert sample("http_request_db_statements_count", route=route) == statements_before + 1
+    assert sample("http_request_db_statements_sum", route=route) > statement_total_before
+    assert sample("db_statement_duration_seconds_count", operation="SELECT") > selects_before
+    assert sample("db_pool_checkouts_total") > checkouts_before
+
+    metrics = await client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert f'http_request_duration_seconds_count{{method="GET",route="{route}"}}' in metrics.text
+    assert "http_requests_in_flight 1.0" in metrics.text
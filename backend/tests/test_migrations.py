@@ -0,0 +1,27 @@
+import pytest
+from alembic import command
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core.migrations import migrate_to_head
+
+
+@pytest.mark.asyncio
+async def test_migrate_skips_alembic_when_already_at_head(tmp_path, monkeypatch):
+    path = tmp_path / "migrate.db"
+    # env.py migrates over its own (sync) connection to DATABASE_URL
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{path}")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    upgrades = []
+    upgrade = command.upgrade
+    monkeypatch.setattr(command, "upgrade", lambda *args: (upgrades.append(args), upgrade(*args)))
+
+    try:
+        assert await migrate_to_head(engine) == "upgraded"
+        assert await migrate_to_head(engine) == "current"
+        async with engine.connect() as conn:
+            tables = await conn.run_sync(lambda sync: inspect(sync).get_table_names())
+    finally:
+        await engine.dispose()
+
+    assert len(upgrades) == 1
+    assert "funding_opportunities" in tables
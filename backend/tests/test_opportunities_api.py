@@ -0,0 +1,241 @@
+import pytest
+from datetime import date, timedelta
+from unittest.mock import patch
+from app.agents.funding import FundingAgent
+
+
+@pytest.mark.asyncio
+async def test_list_opportunities_keyset_pages_and_filters(client):
+    start = date(2026, 3, 1)
+    for i in range(5):
+        res = await client.post("/api/v1/opportunities", json={
+            "funder_name": "NFVF" if i % 2 else "NAC",
+            "programme_name": f"Grant {i}",
+            "deadline": (start + timedelta(days=i // 2)).isoformat(),
+        })
+        assert res.status_code == 201
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = (await client.get("/api/v1/opportunities", params=params)).json()
+        assert "eligibility_criteria" not in page["items"][0]
+        seen.extend(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert len({o["id"] for o in seen}) == 5
+    assert [o["deadline"] for o in seen] == sorted(o["deadline"] for o in seen)
+
+    filtered = (await client.get("/api/v1/opportunities", params={"funder": "nfvf", "deadline_from": "2026-03-02"})).json()
+    assert [o["programme_name"] for o in filtered["items"]] == ["Grant 3"]
+    # LIKE wildcards in user input are matched literally
+    assert (await client.get("/api/v1/opportunities", params={"funder": "%"})).json()["items"] == []
+    assert (await client.get("/api/v1/opportunities", params={"funder": "N_C"})).json()["items"] == []
+
+    assert (await client.get("/api/v1/opportunities", params={"cursor": "garbage"})).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_create_opportunity_rejects_normalized_duplicate(client):
+    payload = {"funder_name": "NFVF", "programme_name": "Production Grant", "deadline": "2026-06-30"}
+    assert (await client.post("/api/v1/opportunities", json=payload)).status_code == 201
+
+    payload["programme_name"] = "  production   grant. "
+    assert (await client.post("/api/v1/opportunities", json=payload)).status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_import_file_spools_upload(client):
+    from unittest.mock import patch
+    from app.agents.funding import FundingAgent
+
+    async def fake_parse(self, text):
+        return [{"funder_name": "NAC", "programme_name": text.strip()}]
+
+    with patch.object(FundingAgent, "parse_opportunities_from_text", fake_parse):
+        res = await client.post("/api/v1/opportunities/import/file", files={"file": ("digest.txt", b"Heritage Fund\n", "text/plain")})
+
+    assert res.status_code == 200
+    assert [o["programme_name"] for o in res.json()] == ["Heritage Fund"]
+
+
+@pytest.mark.asyncio
+async def test_dashboard_stats_counts_etag_and_invalidation(client, statements):
+    future = (date.today() + timedelta(days=30)).isoformat()
+    opp = (await client.post("/api/v1/opportunities", json={"funder_name": "NAC", "programme_name": "Arts Fund", "deadline": future})).json()
+    await client.post(f"/api/v1/applications?opportunity_id={opp['id']}")
+
+    statements.clear()
+    res = await client.get("/api/v1/dashboard/stats")
+    assert len(statements) == 1
+    assert res.status_code == 200
+    counts = res.json()["counts"]
+    assert counts["opportunities"] == 1
+    assert counts["opportunities_by_status"]["To Review"] == 1
+    assert counts["applications_by_status"] == {"Draft": 1, "Approved": 0, "Submitted": 0}
+    assert [o["id"] for o in res.json()["upcoming_deadlines"]] == [opp["id"]]
+
+    etag = res.headers["etag"]
+    not_modified = await client.get("/api/v1/dashboard/stats", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    await client.post("/api/v1/opportunities", json={"funder_name": "NFVF", "programme_name": "Docs", "deadline": future})
+    refreshed = await client.get("/api/v1/dashboard/stats", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["counts"]["opportunities"] == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_and_status_transition(client, statements):
+    items = [
+        {"funder_name": "NAC", "programme_name": "Arts Fund", "deadline": "2026-05-01"},
+        {"funder_name": "NFVF", "programme_name": "Docs", "deadline": "2026-06-01"},
+        {"funder_name": "nac", "programme_name": "Arts fund", "deadline": "2026-05-01"},
+    ]
+    res = await client.post("/api/v1/opportunities/bulk", json={"items": items})
+    assert res.status_code == 200
+    results = res.json()["results"]
+    assert [r["result"] for r in results] == ["created", "created", "duplicate"]
+
+    statements.clear()
+    missing = "00000000-0000-0000-0000-000000000000"
+    res = await client.patch("/api/v1/opportunities/bulk", json={"items": [
+        {"id": results[0]["id"], "status": "Pursuing"},
+        {"id": results[1]["id"], "status": "Pursuing"},
+        {"id": missing, "status": "Rejected"},
+    ]})
+    assert [r["result"] for r in res.json()["results"]] == ["updated", "updated", "not_found"]
+    assert sum(s.lstrip().upper().startswith("UPDATE") for s in statements) == 2
+
+    page = (await client.get("/api/v1/opportunities", params={"status": "Pursuing"})).json()
+    assert len(page["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_filter_by_promoted_source_and_documents(client):
+    parsed = [
+        {"funder_name": "NFVF", "programme_name": "Production", "source_url": "https://nfvf.co.za/prod", "required_documents": ["CV", "Budget"], "requirements": ["South African citizen"]},
+        {"funder_name": "NAC", "programme_name": "Arts Fund", "source_url": "https://nac.org.za", "required_documents": ["Budget CV"], "requirements": ["Registered NPO"]},
+    ]
+    with patch.object(FundingAgent, "parse_opportunities_from_text", return_value=parsed):
+        created = (await client.post("/api/v1/opportunities/import", json={"text": "digest"})).json()
+    production = next(o for o in created if o["programme_name"] == "Production")
+    assert production["required_documents"] == ["CV", "Budget"]
+    assert production["eligibility_criteria"]["source"] == "https://nfvf.co.za/prod"
+
+    by_doc = (await client.get("/api/v1/opportunities", params={"required_document": "CV"})).json()
+    assert [o["programme_name"] for o in by_doc["items"]] == ["Production"]
+    by_source = (await client.get("/api/v1/opportunities", params={"source_url": "https://nac.org.za"})).json()
+    assert [o["programme_name"] for o in by_source["items"]] == ["Arts Fund"]
+    by_requirement = (await client.get("/api/v1/opportunities", params={"requirement": "CITIZEN"})).json()
+    assert [o["programme_name"] for o in by_requirement["items"]] == ["Production"]
+    assert (await client.get("/api/v1/opportunities", params={"requirement": "_"})).json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_opportunities_and_narratives(client):
+    parsed = [
+        {"funder_name": "NFVF", "programme_name": "Documentary Production", "description": "Feature documentary funding"},
+        {"funder_name": "NAC", "programme_name": "Arts Fund", "description": "Visual arts exhibitions"},
+    ]
+    with patch.object(FundingAgent, "parse_opportunities_from_text", return_value=parsed):
+        created = (await client.post("/api/v1/opportunities/import", json={"text": "digest"})).json()
+    arts = next(o for o in created if o["programme_name"] == "Arts Fund")
+    app = (await client.post("/api/v1/applications", params={"opportunity_id": arts["id"]})).json()
+    await client.put(f"/api/v1/applications/{app['id']}", json={"narrative_draft": "A documentary installation touring galleries."})
+
+    hits = (await client.get("/api/v1/search", params={"q": "documentaries"})).json()
+    assert [(h["kind"], h["programme_name"]) for h in hits["items"]] == [
+        ("opportunity", "Documentary Production"),
+        ("application", "Arts Fund"),
+    ]
+    assert hits["next_offset"] is None
+
+    first = (await client.get("/api/v1/search", params={"q": "documentary", "limit": 1})).json()
+    assert len(first["items"]) == 1 and first["next_offset"] == 1
+    assert (await client.get("/api/v1/search", params={"q": "\"*)"})).json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_opportunity_detail_embeds_application_in_one_query(client, statements):
+    opp = (await client.post("/api/v1/opportunities", json={"funder_name": "NFVF", "programme_name": "Docs", "deadline": "2026-06-01"})).json()
+
+    bare = (await client.get(f"/api/v1/opportunities/{opp['id']}", params={"include": "application"})).json()
+    assert bare["application"] is None
+
+    app = (await client.post("/api/v1/applications", params={"opportunity_id": opp["id"]})).json()
+    statements.clear()
+    detail = (await client.get(f"/api/v1/opportunities/{opp['id']}", params={"include": "application"})).json()
+    assert detail["programme_name"] == "Docs"
+    assert detail["application"]["id"] == app["id"]
+    assert [s.lstrip().split()[0].upper() for s in statements] == ["SELECT"]
+
+    plain = (await client.get(f"/api/v1/opportunities/{opp['id']}")).json()
+    assert plain["application"] is None
+    missing = "00000000-0000-0000-0000-000000000000"
+    assert (await client.get(f"/api/v1/opportunities/{missing}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_patch_application_splices_and_rejects_stale_version(client, statements):
+    opp = (await client.post("/api/v1/opportunities", json={"funder_name": "NFVF", "programme_name": "Docs", "deadline": "2026-06-01"})).json()
+    app = (await client.post("/api/v1/applications", params={"opportunity_id": opp["id"]})).json()
+    url = f"/api/v1/applications/{app['id']}"
+    saved = (await client.put(url, json={"narrative_draft": "Our film follows three rivers.", "budget_json": {"travel": 100}})).json()
+    assert saved["version"] == 2
+
+    statements.clear()
+    res = await client.patch(url, json={
+        "version": 2,
+        "narrative_edits": [{"start": 4, "end": 8, "text": "documentary"}, {"start": 17, "end": 22, "text": "four"}],
+        "budget_patch": [
+            {"op": "replace", "path": "/travel", "value": 250},
+            {"op": "add", "path": "/crew", "value": {}},
+            {"op": "add", "path": "/crew/sound", "value": 50},
+        ],
+    })
+    assert res.status_code == 200
+    assert res.json()["version"] == 3
+    assert [s.lstrip().split()[0].upper() for s in statements] == ["UPDATE"]
+
+    current = (await client.get(url)).json()
+    assert current["narrative_draft"] == "Our documentary follows four rivers."
+    assert current["budget_json"] == {"travel": 250, "crew": {"sound": 50}}
+
+    stale = await client.patch(url, json={"version": 2, "budget_patch": [{"op": "remove", "path": "/travel"}]})
+    assert stale.status_code == 409
+    assert stale.json()["detail"]["version"] == 3
+
+    out_of_range = await client.patch(url, json={"version": 3, "narrative_edits": [{"start": 500, "end": 501, "text": "x"}]})
+    assert out_of_range.status_code == 422
+    overlapping = await client.patch(url, json={"version": 3, "narrative_edits": [{"start": 4, "end": 8}, {"start": 6, "end": 9}]})
+    assert overlapping.status_code == 422
+
+    # RFC 6902: the parent must exist (Postgres jsonb_set would silently skip it)
+    missing_parent = await client.patch(url, json={"version": 3, "budget_patch": [{"op": "add", "path": "/travel", "value": 1}, {"op": "add", "path": "/catering/lunch", "value": 20}]})
+    assert missing_parent.status_code == 422
+    assert "/catering/lunch" in missing_parent.json()["detail"]
+    not_an_object = await client.patch(url, json={"version": 3, "budget_patch": [{"op": "add", "path": "/travel/local", "value": 20}]})
+    assert not_an_object.status_code == 422
+    for op in ({"op": "replace", "path": "/catering", "value": 1}, {"op": "remove", "path": "/crew/lights"}):
+        missing_target = await client.patch(url, json={"version": 3, "budget_patch": [op]})
+        assert missing_target.status_code == 422
+        assert missing_target.json()["detail"] == f"{op['path']} does not exist in the saved budget"
+    assert (await client.get(url)).json()["budget_json"] == {"travel": 250, "crew": {"sound": 50}}
+
+    # Removing a key an earlier op added is checked against the patched document
+    added_then_removed = await client.patch(url, json={"version": 3, "budget_patch": [{"op": "add", "path": "/extra", "value": 1}, {"op": "remove", "path": "/extra"}]})
+    assert added_then_removed.status_code == 200
+    # Independent ops share flat calls, so a large budget saves in one UPDATE
+    lines = await client.patch(url, json={"version": 4, "budget_patch": [{"op": "add", "path": f"/line{i}", "value": i} for i in range(200)]})
+    assert lines.status_code == 200
+    assert len((await client.get(url)).json()["budget_json"]) == 202
+    too_many = await client.patch(url, json={"version": 5, "budget_patch": [{"op": "add", "path": f"/line{i}", "value": i} for i in range(201)]})
+    assert too_many.status_code == 422
+    too_deep = await client.patch(url, json={"version": 5, "budget_patch": [{"op": "replace", "path": "/travel", "value": i} for i in range(50)]})
+    assert too_deep.status_code == 422
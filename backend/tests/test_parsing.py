@@ -0,0 +1,26 @@
+from app.agents.parsing import JSONArrayStream, parse_extraction
+
+
+def test_json_array_stream_yields_objects_across_chunk_boundaries():
+    parser = JSONArrayStream()
+    output = '```json\n[{"funder_name": "NAC", "note": "braces } in \\"strings\\""}, {"funder_name": "NFVF", "nested": {"a": 1}}]\n```'
+    objects = []
+    for i in range(0, len(output), 7):
+        objects.extend(parser.feed(output[i:i + 7]))
+    assert [o["funder_name"] for o in objects] == ["NAC", "NFVF"]
+    assert objects[0]["note"] == 'braces } in "strings"'
+
+
+def test_parse_extraction_salvages_valid_items_from_truncated_output():
+    output = """[
+      {"funder_name": "NAC", "programme_name": "Arts Fund", "requirements": "SA resident", "deadline_estimate": null},
+      {"programme_name": "No funder"},
+      {"funder_name": "DSAC", "programme_name": "Heritage", "required_documents": ["CV", null, 3]},
+      {"funder_name": "NFVF", "programme_name": "Docs", "descrip"""
+
+    items = parse_extraction(output)
+
+    assert [i["funder_name"] for i in items] == ["NAC", "DSAC"]
+    assert items[0]["requirements"] == ["SA resident"]
+    assert items[0]["deadline_estimate"] == ""
+    assert items[1]["required_documents"] == ["CV", "3"]
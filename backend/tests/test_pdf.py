@@ -0,0 +1,33 @@
+import pytest
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+from app.core.pdf import extract_pdf_text
+
+
+def _write_pdf(path, page_count):
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for i in range(page_count):
+        page = writer.add_blank_page(300, 200)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})
+        })
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 12 Tf 20 100 Td (Page {i}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+@pytest.mark.asyncio
+async def test_extract_pdf_text_keeps_page_order_across_chunks(tmp_path):
+    path = tmp_path / "guidelines.pdf"
+    _write_pdf(path, 7)
+
+    text = await extract_pdf_text(str(path), pages_per_chunk=3)
+
+    assert [line.strip() for line in text.splitlines() if line.strip()] == [f"Page {i}" for i in range(7)]
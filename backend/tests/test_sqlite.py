@@ -0,0 +1,84 @@
+import asyncio
+from datetime import date
+import pytest
+from sqlalchemy import event, select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.core.sqlite import create_sqlite_engines, ReadWriteSession
+from app.models import FundingOpportunity, FundingStatus
+from app.agents.funding import FundingAgent
+
+
+@pytest.fixture
+async def sqlite_profile(tmp_path):
+    writer, reader = create_sqlite_engines(f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}")
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(
+        bind=writer, class_=AsyncSession, expire_on_commit=False,
+        sync_session_class=ReadWriteSession, reader=reader.sync_engine,
+    )
+    yield writer, reader, session_factory
+    await reader.dispose()
+    await writer.dispose()
+
+
+def _record(engine):
+    executed = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda conn, cursor, statement, *args: executed.append(statement))
+    return executed
+
+
+@pytest.mark.asyncio
+async def test_pragmas_applied_per_connection(sqlite_profile):
+    writer, reader, _ = sqlite_profile
+    async with writer.connect() as conn:
+        assert (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar() == "wal"
+        assert (await conn.exec_driver_sql("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert (await conn.exec_driver_sql("PRAGMA query_only")).scalar() == 0
+    async with reader.connect() as conn:
+        assert (await conn.exec_driver_sql("PRAGMA query_only")).scalar() == 1
+        assert (await conn.exec_driver_sql("PRAGMA cache_size")).scalar() < 0
+
+
+@pytest.mark.asyncio
+async def test_selects_use_reader_until_the_transaction_writes(sqlite_profile):
+    writer, reader, session_factory = sqlite_profile
+    writes, reads = _record(writer), _record(reader)
+
+    async with session_factory() as session:
+        await session.execute(select(func.count(FundingOpportunity.id)))
+        assert len(reads) == 1 and not writes
+
+        session.add(FundingOpportunity(funder_name="NFVF", programme_name="Production", status=FundingStatus.TO_REVIEW))
+        await session.flush()
+        # Reads its own uncommitted row, so it must stay on the writer
+        assert (await session.execute(select(func.count(FundingOpportunity.id)))).scalar() == 1
+        assert len(reads) == 1
+        await session.commit()
+
+        await session.execute(select(func.count(FundingOpportunity.id)))
+        assert len(reads) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_queue_instead_of_locking(sqlite_profile):
+    _, _, session_factory = sqlite_profile
+
+    async def create(i: int):
+        async with session_factory() as session:
+            await FundingAgent(session).bulk_create_opportunities([
+                {"funder_name": f"Funder{i}", "programme_name": f"Programme {i}-{j}", "deadline": date(2027, 1, j + 1)} for j in range(5)
+            ])
+
+    async def list_page():
+        async with session_factory() as session:
+            await FundingAgent(session).get_opportunity_page(limit=20)
+
+    await asyncio.gather(*(create(i) for i in range(10)), *(list_page() for _ in range(10)))
+
+    async with session_factory() as session:
+        assert (await session.execute(select(func.count(FundingOpportunity.id)))).scalar() == 50
+        # text() is never assumed to be read-only
+        assert (await session.execute(text("SELECT count(*) FROM funding_opportunities"))).scalar() == 50
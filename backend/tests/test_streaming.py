@@ -0,0 +1,42 @@
+import json
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.agents.funding import FundingAgent
+from app.core.llm import LLMClient
+
+
+@pytest.mark.asyncio
+async def test_research_stream_emits_search_then_each_opportunity(client, db_engine, statements, monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    # The stream opens its own session rather than the request's
+    monkeypatch.setattr("app.api.endpoints.SessionLocal", sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False))
+
+    async def fake_scrape(self, query):
+        return [{"title": "NAC", "href": "https://nac.org.za", "body": "Arts funding"}]
+
+    def fake_stream(model, prompt):
+        yield '[{"funder_name": "NAC", "programme_name": "Arts '
+        yield 'Fund"}, {"funder_name": "NFVF", "programme_name": "Docs"}, {"funder_name": "DSAC", '
+        yield '"programme_name": "Heritage"}, {"funder_name": "NAC", "programme_name": "arts fund"}]'
+
+    monkeypatch.setattr(FundingAgent, "_scrape_ddg", fake_scrape)
+    fake_llm = LLMClient(stream_fn=fake_stream, requests_per_minute=600, tokens_per_minute=10**9)
+    monkeypatch.setattr("app.agents.funding.llm_client", fake_llm)
+
+    statements.clear()
+    res = await client.post("/api/v1/opportunities/research/stream")
+    assert res.headers["content-type"].startswith("text/event-stream")
+
+    events = []
+    for block in res.text.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+
+    assert [e for e, _ in events] == ["search", "opportunity", "opportunity", "opportunity", "done"]
+    assert events[1][1]["programme_name"] == "Arts Fund"
+    # The last chunk's exact duplicate folds into the NAC row already sent
+    assert events[-1][1] == {"extracted": 4, "stored": 3}
+    # One upsert per streamed chunk that completed an item
+    assert sum(s.lstrip().upper().startswith("INSERT INTO FUNDING_OPPORTUNITIES") for s in statements) == 2
+    fake_llm.shutdown()
@@ -1,14 +1,14 @@
 "use client";
 
 import { useEffect, useState, use } from "react";
-import { updateApplication, getApplication, ApplicationPackage } from "@/lib/api";
+import { patchApplication, getOpportunityDetail, diffText, diffBudget, VersionConflictError, ApplicationPackage, Opportunity } from "@/lib/api";
 import Link from "next/link";
 import { ArrowLeft, Save, Loader2, Send, CheckCircle2, FileText, DollarSign } from "lucide-react";
 import { cn } from "@/lib/utils";
 
 export default function ApplicationPage({ params }: { params: Promise<{ id: string }> }) {
     const { id } = use(params);
-    const [app, setApp] = useState<(ApplicationPackage & { opportunity?: any }) | null>(null);
+    const [app, setApp] = useState<(ApplicationPackage & { opportunity?: Opportunity }) | null>(null);
     const [narrative, setNarrative] = useState("");
     const [budgetJson, setBudgetJson] = useState("{}");
     const [loading, setLoading] = useState(true);
@@ -17,9 +17,11 @@ export default function ApplicationPage({ params }: { params: Promise<{ id: stri
     useEffect(() => {
         async function load() {
             try {
-                const data = await getApplication(id);
-                if (data) {
-                    setApp(data);
+                // The route id is the opportunity; its application comes embedded
+                const detail = await getOpportunityDetail(id);
+                const data = detail?.application;
+                if (detail && data) {
+                    setApp({ ...data, opportunity: detail });
                     setNarrative(data.narrative_draft || "");
                     setBudgetJson(data.budget_json ? JSON.stringify(data.budget_json, null, 2) : "{\n  \"personnel\": 0,\n  \"equipment\": 0,\n  \"travel\": 0,\n  \"other\": 0\n}");
                 }
@@ -40,13 +42,17 @@ export default function ApplicationPage({ params }: { params: Promise<{ id: stri
                 setSaving(false);
                 return;
             }
-            const updated = await updateApplication(id, {
-                narrative_draft: narrative,
-                budget_json: parsedBudget
+            // Send only what changed since the last save, tagged with the version it applies to
+            const saved = await patchApplication(app!.id, {
+                version: app!.version,
+                narrative_edits: diffText(app!.narrative_draft || "", narrative),
+                budget_patch: diffBudget(app!.budget_json || {}, parsedBudget),
             });
-            setApp(updated);
-        } catch {
-            alert("Failed to save");
+            setApp({ ...app!, ...saved, narrative_draft: narrative, budget_json: parsedBudget });
+        } catch (e) {
+            alert(e instanceof VersionConflictError
+                ? "This application was changed in another tab. Reload to get the latest version."
+                : "Failed to save");
         } finally {
             setSaving(false);
         }
@@ -56,10 +62,12 @@ export default function ApplicationPage({ params }: { params: Promise<{ id: stri
         if (!confirm("Submit this application for approval?")) return;
         setSaving(true);
         try {
-            const updated = await updateApplication(id, { submission_status: "Approved" });
-            setApp(updated);
-        } catch {
-            alert("Failed to submit");
+            const saved = await patchApplication(app!.id, { version: app!.version, submission_status: "Approved" });
+            setApp({ ...app!, ...saved });
+        } catch (e) {
+            alert(e instanceof VersionConflictError
+                ? "This application was changed in another tab. Reload to get the latest version."
+                : "Failed to submit");
         } finally {
             setSaving(false);
         }
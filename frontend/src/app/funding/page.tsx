@@ -1,12 +1,13 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { getOpportunities, createOpportunity, createApplication, importOpportunities, importOpportunitiesFile, Opportunity } from "@/lib/api";
+import { getOpportunities, createOpportunity, createApplication, ApplicationExistsError, importOpportunities, importOpportunitiesFile, Opportunity, OpportunitySummary } from "@/lib/api";
 import { Plus, Calendar, ArrowRight, Search, Loader2, Sparkles, ClipboardPaste, UploadCloud } from "lucide-react";
 import { useRouter } from "next/navigation";
 
 export default function FundingPage() {
-    const [opportunities, setOpportunities] = useState<Opportunity[]>([]);
+    const [opportunities, setOpportunities] = useState<OpportunitySummary[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [loading, setLoading] = useState(true);
     const [isModalOpen, setIsModalOpen] = useState(false);
     const [isImportModalOpen, setIsImportModalOpen] = useState(false);
@@ -15,12 +16,20 @@ export default function FundingPage() {
     const router = useRouter();
 
     useEffect(() => {
-        getOpportunities().then((data) => {
-            setOpportunities(data);
+        getOpportunities().then((page) => {
+            setOpportunities(page.items);
+            setNextCursor(page.next_cursor);
             setLoading(false);
         });
     }, []);
 
+    const handleLoadMore = async () => {
+        if (!nextCursor) return;
+        const page = await getOpportunities({ cursor: nextCursor });
+        setOpportunities((current) => [...current, ...page.items]);
+        setNextCursor(page.next_cursor);
+    };
+
     const handleCreate = async (e: React.FormEvent<HTMLFormElement>) => {
         e.preventDefault();
         const formData = new FormData(e.currentTarget);
@@ -101,11 +110,16 @@ export default function FundingPage() {
 
     const handleStartApplication = async (oppId: string) => {
         try {
-            const app = await createApplication(oppId);
-            router.push(`/funding/${app.id}`);
-        } catch {
-            alert("Failed to start application (or one already exists!)");
+            await createApplication(oppId);
+        } catch (error) {
+            // An existing application is fine: the detail page opens it
+            if (!(error instanceof ApplicationExistsError)) {
+                console.error("Failed to start application", error);
+                alert("Could not start the application. Please try again.");
+                return;
+            }
         }
+        router.push(`/funding/${oppId}`);
     };
 
     return (
@@ -139,7 +153,10 @@ export default function FundingPage() {
 
                             <div className="mt-4 flex items-center gap-2 text-sm text-stone-500">
                                 <Calendar className="h-4 w-4" />
-                                <span>Deadline: {new Date(opp.deadline).toLocaleDateString()}</span>
+                                <span>
+                                    Deadline: {opp.deadline ? new Date(opp.deadline).toLocaleDateString() : "Rolling / TBC"}
+                                    {opp.deadline && opp.deadline_precision && opp.deadline_precision !== "Day" && ` (approx., ${opp.deadline_precision.toLowerCase()})`}
+                                </span>
                             </div>
                         </div>
 
@@ -163,6 +180,17 @@ export default function FundingPage() {
                 )}
             </div>
 
+            {nextCursor && (
+                <div className="flex justify-center">
+                    <button
+                        onClick={handleLoadMore}
+                        className="rounded-md bg-stone-800 px-4 py-2 text-sm font-medium text-stone-200 hover:bg-stone-700 transition-colors"
+                    >
+                        Load more
+                    </button>
+                </div>
+            )}
+
             {/* Add Opportunity Modal */}
             {isModalOpen && (
                 <div className="fixed inset-0 z-50 flex items-center justify-center bg-black/50 backdrop-blur-sm p-4">
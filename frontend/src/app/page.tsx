@@ -122,7 +122,7 @@ export default function DashboardPage() {
                 <div className="text-xs text-stone-500">{opp.funder_name}</div>
               </div>
               <div className="text-right">
-                <div className="text-sm font-bold text-red-400">{new Date(opp.deadline).toLocaleDateString()}</div>
+                <div className="text-sm font-bold text-red-400">{opp.deadline ? new Date(opp.deadline).toLocaleDateString() : "TBC"}</div>
                 <div className="text-[10px] text-stone-600 uppercase tracking-wider">Due Date</div>
               </div>
             </div>
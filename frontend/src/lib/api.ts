@@ -203,8 +203,14 @@ export interface Opportunity {
     id: string;
     funder_name: string;
     programme_name: string;
-    deadline: string;
+    deadline: string | null;
+    deadline_precision: "Day" | "Month" | "Quarter" | "Season" | "Year" | "Rolling" | "Unknown" | null;
     status: "To Review" | "Pursuing" | "Submitted" | "Rejected" | "Awarded";
+    source_url: string | null;
+    source_query: string | null;
+    description: string | null;
+    requirements: string[] | null;
+    required_documents: string[] | null;
     eligibility_criteria: Record<string, unknown>;
     budget_rules: Record<string, unknown>;
 }
@@ -216,6 +222,7 @@ export interface ApplicationPackage {
     budget_json: Record<string, unknown> | null;
     submission_status: "Draft" | "Approved" | "Submitted";
     final_approval: boolean;
+    version: number;
     opportunity?: Opportunity;
 }
 
@@ -229,12 +236,98 @@ export async function createOpportunity(data: { funder_name: string; programme_n
     return await res.json();
 }
 
-export async function getOpportunities(): Promise<Opportunity[]> {
-    const res = await fetch(`${API_BASE_URL}/opportunities`);
+export type OpportunitySummary = Pick<Opportunity, "id" | "funder_name" | "programme_name" | "deadline" | "deadline_precision" | "status">;
+
+export interface OpportunityPage {
+    items: OpportunitySummary[];
+    next_cursor: string | null;
+}
+
+export interface OpportunityFilters {
+    limit?: number;
+    cursor?: string;
+    status?: Opportunity["status"];
+    deadline_from?: string;
+    deadline_to?: string;
+    funder?: string;
+    source_url?: string;
+    required_document?: string;
+    requirement?: string;
+}
+
+export async function getOpportunities(filters: OpportunityFilters = {}): Promise<OpportunityPage> {
+    const params = new URLSearchParams();
+    Object.entries(filters).forEach(([key, value]) => {
+        if (value !== undefined && value !== "") params.set(key, String(value));
+    });
+    const res = await fetch(`${API_BASE_URL}/opportunities?${params.toString()}`);
+    if (!res.ok) return { items: [], next_cursor: null };
+    return await res.json();
+}
+
+export interface CalendarBucket {
+    bucket_start: string;
+    count: number;
+    opportunities: OpportunitySummary[];
+}
+
+export async function getDeadlineCalendar(bucket: "week" | "month" = "month", start?: string, end?: string): Promise<CalendarBucket[]> {
+    const params = new URLSearchParams({ bucket });
+    if (start) params.set("start", start);
+    if (end) params.set("end", end);
+    const res = await fetch(`${API_BASE_URL}/opportunities/calendar?${params.toString()}`);
     if (!res.ok) return [];
     return await res.json();
 }
 
+export interface SearchHit {
+    kind: "opportunity" | "application";
+    id: string;
+    opportunity_id: string;
+    funder_name: string;
+    programme_name: string;
+    rank: number;
+}
+
+export interface SearchPage {
+    items: SearchHit[];
+    next_offset: number | null;
+}
+
+export async function search(q: string, limit = 20, offset = 0): Promise<SearchPage> {
+    const params = new URLSearchParams({ q, limit: String(limit), offset: String(offset) });
+    const res = await fetch(`${API_BASE_URL}/search?${params.toString()}`);
+    if (!res.ok) return { items: [], next_offset: null };
+    return await res.json();
+}
+
+export interface BulkItemResult {
+    index: number;
+    id: string | null;
+    result: "created" | "duplicate" | "updated" | "not_found";
+    detail?: string | null;
+}
+
+export async function bulkCreateOpportunities(items: { funder_name: string; programme_name: string; deadline: string }[]): Promise<BulkItemResult[]> {
+    const res = await fetch(`${API_BASE_URL}/opportunities/bulk`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ items }),
+    });
+    if (!res.ok) throw new Error("Bulk create failed");
+    return (await res.json()).results;
+}
+
+export async function bulkUpdateOpportunities(items: { id: string; status?: Opportunity["status"]; deadline?: string }[]): Promise<BulkItemResult[]> {
+    const res = await fetch(`${API_BASE_URL}/opportunities/bulk`, {
+        method: "PATCH",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ items }),
+    });
+    if (!res.ok) throw new Error("Bulk update failed");
+    return (await res.json()).results;
+}
+
 export async function researchOpportunities(query: string = "film documentary arts grants", region: string = "South Africa"): Promise<Opportunity[]> {
     const res = await fetch(`${API_BASE_URL}/opportunities/research?query=${encodeURIComponent(query)}&region=${encodeURIComponent(region)}`, {
         method: "POST",
@@ -243,6 +336,40 @@ export async function researchOpportunities(query: string = "film documentary ar
     return await res.json();
 }
 
+export type ResearchStreamEvent =
+    | { event: "search"; data: { title: string; href: string; body: string }[] }
+    | { event: "opportunity"; data: Opportunity }
+    | { event: "done"; data: { extracted: number; stored: number } }
+    | { event: "error"; data: { detail: string } };
+
+// Streams research progress over SSE; resolves once the "done" event has been delivered.
+export async function streamResearchOpportunities(
+    onEvent: (event: ResearchStreamEvent) => void,
+    query: string = "film documentary arts grants",
+    region: string = "South Africa",
+): Promise<void> {
+    const res = await fetch(`${API_BASE_URL}/opportunities/research/stream?query=${encodeURIComponent(query)}&region=${encodeURIComponent(region)}`, {
+        method: "POST",
+        headers: { Accept: "text/event-stream" },
+    });
+    if (!res.ok || !res.body) throw new Error("Research failed");
+
+    const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = "";
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += value;
+        const blocks = buffer.split("\n\n");
+        buffer = blocks.pop() ?? "";
+        for (const block of blocks) {
+            const event = block.match(/^event: (.*)$/m)?.[1];
+            const data = block.match(/^data: (.*)$/m)?.[1];
+            if (event && data) onEvent({ event, data: JSON.parse(data) } as ResearchStreamEvent);
+        }
+    }
+}
+
 export async function importOpportunities(text: string): Promise<Opportunity[]> {
     const res = await fetch(`${API_BASE_URL}/opportunities/import`, {
         method: "POST",
@@ -266,11 +393,21 @@ export async function importOpportunitiesFile(file: File): Promise<Opportunity[]
 }
 
 
+export class ApplicationExistsError extends Error {
+    constructor() {
+        super("Application already exists for this opportunity");
+    }
+}
+
 export async function createApplication(opportunityId: string): Promise<ApplicationPackage> {
     const res = await fetch(`${API_BASE_URL}/applications?opportunity_id=${opportunityId}`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
     });
+    if (res.status === 400) {
+        const body = await res.json().catch(() => null);
+        if (typeof body?.detail === "string" && body.detail.includes("already exists")) throw new ApplicationExistsError();
+    }
     if (!res.ok) throw new Error("Failed to create application");
     return await res.json();
 }
@@ -285,6 +422,83 @@ export async function updateApplication(appId: string, data: { narrative_draft?:
     return await res.json();
 }
 
+export interface TextEdit {
+    start: number;
+    end: number;
+    text: string;
+}
+
+export interface JSONPatchOp {
+    op: "add" | "replace" | "remove";
+    path: string;
+    value?: unknown;
+}
+
+export interface ApplicationPatch {
+    version: number;
+    narrative_edits?: TextEdit[];
+    budget_patch?: JSONPatchOp[];
+    submission_status?: ApplicationPackage["submission_status"];
+}
+
+export class VersionConflictError extends Error {
+    constructor(public version: number) {
+        super(`Application was saved elsewhere (now at version ${version})`);
+    }
+}
+
+// Single splice covering the changed region; offsets are code points to match the backend
+export function diffText(before: string, after: string): TextEdit[] {
+    const a = Array.from(before);
+    const b = Array.from(after);
+    let prefix = 0;
+    while (prefix < a.length && prefix < b.length && a[prefix] === b[prefix]) prefix++;
+    let suffix = 0;
+    while (suffix < a.length - prefix && suffix < b.length - prefix && a[a.length - 1 - suffix] === b[b.length - 1 - suffix]) suffix++;
+    if (prefix === a.length && prefix === b.length) return [];
+    return [{ start: prefix, end: a.length - suffix, text: b.slice(prefix, b.length - suffix).join("") }];
+}
+
+export function diffBudget(before: Record<string, unknown>, after: Record<string, unknown>): JSONPatchOp[] {
+    const pointer = (key: string) => "/" + key.replace(/~/g, "~0").replace(/\//g, "~1");
+    const ops: JSONPatchOp[] = [];
+    for (const [key, value] of Object.entries(after)) {
+        if (JSON.stringify(before[key]) !== JSON.stringify(value)) {
+            ops.push({ op: key in before ? "replace" : "add", path: pointer(key), value });
+        }
+    }
+    for (const key of Object.keys(before)) {
+        if (!(key in after)) ops.push({ op: "remove", path: pointer(key) });
+    }
+    return ops;
+}
+
+export async function patchApplication(appId: string, patch: ApplicationPatch): Promise<Pick<ApplicationPackage, "id" | "version" | "submission_status">> {
+    const res = await fetch(`${API_BASE_URL}/applications/${appId}`, {
+        method: "PATCH",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(patch),
+    });
+    if (res.status === 409) throw new VersionConflictError((await res.json()).detail.version);
+    if (!res.ok) throw new Error("Failed to save application");
+    return await res.json();
+}
+
+export interface OpportunityDetail extends Opportunity {
+    application: ApplicationPackage | null;
+}
+
+export async function getOpportunityDetail(opportunityId: string): Promise<OpportunityDetail | null> {
+    try {
+        const res = await fetch(`${API_BASE_URL}/opportunities/${opportunityId}?include=application`);
+        if (!res.ok) return null;
+        return await res.json();
+    } catch (e) {
+        console.error("Failed to fetch opportunity", e);
+        return null;
+    }
+}
+
 export async function getApplication(appId: string): Promise<ApplicationPackage | null> {
     try {
         const res = await fetch(`${API_BASE_URL}/applications/${appId}`);
@@ -300,6 +514,9 @@ export async function getApplication(appId: string): Promise<ApplicationPackage
 export interface DashboardStats {
     counts: {
         opportunities: number;
+        opportunities_by_status: Record<Opportunity["status"], number>;
+        applications: number;
+        applications_by_status: Record<ApplicationPackage["submission_status"], number>;
     };
     upcoming_deadlines: Opportunity[];
 }
@@ -309,3 +526,25 @@ export async function getDashboardStats(): Promise<DashboardStats> {
     if (!res.ok) throw new Error("Failed to fetch dashboard stats");
     return await res.json();
 }
+
+// --- Background Jobs ---
+
+export interface Job<T = unknown> {
+    id: string;
+    kind: string;
+    status: "Queued" | "Running" | "Succeeded" | "Failed";
+    progress: string | null;
+    result: T | null;
+    error: string | null;
+    attempts: number;
+    created_at: string;
+    started_at: string | null;
+    finished_at: string | null;
+    run_after: string | null;
+}
+
+export async function getJob<T = unknown>(jobId: string): Promise<Job<T> | null> {
+    const res = await fetch(`${API_BASE_URL}/jobs/${jobId}`);
+    if (!res.ok) return null;
+    return await res.json();
+}